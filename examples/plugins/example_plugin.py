@@ -2,7 +2,7 @@ from typing import List
 
 import pynblint.lint_register as register
 from pynblint.lint import LintDefinition, LintLevel
-from pynblint.notebook import Notebook
+from pynblint.core_models import Notebook
 
 
 def example_plugin_lint(notebook: Notebook) -> bool:
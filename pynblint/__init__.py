@@ -1,3 +1,17 @@
 """Pynblint main package."""
 
-__version__ = "0.1.0"
+from typing import Any
+
+__version__ = "0.1.6"
+
+__all__ = ["lint_notebook"]
+
+
+def __getattr__(name: str) -> Any:
+    # The linting API is imported on first access, so that importing a submodule
+    # (e.g., ``pynblint.config``) does not load the whole linting stack
+    if name == "lint_notebook":
+        from .api import lint_notebook
+
+        return lint_notebook
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,33 @@
+"""Programmatic interface of pynblint."""
+
+from typing import Optional, Union
+
+from nbformat.notebooknode import NotebookNode
+
+from .core_models import VIRTUAL_NOTEBOOK_NAME, Notebook
+from .nb_linter import NotebookLinter
+from .session import LintSession, get_session
+
+
+def lint_notebook(
+    notebook: Union[str, bytes, NotebookNode],
+    name: str = VIRTUAL_NOTEBOOK_NAME,
+    session: Optional[LintSession] = None,
+) -> NotebookLinter:
+    """Lint a notebook held in memory, without accessing the filesystem.
+
+    Args:
+        notebook (Union[str, bytes, NotebookNode]): the JSON content of the
+            notebook, or the notebook already parsed by nbformat.
+        name (str): the virtual filename of the notebook, checked by the
+            filename-based lints (e.g., ``untitled-notebook``).
+        session (Optional[LintSession]): the session providing settings and lints;
+            defaults to the current session.
+
+    Returns:
+        NotebookLinter: the results of the analysis.
+    """
+    with (session or get_session()).activate():
+        if isinstance(notebook, NotebookNode):
+            return NotebookLinter(Notebook.from_node(notebook, name))
+        return NotebookLinter(Notebook.from_string(notebook, name))
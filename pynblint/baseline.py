@@ -0,0 +1,114 @@
+"""Baselines: the linting results already known, hidden from reports.
+
+Each finding is identified by a compact fingerprint of its lint slug, its
+location (the path of the notebook or file, relative to the repository root)
+and, for cell-level lints, the source of the affected cell, so that findings
+are still recognized when cells are moved or other cells are edited. Identical
+findings (e.g., in cells with the same source) share a fingerprint, so known
+fingerprints are counted: a finding is hidden only up to the number of times it
+was recorded. Filtering the results of a run takes a constant-time lookup per
+finding, before any result is rendered or exported.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .exceptions import BaselineFormatError
+
+# Version of the format of baseline files
+BASELINE_VERSION = 2
+
+
+def fingerprint(slug: str, scope: str, location: str, *details: str) -> str:
+    """Return the fingerprint of a finding.
+
+    Args:
+        slug (str): the slug of the lint.
+        scope (str): the target containing the finding in a multi-target run
+            (empty otherwise).
+        location (str): the path of the affected notebook or file, relative to
+            the repository root (if any).
+        *details (str): further details identifying the finding within its
+            location (e.g., the source of the affected cell).
+    """
+    content = "\0".join([slug, scope, location, *details])
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def relative_location(path: Path, root: Optional[Path]) -> str:
+    """Return the location of ``path`` (relative to ``root``, if within it)."""
+    if root is not None:
+        try:
+            return path.relative_to(root).as_posix()
+        except ValueError:
+            pass
+    return path.as_posix()
+
+
+class Baseline:
+    """An index of the fingerprints of known findings, with their occurrences.
+
+    Args:
+        fingerprints (Iterable[str]): the fingerprints of the known findings,
+            repeated for each occurrence (or a ``Counter`` of them).
+        update (bool): whether the baseline is being regenerated; if so, every
+            finding is recorded (and hidden) as known.
+    """
+
+    def __init__(self, fingerprints: Iterable[str] = (), update: bool = False) -> None:
+        self.known: Counter = Counter(fingerprints)
+        self.update: bool = update
+        self.seen: Counter = Counter()  # Fingerprints of the findings of this run
+        self.suppressed: int = 0
+
+    @classmethod
+    def load(cls, path: Path, update: bool = False) -> "Baseline":
+        """Read a baseline file; a missing file is an empty baseline.
+
+        Raises:
+            BaselineFormatError: if the file is not a baseline of this version.
+        """
+        if update or not path.is_file():
+            return cls(update=update)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data["version"] == BASELINE_VERSION:
+                return cls(data["fingerprints"])
+        except (ValueError, KeyError, TypeError):
+            pass
+        raise BaselineFormatError(
+            f"The file `{path}` is not a valid baseline for this version of "
+            "pynblint; regenerate it with `--update-baseline`."
+        )
+
+    def suppresses(self, finding_fingerprint: str) -> bool:
+        """Whether the finding is known (and should be hidden from reports).
+
+        The n-th finding with a given fingerprint is known if the fingerprint was
+        recorded at least n times.
+        """
+        self.seen[finding_fingerprint] += 1
+        suppressed = (
+            self.update
+            or self.seen[finding_fingerprint] <= self.known[finding_fingerprint]
+        )
+        self.suppressed += suppressed
+        return suppressed
+
+    def save(self, path: Path) -> None:
+        """Write the fingerprints of the findings of this run (atomically)."""
+        data = {
+            "version": BASELINE_VERSION,
+            "fingerprints": sorted(self.seen.elements()),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=0)
+        os.replace(tmp_path, path)
@@ -0,0 +1,325 @@
+"""Linting of multiple targets (notebooks, directories, archives) in a single run."""
+
+import dataclasses
+import glob
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.markup import escape
+from rich.panel import Panel
+from rich.rule import Rule
+
+from . import metrics
+from .baseline import Baseline
+from .core_models import GitHubRepository, LocalRepository, Notebook, Repository
+from .corpus_stats import CorpusStats
+from .journal import COMPLETED, FAILED, Journal
+from .lint import Finding, ViolationBudget
+from .nb_linter import NotebookLinter
+from .repo_linter import RepoLinter
+from .workers import WorkerPool
+
+# Characters marking a source as a glob pattern
+GLOB_CHARACTERS = ("*", "?", "[")
+
+
+def expand_targets(sources: List[str], from_github: bool = False) -> List[str]:
+    """Expand glob patterns among the sources into the list of linting targets.
+
+    Sources that exist as they are (or that are URLs) are never expanded;
+    duplicate targets are dropped, preserving the order of appearance.
+    """
+    targets: List[str] = []
+    for source in sources:
+        is_pattern = any(char in source for char in GLOB_CHARACTERS)
+        if from_github or not is_pattern or Path(source).exists():
+            targets.append(source)
+        else:
+            targets.extend(sorted(glob.glob(source, recursive=True)))
+    return list(dict.fromkeys(targets))
+
+
+def is_notebook_target(target: str, from_github: bool = False) -> bool:
+    """Whether the target is a standalone notebook (rather than a repository)."""
+    path = Path(target)
+    return not from_github and path.suffix == ".ipynb" and not path.is_dir()
+
+
+def open_repository(target: str, from_github: bool = False) -> Repository:
+    """Return the repository identified by a target (a directory, archive or URL)."""
+    if from_github:
+        return GitHubRepository(target)
+    return LocalRepository(Path(target))
+
+
+def count_violations(linter: Union[NotebookLinter, RepoLinter]) -> Counter:
+    """Count the linting results of a linter, by lint slug."""
+    return Counter(finding.slug for finding in linter.findings())
+
+
+def count_notebooks(linter: Union[NotebookLinter, RepoLinter]) -> int:
+    """Count the notebooks analyzed by a linter."""
+    if isinstance(linter, RepoLinter):
+        return len(linter.notebook_linters)
+    return 1
+
+
+@dataclass
+class BatchSummary:
+    number_of_targets: int = 0
+    number_of_notebooks: int = 0
+    targets_with_violations: int = 0
+    violations_per_slug: Dict[str, int] = field(default_factory=dict)
+
+
+class BatchLinter:
+    def __init__(
+        self,
+        targets: List[str],
+        from_github: bool = False,
+        pool: Optional[WorkerPool] = None,
+        budget: Optional[ViolationBudget] = None,
+        journal: Optional[Journal] = None,
+        retry_failed: bool = False,
+    ) -> None:
+        """Lint several targets, sharing the same worker pool and lint registry.
+
+        Targets can be standalone notebooks, directories, ``.zip`` archives or
+        (if ``from_github`` is set) URLs of GitHub repositories. The notebooks of
+        all targets are submitted to the pool at once. The temporary copies of
+        repositories (e.g., extracted archives) are removed as soon as each
+        repository has been linted.
+
+        With a violation budget (by default, the one set in the settings, if any),
+        targets are instead linted one at a time, in the current process, and the
+        targets left once the budget is exhausted are not analyzed.
+
+        With a journal (corpus mode), targets are also linted one at a time, and
+        the results of each target are recorded in the journal as soon as it is
+        linted, as well as the exception raised by the targets that fail (which
+        do not stop the run). The targets already recorded in the journal are not
+        analyzed again (except the failed ones, if ``retry_failed`` is set), and
+        the summary and the exported results cover all the recorded targets.
+        Violation budgets are not supported in corpus mode.
+        """
+        pool = pool or WorkerPool()
+        self.targets: List[str] = targets
+        self.journal: Optional[Journal] = journal
+        self.budget: Optional[ViolationBudget] = None
+        if journal is None:
+            self.budget = (
+                budget if budget is not None else ViolationBudget.from_settings()
+            )
+        self.linters: Dict[str, Union[NotebookLinter, RepoLinter]] = {}
+
+        if journal is not None:
+            for target in journal.pending(targets, retry_failed):
+                self._lint_journaled(target, from_github, pool, journal)
+        elif self.budget is not None:
+            for target in targets:
+                if self.budget.exhausted:
+                    break
+                if is_notebook_target(target, from_github):
+                    with metrics.stage("notebook_linting"):
+                        self.linters[target] = NotebookLinter(
+                            Notebook(Path(target)), budget=self.budget
+                        )
+                else:
+                    repo = open_repository(target, from_github)
+                    self.linters[target] = RepoLinter(repo, budget=self.budget)
+                    repo.close()
+        else:
+            # Retrieve the notebooks of all targets
+            repositories: Dict[str, Repository] = {}
+            notebook_paths: List[Path] = []
+            notebook_sizes: Dict[Path, int] = {}
+            for target in targets:
+                if is_notebook_target(target, from_github):
+                    notebook_paths.append(Path(target))
+                else:
+                    repositories[target] = open_repository(target, from_github)
+                    notebook_paths.extend(repositories[target].notebook_paths)
+                    notebook_sizes.update(repositories[target].notebook_sizes)
+
+            # Lint notebooks and assign results to their targets
+            with metrics.stage("notebook_linting"):
+                nb_linters = iter(
+                    pool.lint_notebooks(notebook_paths, sizes=notebook_sizes)
+                )
+            for target in targets:
+                if target in repositories:
+                    repo = repositories[target]
+                    self.linters[target] = RepoLinter(
+                        repo,
+                        notebook_linters=[
+                            next(nb_linters) for _ in repo.notebook_paths
+                        ],
+                    )
+                    repo.close()
+                else:
+                    self.linters[target] = next(nb_linters)
+
+        self.summary: BatchSummary = self._summarize()
+
+    def _lint_journaled(
+        self, target: str, from_github: bool, pool: WorkerPool, journal: Journal
+    ) -> None:
+        """Lint a target and record its results (or its failure) in the journal."""
+        linter: Union[NotebookLinter, RepoLinter]
+        repo: Optional[Repository] = None
+        try:
+            if is_notebook_target(target, from_github):
+                with metrics.stage("notebook_linting"):
+                    linter = pool.lint_notebooks([Path(target)])[0]
+            else:
+                repo = open_repository(target, from_github)
+                linter = RepoLinter(repo, pool)
+        except Exception as e:
+            journal.record_failure(target, e)
+            if isinstance(e, BrokenProcessPool):
+                # A worker process was killed (e.g., out of memory)
+                pool.restart()
+            return
+        finally:
+            if repo is not None:
+                repo.close()
+        journal.record_completed(
+            target,
+            {
+                "results": linter.as_dict(),
+                "number_of_notebooks": count_notebooks(linter),
+                "violations_per_slug": dict(count_violations(linter)),
+                "corpus_stats": linter.corpus_stats.as_dict(),
+            },
+        )
+        self.linters[target] = linter
+
+    def journal_entries(self, status: str) -> Dict[str, Dict]:
+        """Return the journal entries of the targets with the given status."""
+        if self.journal is None:
+            return {}
+        entries = (self.journal.entries.get(target) for target in self.targets)
+        return {
+            entry["target"]: entry
+            for entry in entries
+            if entry is not None and entry["status"] == status
+        }
+
+    def _summarize(self) -> BatchSummary:
+        """Return the cross-target summary of the linting results."""
+        target_counts: List[Tuple[Counter, int]]
+        if self.journal is not None:
+            target_counts = [
+                (Counter(entry["violations_per_slug"]), entry["number_of_notebooks"])
+                for entry in self.journal_entries(COMPLETED).values()
+            ]
+        else:
+            target_counts = [
+                (count_violations(linter), count_notebooks(linter))
+                for linter in self.linters.values()
+            ]
+
+        violations: Counter = Counter()
+        summary = BatchSummary(number_of_targets=len(target_counts))
+        for target_violations, number_of_notebooks in target_counts:
+            violations.update(target_violations)
+            if target_violations:
+                summary.targets_with_violations += 1
+            summary.number_of_notebooks += number_of_notebooks
+        summary.violations_per_slug = dict(violations.most_common())
+        return summary
+
+    def apply_baseline(self, baseline: Baseline) -> None:
+        """Drop the findings known to the baseline from the results of all targets.
+
+        The findings of repositories are scoped by target, as given on the
+        command line (standalone notebooks are already located by their path).
+        """
+        for target, linter in self.linters.items():
+            if isinstance(linter, RepoLinter):
+                linter.apply_baseline(baseline, scope=target)
+            else:
+                linter.apply_baseline(baseline)
+        self.summary = self._summarize()
+        self.__dict__.pop("corpus_stats", None)
+
+    def findings(self) -> Iterator[Finding]:
+        """Iterate over the linting results of all targets.
+
+        In corpus mode, only the targets linted in this run are included.
+        """
+        for linter in self.linters.values():
+            yield from linter.findings()
+
+    @cached_property
+    def corpus_stats(self) -> CorpusStats:
+        """The statistics of all the analyzed notebooks and repositories."""
+        if self.journal is not None:
+            return CorpusStats.merged(
+                CorpusStats.from_dict(entry["corpus_stats"])
+                for entry in self.journal_entries(COMPLETED).values()
+            )
+        return CorpusStats.merged(
+            linter.corpus_stats for linter in self.linters.values()
+        )
+
+    def as_dict(self) -> Dict:
+        if self.journal is not None:
+            return {
+                "batch_summary": dataclasses.asdict(self.summary),
+                "corpus_stats": self.corpus_stats.as_dict(),
+                "targets": {
+                    target: entry["results"]
+                    for target, entry in self.journal_entries(COMPLETED).items()
+                },
+                "failures": {
+                    target: entry["error"]
+                    for target, entry in self.journal_entries(FAILED).items()
+                },
+            }
+        results_dict = {
+            "batch_summary": dataclasses.asdict(self.summary),
+            "corpus_stats": self.corpus_stats.as_dict(),
+            "targets": {
+                target: linter.as_dict() for target, linter in self.linters.items()
+            },
+        }
+        return results_dict
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+
+        for target, linter in self.linters.items():
+            yield Rule(f"[turquoise2 bold]TARGET: {target}[/turquoise2 bold]")
+            yield linter
+
+        # Cross-target summary
+        summary = "\n"
+        summary += "[green]Analyzed targets[/green]: "
+        summary += f"{self.summary.number_of_targets}\n"
+        summary += "[green]Analyzed notebooks[/green]: "
+        summary += f"{self.summary.number_of_notebooks}\n"
+        summary += "[green]Targets with linting results[/green]: "
+        summary += f"{self.summary.targets_with_violations}\n"
+        if self.journal is not None:
+            resumed = self.summary.number_of_targets - len(self.linters)
+            summary += "[green]Targets resumed from the journal[/green]: "
+            summary += f"{resumed}\n"
+            failures = self.journal_entries(FAILED)
+            if failures:
+                summary += "\n[red bold]Failed targets[/red bold]\n"
+                for target, entry in failures.items():
+                    error = entry["error"]
+                    summary += f"[red]{escape(target)}[/red]: {error['type']}: "
+                    summary += f"{escape(error['message'])}\n"
+        if self.summary.violations_per_slug:
+            summary += "\n[blue bold]Linting results by rule[/blue bold]\n"
+            for slug, count in self.summary.violations_per_slug.items():
+                summary += f"[orange3]{slug}[/orange3]: {count}\n"
+        yield Panel(summary, title="Batch summary")
@@ -0,0 +1,308 @@
+"""Per-cell facts, cached by cell content.
+
+Facts are the properties of a cell that only depend on its type and source
+(e.g., whether its code can be parsed, the modules it imports, its length).
+They are computed once per distinct cell content and reused by both lints and
+statistics; optionally, they are persisted across runs in a cache directory.
+The facts kept in memory are bounded: the least recently used ones are evicted.
+"""
+
+import ast
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from . import __version__
+from .config import settings
+
+# Name of the cache file within the cache directory
+CACHE_FILENAME = "cell_facts.json"
+
+# Maximum number of cell facts kept by a cache
+CACHE_MAX_ENTRIES = 100_000
+
+# Estimated memory taken by the facts of a cell (in bytes): with a memory budget,
+# caches take at most a tenth of it
+ENTRY_MEMORY = 1024
+CACHE_MEMORY_SHARE = 10
+
+# A line containing only a Markdown heading
+HEADING_PATTERN: Pattern[str] = re.compile(r"^\s*#{1,6}\s*[^#\n]*$")
+
+
+@dataclass
+class CellFacts:
+    # Lines
+    number_of_lines: int = 0
+    comment_runs: List[Tuple[int, int]] = field(default_factory=list)
+
+    # Python code (code cells only)
+    valid_syntax: bool = True
+    imported_modules: List[str] = field(default_factory=list)
+    number_of_functions: int = 0
+    number_of_classes: int = 0
+
+    # Markdown (Markdown cells only)
+    is_heading: bool = False
+    number_of_md_titles: int = 0
+
+
+def normalize_source(source: str) -> str:
+    """Normalize line endings, so that they do not affect the content hash."""
+    return source.replace("\r\n", "\n")
+
+
+def content_key(cell_type: str, source: str) -> str:
+    """Return the hash identifying a cell by its type and (normalized) source."""
+    content = f"{cell_type}\0{normalize_source(source)}"
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _ipython_transformer():
+    from IPython.core.inputtransformer2 import TransformerManager
+
+    return TransformerManager()
+
+
+def find_comment_runs(source: str) -> List[Tuple[int, int]]:
+    """Find the runs of consecutive comment lines in the source of a code cell.
+
+    The source is scanned line by line, in a single pass. Blank lines neither
+    interrupt a run nor count towards its length.
+
+    Args:
+        source (str): the source code to be scanned.
+
+    Returns:
+        List[Tuple[int, int]]: the runs found, as ``(first_line, length)`` pairs,
+        where ``first_line`` is the zero-based index of the first line of the run
+        and ``length`` is the number of comment lines it contains.
+    """
+    runs: List[Tuple[int, int]] = []
+    run_start: Optional[int] = None
+    run_length = 0
+    for line_index, line in enumerate(source.splitlines()):
+        stripped_line = line.strip()
+        if stripped_line.startswith("#"):
+            if run_start is None:
+                run_start = line_index
+            run_length += 1
+        elif stripped_line and run_start is not None:
+            runs.append((run_start, run_length))
+            run_start, run_length = None, 0
+    if run_start is not None:
+        runs.append((run_start, run_length))
+    return runs
+
+
+def compute_cell_facts(cell_type: str, source: str) -> CellFacts:
+    """Compute the facts of a cell from its type and source."""
+
+    source = normalize_source(source)
+    facts = CellFacts(number_of_lines=len(source.split("\n")))
+
+    if cell_type == "code":
+        facts.comment_runs = find_comment_runs(source)
+
+        # IPython syntax (e.g., magics) is translated to Python, as nbconvert does
+        try:
+            tree = ast.parse(_ipython_transformer().transform_cell(source))
+        except SyntaxError:
+            facts.valid_syntax = False
+        else:
+            for node in tree.body:
+                if isinstance(node, ast.Import):
+                    facts.imported_modules.extend(alias.name for alias in node.names)
+                elif isinstance(node, ast.FunctionDef):
+                    facts.number_of_functions += 1
+                elif isinstance(node, ast.ClassDef):
+                    facts.number_of_classes += 1
+
+    elif cell_type == "markdown":
+        lines = [line for line in source.splitlines() if line and not line.isspace()]
+        facts.number_of_md_titles = sum(line.lstrip().startswith("#") for line in lines)
+        facts.is_heading = all(HEADING_PATTERN.match(line) for line in lines)
+
+    return facts
+
+
+@dataclass
+class CacheStats:
+    """Lookups of the cell facts cache."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def merge(self, other: "CacheStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+class CellFactsCache:
+    """Cell facts keyed by cell content hash, evicted in least recently used order.
+
+    When a cell with an ``id`` changes, the entry of its previous content is
+    evicted, unless other cells still have that content. If a ``path`` is
+    given, the cache is loaded from (and can be saved to) that file.
+
+    Args:
+        path (Optional[Path]): the file of the cache.
+        max_entries (int): the maximum number of cell facts kept.
+    """
+
+    def __init__(
+        self, path: Optional[Path] = None, max_entries: int = CACHE_MAX_ENTRIES
+    ) -> None:
+        self.path: Optional[Path] = path
+        self.max_entries: int = max_entries
+        self._facts: Dict[str, CellFacts] = {}  # In least recently used order
+        self._keys_by_id: Dict[str, str] = {}
+        self._references: Counter = Counter()  # Number of ids, by content key
+        self._modified: bool = False
+        self.hits: int = 0
+        self.misses: int = 0
+        if self.path is not None and self.path.is_file():
+            self._load()
+
+    def get(
+        self, cell_type: str, source: str, cell_id: Optional[str] = None
+    ) -> CellFacts:
+        """Return the facts of a cell, computing them on a cache miss.
+
+        Args:
+            cell_type (str): the type of the cell (e.g., ``code``).
+            source (str): the source of the cell.
+            cell_id (Optional[str]): an identifier of the cell that is stable
+                across edits (e.g., the notebook path and the nbformat cell id).
+        """
+        key = content_key(cell_type, source)
+        facts = self._facts.get(key)
+        if facts is None:
+            self.misses += 1
+            facts = compute_cell_facts(cell_type, source)
+        else:
+            self.hits += 1
+        self.store(key, facts, cell_id)
+        return facts
+
+    def store(self, key: str, facts: CellFacts, cell_id: Optional[str] = None) -> None:
+        """Add the facts of a cell to the cache (as the most recently used)."""
+        if key in self._facts:
+            self._facts[key] = self._facts.pop(key)
+        else:
+            self._facts[key] = facts
+            self._modified = True
+            while len(self._facts) > self.max_entries:
+                self._evict(next(iter(self._facts)))
+        if cell_id is not None:
+            previous_key = self._keys_by_id.get(cell_id)
+            if previous_key != key:
+                self._keys_by_id[cell_id] = key
+                self._references[key] += 1
+                self._modified = True
+                if previous_key is not None:
+                    # The cell has been edited: its previous content is evicted,
+                    # unless other cells still have it
+                    self._references[previous_key] -= 1
+                    if self._references[previous_key] <= 0:
+                        del self._references[previous_key]
+                        self._facts.pop(previous_key, None)
+
+    def _evict(self, key: str) -> None:
+        del self._facts[key]
+        # The ids of evicted contents are dropped once they outnumber the facts
+        if len(self._keys_by_id) > 2 * self.max_entries:
+            self._keys_by_id = {
+                cell_id: id_key
+                for cell_id, id_key in self._keys_by_id.items()
+                if id_key in self._facts
+            }
+            self._references = Counter(self._keys_by_id.values())
+
+    @property
+    def stats(self) -> CacheStats:
+        """The lookups of the cache so far."""
+        return CacheStats(self.hits, self.misses)
+
+    def __len__(self) -> int:
+        return len(self._facts)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._facts
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupted cache is simply discarded
+            return
+        if data.get("version") != __version__:
+            return
+        self._facts = {
+            key: CellFacts(
+                **{**facts, "comment_runs": [tuple(r) for r in facts["comment_runs"]]}
+            )
+            for key, facts in data["facts"].items()
+        }
+        self._keys_by_id = data["ids"]
+        self._references = Counter(self._keys_by_id.values())
+        while len(self._facts) > self.max_entries:
+            self._evict(next(iter(self._facts)))
+
+    def save(self) -> None:
+        """Write the cache to its file (atomically), if it has been modified."""
+        if self.path is None or not self._modified:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": __version__,
+            "facts": {
+                key: dataclasses.asdict(facts) for key, facts in self._facts.items()
+            },
+            "ids": self._keys_by_id,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self._modified = False
+
+
+# Caches of the current process, by file path
+_caches: Dict[Optional[Path], CellFactsCache] = {}
+
+
+def get_cache() -> CellFactsCache:
+    """Return the cell facts cache of the current process.
+
+    The cache is persisted in ``settings.cache_dir``, if set. With a memory budget
+    (``settings.max_memory``), the number of facts kept is bounded accordingly.
+    """
+    cache_path = settings.cache_dir / CACHE_FILENAME if settings.cache_dir else None
+    cache = _caches.get(cache_path)
+    if cache is None:
+        cache = _caches.setdefault(cache_path, CellFactsCache(cache_path))
+    cache.max_entries = CACHE_MAX_ENTRIES
+    if settings.max_memory is not None:
+        cache.max_entries = min(
+            CACHE_MAX_ENTRIES,
+            max(1, settings.max_memory // CACHE_MEMORY_SHARE // ENTRY_MEMORY),
+        )
+    return cache
@@ -1,7 +1,9 @@
+from contextvars import ContextVar
 from enum import Enum
-from typing import List, Optional, Set
+from pathlib import Path
+from typing import Any, List, Optional, Set, Tuple
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class CellRenderingMode(str, Enum):
@@ -9,14 +11,22 @@ class CellRenderingMode(str, Enum):
     COMPACT = "compact"
 
 
+class ReportFormat(str, Enum):
+    RICH = "rich"
+    PLAIN = "plain"
+    SUMMARY = "summary"
+
+
 class Settings(BaseSettings):
 
     plugins: List[str] = []
     include: Optional[Set[str]] = None
     exclude: Optional[Set[str]] = None
     hide_stats: bool = False
+    collect_stats: bool = True  # False if statistics are neither shown nor exported
     hide_recommendations: bool = False
     cell_rendering_mode: CellRenderingMode = CellRenderingMode.COMPACT
+    report_format: ReportFormat = ReportFormat.RICH
     result_details_indentation: int = 5
     display_cell_index: bool = False
     max_cells_in_notebook: int = 50
@@ -27,6 +37,18 @@ class Settings(BaseSettings):
     max_data_file_size: int = 10 * 1000000  # 10MB
     max_multiline_python_comment: int = 4
     max_filename_length: int = 0  # TODO: enable CLI configuration of this option.
+    near_duplicate_threshold: float = 0.8
+    minhash_signature_size: int = 128
+    partial_fetch: bool = True
+    mirror_cache_dir: Optional[Path] = None
+    mirror_cache_size: Optional[int] = None  # In bytes
+    jobs: int = 1
+    cache_dir: Optional[Path] = None
+    max_violations: Optional[int] = None
+    max_memory: Optional[int] = None  # In bytes
+    read_ahead: int = 32  # Number of notebook files read ahead of linting
+    io_threads: int = 4
+    shard: Optional[Tuple[int, int]] = None  # (index, count), from 1
 
     # TODO: custom validation: included_lints OR excluded lints must be None
     #       I.e., something like:
@@ -44,4 +66,51 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-settings = Settings()
+class FrozenSettings(Settings):
+    """Settings that cannot be modified, e.g., those of a lint session."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+
+# Settings of the lint session active in the current thread or task, if any
+# (see ``pynblint.session``)
+active_settings: ContextVar[Optional[Settings]] = ContextVar(
+    "active_settings", default=None
+)
+
+
+# Incremented whenever the global settings are modified (through ``settings``)
+global_settings_version: int = 0
+
+
+class SettingsProxy:
+    """Gives access to the settings in effect.
+
+    Attributes are read from the settings of the active lint session, if any;
+    otherwise, from the global settings (which can still be updated, e.g., by
+    the command-line interface or by tests).
+    """
+
+    def __init__(self, global_settings: Settings) -> None:
+        object.__setattr__(self, "_global_settings", global_settings)
+
+    def current(self) -> Settings:
+        """Return the settings in effect."""
+        return active_settings.get() or self._global_settings
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.current(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        global global_settings_version
+
+        if active_settings.get() is not None:
+            raise AttributeError(
+                "The settings of an active lint session cannot be modified."
+            )
+        setattr(self._global_settings, name, value)
+        global_settings_version += 1
+
+
+global_settings = Settings()
+settings: Settings = SettingsProxy(global_settings)  # type: ignore
@@ -1,17 +1,26 @@
 import ast
+import hashlib
 import os
-import re
 import tempfile
 import zipfile
 from abc import ABC
 from enum import Enum
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import git
 import nbconvert
 import nbformat
-import rich
 from nbformat.notebooknode import NotebookNode
 from rich.abc import RichRenderable
 from rich.columns import Columns
@@ -20,8 +29,37 @@ from rich.padding import Padding
 from rich.panel import Panel
 from rich.syntax import Syntax
 
+from . import cell_facts, git_utils, metrics, minhash
+from .cell_facts import CellFacts
 from .config import CellRenderingMode, settings
+from .mirror_cache import MirrorCache
+from .prefetch import file_size
 from .rich_extensions import NotebookMarkdown
+from .scan_snapshot import ScanSnapshot
+
+if TYPE_CHECKING:
+    from rich.syntax import Lexer
+
+# Default filename of notebooks that are not read from the filesystem
+VIRTUAL_NOTEBOOK_NAME = "notebook.ipynb"
+
+
+def content_digest(content: bytes) -> str:
+    """Return the hash of the bytes of a notebook."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+Key = TypeVar("Key")
+
+
+def _group_paths(
+    paths: Iterable[Path], key: Callable[[Path], Key]
+) -> Dict[Key, List[Path]]:
+    """Group paths by key, preserving their order within each group."""
+    groups: Dict[Key, List[Path]] = {}
+    for path in paths:
+        groups.setdefault(key(path), []).append(path)
+    return groups
 
 
 class Repository(ABC):
@@ -29,29 +67,136 @@ class Repository(ABC):
     This class stores data about a code repository.
     """
 
+    # Temporary directory holding the repository files (e.g., an extracted archive)
+    _tmp_dir: Optional[tempfile.TemporaryDirectory] = None
+
     def __init__(self, path: Path):
 
         # Repository info
         self.path = path
 
         # Extracted content
-        self.notebooks: List[Notebook] = []  # List of Notebook objects
+        self.notebook_paths: List[Path] = []  # Paths of the notebooks found
+        self._notebooks: Optional[List[Notebook]] = None
+
+        # Size of the repository files (keyed by their path relative to the repo
+        # root) when known from git metadata; ``None`` means "stat the files".
+        self.file_sizes: Optional[Dict[Path, int]] = None
+
+        # Snapshot of the directory tree, reused across runs (see ``scan_snapshot``)
+        self.scan_snapshot: Optional[ScanSnapshot] = None
+
+        # MinHash signatures of the notebooks, keyed by notebook path, as computed
+        # while linting them (see ``Notebook.minhash_signature()``)
+        self.linted_signatures: Dict[Path, List[int]] = {}
 
     def retrieve_notebooks(self):
 
+        if self.scan_snapshot is not None:
+            self.notebook_paths = self.scan_snapshot.notebook_paths
+            return
+
         # Directories to ignore while traversing the tree
         dirs_ignore = [".ipynb_checkpoints"]
 
-        for root, dirs, files in os.walk(self.path):
-            # `dirs[:] = value` modifies dirs in-place
-            dirs[:] = [d for d in dirs if d not in dirs_ignore]
-            for f in files:
-                if f.endswith(".ipynb"):
-                    nb = Notebook(Path(root) / Path(f), self)
-                    self.notebooks.append(nb)
+        with metrics.stage("discovery"):
+            for root, dirs, files in os.walk(self.path):
+                # `dirs[:] = value` modifies dirs in-place
+                dirs[:] = [d for d in dirs if d not in dirs_ignore]
+                for f in files:
+                    if f.endswith(".ipynb"):
+                        self.notebook_paths.append(Path(root) / Path(f))
+
+        # The order of os.walk() is not guaranteed across filesystems
+        self.notebook_paths.sort()
+
+    @property
+    def notebooks(self) -> List["Notebook"]:
+        """The notebooks contained in the repository.
+
+        Notebooks are read and parsed the first time this property is accessed.
+        """
+        if self._notebooks is None:
+            self._notebooks = [self.load_notebook(path) for path in self.notebook_paths]
+        return self._notebooks
+
+    @notebooks.setter
+    def notebooks(self, notebooks: List["Notebook"]) -> None:
+        self._notebooks = notebooks
+
+    # Indexes of the repository paths, to be queried by path-level lints in
+    # constant time (instead of scanning the notebook paths once per query)
+
+    @cached_property
+    def notebook_sizes(self) -> Dict[Path, int]:
+        """The size of the notebooks (in bytes) known without stat-ing them, by path.
+
+        Sizes are taken from git metadata or, in directories that are not git
+        working trees, from the directories listed by the scan snapshot (if any);
+        notebooks whose size is unknown are missing.
+        """
+        if self.file_sizes is not None:
+            file_sizes = self.file_sizes
+        else:
+            git_repo = git_utils.open_work_tree(self.path)
+            if git_repo is not None:
+                file_sizes = git_utils.indexed_file_sizes(git_repo)
+            elif self.scan_snapshot is not None:
+                file_sizes = self.scan_snapshot.listed_file_sizes
+            else:
+                return {}
+        return {
+            path: file_sizes[path.relative_to(self.path)]
+            for path in self.notebook_paths
+            if path.relative_to(self.path) in file_sizes
+        }
+
+    @cached_property
+    def notebooks_by_name(self) -> Dict[str, List[Path]]:
+        """The paths of the notebooks, keyed by filename (e.g., ``"eda.ipynb"``)."""
+        return _group_paths(self.notebook_paths, lambda path: path.name)
+
+    @cached_property
+    def notebooks_by_stem(self) -> Dict[str, List[Path]]:
+        """The paths of the notebooks, keyed by filename stem (e.g., ``"eda"``)."""
+        return _group_paths(self.notebook_paths, lambda path: path.stem)
+
+    @cached_property
+    def notebooks_by_directory(self) -> Dict[Path, List[Path]]:
+        """The paths of the notebooks, keyed by the directory containing them."""
+        return _group_paths(self.notebook_paths, lambda path: path.parent)
+
+    @cached_property
+    def files_by_extension(self) -> Dict[str, List[Path]]:
+        """The paths of all the repository files, keyed by lowercase extension.
+
+        Files without an extension are keyed by the empty string.
+        """
+        return _group_paths(
+            (self.path / file_path for file_path in self.working_file_paths()),
+            lambda path: path.suffix.lower(),
+        )
+
+    def close(self) -> None:
+        """Remove the temporary directory holding the repository files, if any.
+
+        Call it once the repository has been linted (e.g., in batch runs, where
+        the results of every target are kept until the end): files that have
+        not been read yet cannot be read anymore.
+        """
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+    def load_notebook(self, path: Path) -> "Notebook":
+        """Read and parse the notebook at ``path``."""
+        return Notebook(path, self)
 
     @property
     def is_git_repository(self):
+        if self.scan_snapshot is not None:
+            return self.scan_snapshot.has_git_directory
+
         # Directories to ignore while traversing the tree
         dirs_ignore = [".ipynb_checkpoints"]
         versioned = False
@@ -63,6 +208,61 @@ class Repository(ABC):
                     versioned = True
         return versioned
 
+    def has_file(self, relative_path: str) -> bool:
+        """Return ``True`` if the repository contains a file at ``relative_path``."""
+        if self.file_sizes is not None:
+            return Path(relative_path) in self.file_sizes
+        if self.scan_snapshot is not None:
+            return self.scan_snapshot.has_file(relative_path)
+        return (self.path / relative_path).exists()
+
+    def working_file_paths(self) -> List[Path]:
+        """Return the relative paths of the repository files.
+
+        Unlike ``working_file_sizes()``, the paths listed in the scan snapshot
+        (if any) are used as they are, without reading the size of the files.
+        """
+        if (
+            self.file_sizes is None
+            and self.scan_snapshot is not None
+            and git_utils.open_work_tree(self.path) is None
+        ):
+            return self.scan_snapshot.file_paths
+        return list(self.working_file_sizes())
+
+    def working_file_sizes(self) -> Dict[Path, int]:
+        """Return the size of the repository files, keyed by their relative path.
+
+        Sizes are taken from git metadata whenever possible (i.e., for remote
+        repositories and for local directories that are the root of a git working
+        tree); otherwise, the files listed in the scan snapshot (if any) are
+        stat-ed, or the directory tree is traversed. Git internals are never
+        included.
+        """
+        if self.file_sizes is not None:
+            return self.file_sizes
+
+        git_repo = git_utils.open_work_tree(self.path)
+        if git_repo is not None:
+            return git_utils.working_file_sizes(git_repo)
+
+        if self.scan_snapshot is not None:
+            # The sizes recorded in the snapshot may be outdated (files can change
+            # without their directory changing)
+            return {
+                file_path: file_size(self.path / file_path)
+                for file_path in self.scan_snapshot.file_paths
+            }
+
+        sizes: Dict[Path, int] = {}
+        for dirpath, dirs, filenames in os.walk(self.path):
+            # `dirs[:] = value` modifies dirs in-place
+            dirs[:] = [d for d in dirs if d != ".git"]
+            for filename in filenames:
+                file_path = Path(dirpath) / filename
+                sizes[file_path.relative_to(self.path)] = os.path.getsize(file_path)
+        return sizes
+
     @property
     def large_file_paths(self) -> List[Path]:
         """Return the list of files whose size is above the fixed threshold.
@@ -72,13 +272,11 @@ class Repository(ABC):
         Returns:
             List[Path]: the list of large files.
         """
-        large_files: List[Path] = []
-        for dirpath, _, filenames in os.walk(self.path):
-            for filename in filenames:
-                file_path = Path(dirpath) / filename
-                if os.path.getsize(file_path) > settings.max_data_file_size:
-                    large_files.append(file_path)
-        return large_files
+        return [
+            self.path / file_path
+            for file_path, size in self.working_file_sizes().items()
+            if size > settings.max_data_file_size
+        ]
 
 
 class LocalRepository(Repository):
@@ -90,14 +288,18 @@ class LocalRepository(Repository):
     def __init__(self, source_path: Path):
 
         self.source_path = source_path
-        tmp_dir: Optional[tempfile.TemporaryDirectory] = None
+
+        # Temp directory (if any) is kept until the repository is closed
+        # (or garbage collected)
+        self._tmp_dir = None
+        scan_snapshot: Optional[ScanSnapshot] = None
 
         # Handle .zip archives
         if self.source_path.suffix == ".zip":
 
             # Create temp directory
-            tmp_dir = tempfile.TemporaryDirectory()
-            repo_path: Path = Path(tmp_dir.name)
+            self._tmp_dir = tempfile.TemporaryDirectory()
+            repo_path: Path = Path(self._tmp_dir.name)
 
             # Extract the zip file into the temp folder
             with zipfile.ZipFile(self.source_path, "r") as zip_file:
@@ -106,6 +308,11 @@ class LocalRepository(Repository):
         # Handle local folders
         elif self.source_path.is_dir():
             repo_path = self.source_path
+            # The tree of local folders is scanned once, reusing the directories
+            # unchanged since the previous run (extracted archives are all new)
+            if settings.cache_dir:
+                with metrics.stage("discovery"):
+                    scan_snapshot = ScanSnapshot.in_cache(repo_path, settings.cache_dir)
 
         else:
             raise ValueError(
@@ -114,34 +321,70 @@ class LocalRepository(Repository):
             )
 
         super().__init__(repo_path)
+        self.scan_snapshot = scan_snapshot
         self.retrieve_notebooks()
 
-        # Clean up the temp directory if one was created
-        if tmp_dir is not None:
-            tmp_dir.cleanup()
-
 
 class GitHubRepository(Repository):
     """
-    This class stores data about a GitHub repository
+    This class stores data about a GitHub repository.
+
+    When ``partial_fetch`` is enabled, the repository is cloned without downloading
+    large blobs and only notebooks and dependency manifests are checked out;
+    the size of every other file is read from the git tree.
+
+    With ``settings.mirror_cache_dir``, the repository is kept as a mirror in the
+    cache directory (see ``pynblint.mirror_cache``) and checked out in a worktree
+    of the mirror, so that later runs only fetch the new commits.
     """
 
-    def __init__(self, github_url: str):
+    def __init__(self, github_url: str, partial_fetch: Optional[bool] = None):
 
         self.url = github_url
+        if partial_fetch is None:
+            partial_fetch = settings.partial_fetch
+
+        # Clone the repo in a temp directory, which is kept until the repository is
+        # closed (or garbage collected)
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        repo_name = github_url.rstrip("/").split("/")[-1]
+        if repo_name.endswith(".git"):
+            repo_name = repo_name[: -len(".git")]
+        repo_path = Path(self._tmp_dir.name) / repo_name
+        super().__init__(repo_path)
 
-        # Clone the repo in a temp directory
-        tmp_dir = tempfile.TemporaryDirectory()
-        git.Repo.clone_from(  # type: ignore
-            url=github_url, to_path=tmp_dir.name, depth=1
-        )
-        super().__init__(Path(tmp_dir.name) / github_url.split("/")[-1])
+        if settings.mirror_cache_dir:
+            # Check out a worktree of the mirror kept in the cache (updated with
+            # the new commits of the remote repository)
+            size_limit = settings.max_data_file_size + 1 if partial_fetch else None
+            mirror_cache = MirrorCache(
+                settings.mirror_cache_dir, settings.mirror_cache_size
+            )
+            git_repo = mirror_cache.worktree(github_url, repo_path, size_limit)
+            if size_limit:
+                self.file_sizes = git_utils.tree_file_sizes(
+                    git_repo, size_limit=size_limit
+                )
+        elif partial_fetch:
+            size_limit = settings.max_data_file_size + 1
+            git_repo = git_utils.partial_clone(github_url, repo_path, size_limit)
+            self.file_sizes = git_utils.tree_file_sizes(git_repo, size_limit=size_limit)
+        else:
+            git.Repo.clone_from(  # type: ignore
+                url=github_url, to_path=repo_path, depth=1
+            )
 
         # Analyze the repo
         self.retrieve_notebooks()
 
-        # Clean up the temp directory
-        tmp_dir.cleanup()
+
+@lru_cache(maxsize=None)
+def python_lexer() -> Union["Lexer", str]:
+    """Return the (shared) lexer used to highlight code cells.
+
+    The lexer is looked up once through rich, instead of once per rendered cell.
+    """
+    return Syntax("", "python").lexer or "python"
 
 
 class CellType(str, Enum):
@@ -152,11 +395,21 @@ class CellType(str, Enum):
 
 
 class Cell(RichRenderable):
-    def __init__(self, cell_index: int, cell_dict: NotebookNode) -> None:
-        """Pynblint's representation of a notebook cell."""
+    def __init__(
+        self, cell_index: int, cell_dict: NotebookNode, facts_id: Optional[str] = None
+    ) -> None:
+        """Pynblint's representation of a notebook cell.
+
+        Args:
+            cell_index (int): the zero-based position of the cell in the notebook.
+            cell_dict (NotebookNode): the cell, as read by nbformat.
+            facts_id (Optional[str]): an identifier of the cell that is stable
+                across edits, used to evict outdated facts from the cache.
+        """
 
         self.cell_index: int = cell_index
         self._cell_dict: NotebookNode = cell_dict
+        self.facts_id: Optional[str] = facts_id
 
         # Cell type
         self.cell_type: CellType
@@ -206,16 +459,18 @@ class Cell(RichRenderable):
                 "The `non_executed` property is defined only for code cells."
             )
 
+    @cached_property
+    def facts(self) -> CellFacts:
+        """The facts of the cell (retrieved from the cache, if available)."""
+        return cell_facts.get_cache().get(
+            self.cell_type.value, self.cell_source, self.facts_id
+        )
+
     @property
     def is_heading(self) -> bool:
         """Return ``True`` if the cell is an MD cell containing only MD headings."""
         if self.cell_type == CellType.MARKDOWN:
-            pattern = re.compile(r"^\s*#{1,6}\s*[^#\n]*$")
-            return all(
-                pattern.match(line)
-                for line in self.cell_source.splitlines()
-                if line and (not line.isspace())
-            )
+            return self.facts.is_heading
         else:
             return False
 
@@ -230,7 +485,9 @@ class Cell(RichRenderable):
             cell_dict["source"] = self._source_excerpt
         return cell_dict
 
-    def __rich__(self) -> Columns:
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
 
         if self.cell_type == CellType.CODE:
             counter = self.exec_count or " "
@@ -243,9 +500,11 @@ class Cell(RichRenderable):
                     f"\nIn [{counter}]:",
                     Panel(
                         Syntax(
-                            self._source_excerpt, "python", background_color="default"
+                            self._source_excerpt,
+                            python_lexer(),
+                            background_color="default",
                         ),
-                        width=int(rich.get_console().size[0] * 0.85),
+                        width=int(console.width * 0.85),
                         title=panel_title,
                     ),
                 ]
@@ -258,7 +517,7 @@ class Cell(RichRenderable):
                 ]
             )
 
-        return rendered_cell
+        yield rendered_cell
 
 
 class Notebook(RichRenderable):
@@ -267,33 +526,187 @@ class Notebook(RichRenderable):
     on which pynblint functions are called
     """
 
-    def __init__(self, path: Path, repository: Optional[Repository] = None):
+    def __init__(
+        self,
+        path: Path,
+        repository: Optional[Repository] = None,
+        nb_raw: Optional[str] = None,
+        nb_node: Optional[NotebookNode] = None,
+    ):
+        """Load a notebook.
+
+        The notebook is read and parsed on first access to its content, so that
+        lints checking only its path do not need to read it.
+
+        Args:
+            path (Path): the path of the notebook.
+            repository (Optional[Repository]): the repository containing the notebook.
+            nb_raw (Optional[str]): the JSON content of the notebook; if supplied,
+                the notebook is not read from ``path``.
+            nb_node (Optional[NotebookNode]): the notebook already parsed by
+                nbformat; if supplied, the notebook is not read from ``path``.
+        """
         self.path: Path = path
         self.repository: Optional[Repository] = repository
+        self._nb_raw: Optional[str] = nb_raw
+        self._nb_node: Optional[NotebookNode] = nb_node
 
-        # Read the notebook with nbformat
-        with open(self.path) as f:
-            nb_raw = f.read()
-        self.nb_dict: NotebookNode = nbformat.reads(nb_raw, as_version=4)
+        # Whether the content can be read again from ``path`` after ``release()``
+        self._reloadable: bool = nb_raw is None and nb_node is None
+
+        # Whether ``path`` is a virtual filename (i.e., not identifying the notebook)
+        self._virtual: bool = False
+
+    @cached_property
+    def nb_dict(self) -> NotebookNode:
+        """The notebook parsed by nbformat (read on first access)."""
+        if self._nb_node is not None:
+            nb_dict = nbformat.convert(self._nb_node, to_version=4)
+        else:
+            nb_raw = self._nb_raw
+            if nb_raw is None:
+                with open(self.path) as f:
+                    nb_raw = f.read()
+            nb_dict = nbformat.reads(nb_raw, as_version=4)
+        self._nb_raw, self._nb_node = None, None
+        return nb_dict
 
-        # Populate the list of Cells
-        self.cells: List[Cell] = [
-            Cell(cell_index, cell_dict)
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the notebook content has been read and parsed."""
+        return "nb_dict" in self.__dict__
+
+    @cached_property
+    def cells(self) -> List[Cell]:
+        # Cells are identified across edits by path and cell id, which virtual
+        # notebooks share
+        return [
+            Cell(
+                cell_index,
+                cell_dict,
+                (
+                    f"{self.path}#{cell_dict['id']}"
+                    if "id" in cell_dict and not self._virtual
+                    else None
+                ),
+            )
             for cell_index, cell_dict in enumerate(self.nb_dict.cells)
         ]
-        self.non_executed = all([cell.non_executed for cell in self.code_cells])
 
-        # Convert the notebook to a Python script
-        python_exporter = nbconvert.PythonExporter()
-        self.script, _ = python_exporter.from_notebook_node(self.nb_dict)
+    @cached_property
+    def non_executed(self) -> bool:
+        return all([cell.non_executed for cell in self.code_cells])
+
+    @classmethod
+    def from_string(
+        cls, nb_raw: Union[str, bytes], name: str = VIRTUAL_NOTEBOOK_NAME
+    ) -> "Notebook":
+        """Load a notebook from its JSON content, without accessing the filesystem.
+
+        Args:
+            nb_raw (Union[str, bytes]): the JSON content of the notebook
+                (bytes are decoded as UTF-8).
+            name (str): the virtual filename of the notebook, checked by the
+                filename-based lints (e.g., ``untitled-notebook``).
+        """
+        if isinstance(nb_raw, bytes):
+            nb_raw = nb_raw.decode("utf-8")
+        notebook = cls(Path(name), nb_raw=nb_raw)
+        notebook._virtual = True
+        return notebook
+
+    @classmethod
+    def from_file_content(cls, path: Path, content: bytes) -> "Notebook":
+        """Load a notebook from the content already read from the file at ``path``.
+
+        Unlike notebooks loaded with ``from_string()``, the content can be read
+        again from ``path`` once released.
+        """
+        notebook = cls(path, nb_raw=content.decode("utf-8"))
+        notebook._reloadable = True
+        return notebook
+
+    @classmethod
+    def from_node(
+        cls, nb_node: NotebookNode, name: str = VIRTUAL_NOTEBOOK_NAME
+    ) -> "Notebook":
+        """Load a notebook already parsed by nbformat.
+
+        Args:
+            nb_node (NotebookNode): the parsed notebook.
+            name (str): the virtual filename of the notebook, checked by the
+                filename-based lints (e.g., ``untitled-notebook``).
+        """
+        notebook = cls(Path(name), nb_node=nb_node)
+        notebook._virtual = True
+        return notebook
 
-        # Extract the Python abstract syntax tree
-        # (or set `has_invalid_python_syntax` to True)
-        self.has_invalid_python_syntax: bool = False
+    @property
+    def has_invalid_python_syntax(self) -> bool:
+        """Return ``True`` if the notebook script contains invalid Python syntax.
+
+        Notebooks whose code cells are all valid need not be converted to a script;
+        otherwise, the whole script is parsed, as statements may span cells.
+        """
+        if all(cell.facts.valid_syntax for cell in self.code_cells):
+            return False
         try:
-            self.ast = ast.parse(self.script)
+            self.ast
         except SyntaxError:
-            self.has_invalid_python_syntax = True
+            return True
+        return False
+
+    @cached_property
+    def script(self) -> str:
+        """The notebook converted to a Python script (computed on first access)."""
+        python_exporter = nbconvert.PythonExporter()
+        script, _ = python_exporter.from_notebook_node(self.nb_dict)
+        return script
+
+    @cached_property
+    def ast(self) -> ast.Module:
+        """The abstract syntax tree of the notebook script (computed on first access).
+
+        Raises:
+            SyntaxError: if the notebook contains invalid Python syntax.
+        """
+        return ast.parse(self.script)
+
+    def minhash_signature(self, size: int) -> List[int]:
+        """Return the MinHash signature of the code and Markdown sources.
+
+        Args:
+            size (int): the number of signature bins (see ``minhash.signature()``).
+
+        Returns:
+            List[int]: the signature, or an empty list if the sources contain no
+            tokens.
+        """
+        signature = minhash.signature(
+            "\n".join(
+                cell.cell_source
+                for cell in self.cells
+                if cell.cell_type in (CellType.CODE, CellType.MARKDOWN)
+            ),
+            size,
+        )
+        return list(signature) if signature is not None else []
+
+    def release(self) -> None:
+        """Drop the artifacts derived from the notebook content (e.g., once linted).
+
+        The script and the AST are dropped. If the notebook was read from
+        ``path``, the parsed content and the cells are dropped as well (and read
+        again on the next access); cells still referenced elsewhere (e.g., by
+        linting results) are kept, without their outputs.
+        """
+        for artifact in ("script", "ast"):
+            self.__dict__.pop(artifact, None)
+        if not self._reloadable:
+            return
+        for cell in self.__dict__.pop("cells", []):
+            cell.__dict__.pop("_cell_dict", None)
+        self.__dict__.pop("nb_dict", None)
 
     @property
     def code_cells(self) -> List[Cell]:
@@ -0,0 +1,260 @@
+"""Corpus-level statistics, computed with mergeable streaming reducers.
+
+Every reducer can be updated one value at a time and merged with reducers of the
+same kind (e.g., computed by other worker processes, or in other runs from their
+JSON output), so that statistics of large corpora never require keeping all the
+observed values.
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from .nb_linter import NotebookLinter
+
+# Quantiles reported for distributions
+REPORTED_QUANTILES: List[float] = [0.5, 0.9, 0.99]
+
+
+@dataclass
+class QuantileSketch:
+    """A DDSketch-like quantile sketch for non-negative values.
+
+    Values are counted in logarithmic bins, so that estimated quantiles are
+    within ``relative_accuracy`` of the actual ones.
+    """
+
+    relative_accuracy: float = 0.01
+    bins: Dict[int, int] = field(default_factory=dict)
+    zero_count: int = 0
+
+    @property
+    def gamma(self) -> float:
+        return (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value, self.gamma))
+        self.bins[index] = self.bins.get(index, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with a different accuracy.")
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return an estimate of the ``q``-quantile (``None`` if there are none)."""
+        count = self.count
+        if count == 0:
+            return None
+        rank = q * (count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def as_dict(self) -> Dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(index): count for index, count in sorted(self.bins.items())},
+            "zero_count": self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, sketch_dict: Dict) -> "QuantileSketch":
+        return cls(
+            relative_accuracy=sketch_dict["relative_accuracy"],
+            bins={int(index): count for index, count in sketch_dict["bins"].items()},
+            zero_count=sketch_dict["zero_count"],
+        )
+
+
+def histogram_bucket(value: float) -> str:
+    """Return the label of the power-of-two histogram bucket containing ``value``.
+
+    Buckets are ``0`` and the half-open intervals ``[2^(k-1), 2^k)``, labeled by
+    their upper bound ``2^k``.
+    """
+    if value <= 0:
+        return "0"
+    upper_bound = 2.0 ** (math.floor(math.log2(value)) + 1)
+    return f"{upper_bound:g}"
+
+
+@dataclass
+class Distribution:
+    """Count, range, mean, histogram and quantile sketch of a series of values."""
+
+    count: int = 0
+    total: float = 0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    histogram: Counter = field(default_factory=Counter)
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.histogram[histogram_bucket(value)] += 1
+        self.sketch.add(value)
+
+    def merge(self, other: "Distribution") -> None:
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None and other.maximum is not None:
+            self.minimum = (
+                other.minimum
+                if self.minimum is None
+                else min(self.minimum, other.minimum)
+            )
+            self.maximum = (
+                other.maximum
+                if self.maximum is None
+                else max(self.maximum, other.maximum)
+            )
+        self.histogram.update(other.histogram)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return an estimate of the ``q``-quantile, within the observed range."""
+        estimate = self.sketch.quantile(q)
+        if estimate is None or self.minimum is None or self.maximum is None:
+            return None
+        return min(max(estimate, self.minimum), self.maximum)
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.mean,
+            "quantiles": {
+                f"p{round(q * 100)}": self.quantile(q) for q in REPORTED_QUANTILES
+            },
+            "histogram": dict(
+                sorted(self.histogram.items(), key=lambda item: float(item[0]))
+            ),
+            "sketch": self.sketch.as_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, distribution_dict: Dict) -> "Distribution":
+        return cls(
+            count=distribution_dict["count"],
+            total=distribution_dict["total"],
+            minimum=distribution_dict["min"],
+            maximum=distribution_dict["max"],
+            histogram=Counter(distribution_dict["histogram"]),
+            sketch=QuantileSketch.from_dict(distribution_dict["sketch"]),
+        )
+
+
+# Distributions collected for each notebook
+DISTRIBUTIONS: List[str] = [
+    "cells_per_notebook",
+    "md_code_ratio",
+    "functions_per_notebook",
+    "violations_per_notebook",
+]
+
+
+@dataclass
+class CorpusStats:
+    """Statistics of a corpus of notebooks (and repositories)."""
+
+    number_of_repositories: int = 0
+    number_of_notebooks: int = 0
+    distributions: Dict[str, Distribution] = field(
+        default_factory=lambda: {name: Distribution() for name in DISTRIBUTIONS}
+    )
+    violations_per_slug: Counter = field(default_factory=Counter)
+    notebooks_per_slug: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def from_notebook(cls, nb_linter: "NotebookLinter") -> "CorpusStats":
+        """Return the statistics of a single linted notebook."""
+        corpus_stats = cls(number_of_notebooks=1)
+        violations = Counter(finding.slug for finding in nb_linter.findings())
+        corpus_stats.violations_per_slug.update(violations)
+        corpus_stats.notebooks_per_slug.update(violations.keys())
+        corpus_stats.distributions["violations_per_notebook"].add(
+            sum(violations.values())
+        )
+
+        # Statistics are not available for notebooks skipped by a violation budget
+        notebook_stats = nb_linter.notebook_stats
+        if notebook_stats is not None:
+            distributions = corpus_stats.distributions
+            distributions["cells_per_notebook"].add(notebook_stats.number_of_cells)
+            if notebook_stats.number_of_code_cells:
+                distributions["md_code_ratio"].add(
+                    notebook_stats.number_of_MD_cells
+                    / notebook_stats.number_of_code_cells
+                )
+            if notebook_stats.number_of_functions is not None:
+                distributions["functions_per_notebook"].add(
+                    notebook_stats.number_of_functions
+                )
+        return corpus_stats
+
+    @classmethod
+    def merged(cls, corpus_stats: Iterable["CorpusStats"]) -> "CorpusStats":
+        """Return the statistics of the union of several corpora."""
+        merged_stats = cls()
+        for stats in corpus_stats:
+            merged_stats.merge(stats)
+        return merged_stats
+
+    def merge(self, other: "CorpusStats") -> None:
+        self.number_of_repositories += other.number_of_repositories
+        self.number_of_notebooks += other.number_of_notebooks
+        for name, distribution in other.distributions.items():
+            self.distributions.setdefault(name, Distribution()).merge(distribution)
+        self.violations_per_slug.update(other.violations_per_slug)
+        self.notebooks_per_slug.update(other.notebooks_per_slug)
+
+    def as_dict(self) -> Dict:
+        return {
+            "number_of_repositories": self.number_of_repositories,
+            "number_of_notebooks": self.number_of_notebooks,
+            "distributions": {
+                name: distribution.as_dict()
+                for name, distribution in self.distributions.items()
+            },
+            "violations_per_slug": dict(self.violations_per_slug.most_common()),
+            "notebooks_per_slug": dict(self.notebooks_per_slug.most_common()),
+        }
+
+    @classmethod
+    def from_dict(cls, stats_dict: Dict) -> "CorpusStats":
+        return cls(
+            number_of_repositories=stats_dict["number_of_repositories"],
+            number_of_notebooks=stats_dict["number_of_notebooks"],
+            distributions={
+                name: Distribution.from_dict(distribution_dict)
+                for name, distribution_dict in stats_dict["distributions"].items()
+            },
+            violations_per_slug=Counter(stats_dict["violations_per_slug"]),
+            notebooks_per_slug=Counter(stats_dict["notebooks_per_slug"]),
+        )
@@ -2,3 +2,21 @@ class ExportFormatNotSupportedError(ValueError):
     def __init__(self, message) -> None:
         self.message = message
         super().__init__(self.message)
+
+
+class ShardMergeError(ValueError):
+    def __init__(self, message) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class BaselineFormatError(ValueError):
+    def __init__(self, message) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class JournalFormatError(ValueError):
+    def __init__(self, message) -> None:
+        self.message = message
+        super().__init__(self.message)
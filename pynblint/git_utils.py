@@ -0,0 +1,159 @@
+"""Helpers for reading repository data from git metadata."""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import git
+
+# Configuration files of dependency-management tools (searched in the repo root)
+DEPENDENCY_MANIFESTS: List[str] = [
+    "requirements.txt",
+    "pyproject.toml",
+    "environment.yml",
+    "setup.py",
+    "Pipfile",
+]
+
+# Files materialized in the working tree of partially fetched repositories
+SPARSE_CHECKOUT_PATTERNS: List[str] = ["*.ipynb"] + [
+    f"/{manifest}" for manifest in DEPENDENCY_MANIFESTS
+]
+
+
+# Mode of index entries that point to submodules (gitlinks)
+GITLINK_MODE = 0o160000
+
+
+def open_work_tree(path: Path) -> Optional[git.Repo]:
+    """Return the git repository whose working tree is rooted at ``path``, if any."""
+    try:
+        repo = git.Repo(path)
+    except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+        return None
+    if repo.bare:
+        return None
+    return repo
+
+
+def partial_clone(url: str, to_path: Path, size_limit: int) -> git.Repo:
+    """Clone a repository by fetching and checking out as little data as possible.
+
+    The clone is shallow and filtered: blobs of ``size_limit`` bytes or more are not
+    downloaded. Moreover, only notebooks and the dependency manifests in the
+    repository root are checked out (via a sparse checkout).
+
+    Args:
+        url (str): the URL of the remote repository.
+        to_path (Path): the directory where the repository will be cloned.
+        size_limit (int): the size (in bytes) starting from which blobs are omitted.
+
+    Returns:
+        git.Repo: the cloned repository.
+    """
+    repo = git.Repo.clone_from(  # type: ignore
+        url=url,
+        to_path=to_path,
+        depth=1,
+        filter=f"blob:limit={size_limit}",
+        no_checkout=True,
+    )
+    repo.git.sparse_checkout("set", "--no-cone", *SPARSE_CHECKOUT_PATTERNS)
+    repo.git.checkout()
+    return repo
+
+
+def missing_objects(repo: git.Repo, treeish: str = "HEAD") -> Set[str]:
+    """Return the hex SHAs of the objects omitted by a partial clone.
+
+    Missing objects are listed without being fetched from the promisor remote.
+    """
+    output = repo.git.rev_list("--objects", "--missing=print", treeish)
+    return {line[1:] for line in output.splitlines() if line.startswith("?")}
+
+
+def tree_file_sizes(
+    repo: git.Repo, treeish: str = "HEAD", size_limit: int = 0
+) -> Dict[Path, int]:
+    """Return the size of each file in a git tree, keyed by its relative path.
+
+    Sizes are read from the object database, so that files do not need to be
+    checked out. When the repository is a partial clone, the size of omitted blobs
+    is unknown; if ``size_limit`` is given, it is recorded as a lower bound for them.
+
+    Args:
+        repo (git.Repo): the repository to be inspected.
+        treeish (str): the tree (or commit) to be listed. Defaults to ``HEAD``.
+        size_limit (int): the blob size limit used when cloning the repository.
+
+    Returns:
+        Dict[Path, int]: the size in bytes of each file in the tree.
+    """
+    missing = missing_objects(repo, treeish) if size_limit else set()
+    sizes: Dict[Path, int] = {}
+    for entry in repo.git.ls_tree("-r", "-z", treeish).split("\0"):
+        if not entry:
+            continue
+        metadata, path = entry.split("\t", 1)
+        _, object_type, hexsha = metadata.split()
+        if object_type != "blob":
+            # Skip submodules
+            continue
+        if hexsha in missing:
+            sizes[Path(path)] = size_limit
+        else:
+            sizes[Path(path)] = repo.odb.info(bytes.fromhex(hexsha)).size
+    return sizes
+
+
+def indexed_file_sizes(repo: git.Repo) -> Dict[Path, int]:
+    """Return the size of the tracked files recorded in the git index.
+
+    No file is stat-ed: entries written without stat data are missing, as well as
+    untracked files.
+
+    Args:
+        repo (git.Repo): the repository to be inspected.
+
+    Returns:
+        Dict[Path, int]: the size in bytes of each tracked file, by relative path.
+    """
+    return {
+        Path(path): entry.size
+        for (path, _), entry in repo.index.entries.items()
+        if entry.mode != GITLINK_MODE and entry.size
+    }
+
+
+def working_file_sizes(repo: git.Repo) -> Dict[Path, int]:
+    """Return the size of the files in the working tree, keyed by their relative path.
+
+    Only tracked files and untracked files that are not ignored are considered;
+    git internals are never included. The size of tracked files is read from the
+    git index, so that they do not need to be stat-ed one by one.
+
+    Args:
+        repo (git.Repo): the repository to be inspected.
+
+    Returns:
+        Dict[Path, int]: the size in bytes of each working file.
+    """
+    sizes: Dict[Path, int] = {}
+    unknown_size: List[str] = []
+    for (path, _), entry in repo.index.entries.items():
+        if entry.mode == GITLINK_MODE:
+            continue
+        if entry.size:
+            sizes[Path(path)] = entry.size
+        else:
+            # Entries written without stat data (e.g., by GitPython) have size 0
+            unknown_size.append(str(path))
+
+    untracked = repo.git.ls_files("--others", "--exclude-standard", "-z")
+    unknown_size.extend(path for path in untracked.split("\0") if path)
+
+    for path in unknown_size:
+        full_path = os.path.join(repo.working_dir, path)
+        if os.path.isfile(full_path):
+            sizes[Path(path)] = os.path.getsize(full_path)
+    return sizes
@@ -0,0 +1,140 @@
+"""Journals of corpus runs: the results of each target, recorded as it completes.
+
+A journal is a JSON Lines file: a header identifying the settings of the run,
+then one entry per analyzed target, appended (and flushed to disk) as soon as
+the target has been linted, or has failed. An interrupted run can therefore be
+resumed with the same journal: the targets already recorded are not analyzed
+again. Later entries of a target supersede earlier ones (e.g., when a failed
+target is retried).
+"""
+
+import json
+import os
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .exceptions import JournalFormatError
+
+# Version of the format of journal files
+JOURNAL_VERSION = 1
+
+# Status of the entries of a journal
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class Journal:
+    """An append-only journal of the targets analyzed by a corpus run.
+
+    Use ``Journal.open()`` to create (or resume) a journal.
+
+    Args:
+        path (Path): the journal file.
+        fingerprint (str): the fingerprint of the settings of the run.
+        entries (Optional[Dict[str, Dict]]): the latest entry of each target
+            recorded so far, keyed by target.
+    """
+
+    def __init__(
+        self, path: Path, fingerprint: str, entries: Optional[Dict[str, Dict]] = None
+    ) -> None:
+        self.path: Path = path
+        self.fingerprint: str = fingerprint
+        self.entries: Dict[str, Dict] = entries or {}
+
+    @classmethod
+    def open(cls, path: Path, fingerprint: str) -> "Journal":
+        """Read the entries of a journal file, or create it if missing.
+
+        A partially written last line (e.g., if the previous run was killed
+        while writing it) is discarded.
+
+        Raises:
+            JournalFormatError: if the file is not a journal of this version, or
+                if it was written with different settings.
+        """
+        if not path.is_file() or path.stat().st_size == 0:
+            journal = cls(path, fingerprint)
+            journal._append({"version": JOURNAL_VERSION, "fingerprint": fingerprint})
+            return journal
+
+        with open(path, "rb") as f:
+            content = f.read()
+        complete_length = content.rfind(b"\n") + 1
+        if complete_length < len(content):
+            with open(path, "r+b") as f:
+                f.truncate(complete_length)
+        lines = content[:complete_length].decode("utf-8").splitlines()
+
+        try:
+            header = json.loads(lines[0])
+            valid_header = header["version"] == JOURNAL_VERSION
+        except (IndexError, ValueError, KeyError, TypeError):
+            valid_header = False
+        if not valid_header:
+            raise JournalFormatError(
+                f"The file `{path}` is not a journal of this version of pynblint."
+            )
+        if header["fingerprint"] != fingerprint:
+            raise JournalFormatError(
+                f"The journal `{path}` was recorded with different settings; "
+                "resume it with the same settings, or use another journal file."
+            )
+
+        entries: Dict[str, Dict] = {}
+        try:
+            for line in lines[1:]:
+                entry = json.loads(line)
+                entries[entry["target"]] = entry
+        except (ValueError, KeyError, TypeError):
+            raise JournalFormatError(f"The journal `{path}` is corrupted.")
+        return cls(path, fingerprint, entries)
+
+    def pending(self, targets: List[str], retry_failed: bool = False) -> List[str]:
+        """Return the targets left to be analyzed, in their order.
+
+        Args:
+            targets (List[str]): all the targets of the run.
+            retry_failed (bool): whether the targets that failed are analyzed again.
+        """
+        skipped_statuses = {COMPLETED} if retry_failed else {COMPLETED, FAILED}
+        return [
+            target
+            for target in targets
+            if self.entries.get(target, {}).get("status") not in skipped_statuses
+        ]
+
+    def record_completed(self, target: str, results: Dict) -> None:
+        """Record the (JSON-serializable) results of a target."""
+        self._record({"target": target, "status": COMPLETED, **results})
+
+    def record_failure(self, target: str, error: BaseException) -> None:
+        """Record the exception raised while analyzing a target."""
+        self._record(
+            {
+                "target": target,
+                "status": FAILED,
+                "error": {
+                    "type": type(error).__name__,
+                    "message": str(error),
+                    "traceback": "".join(
+                        traceback.format_exception(
+                            type(error), error, error.__traceback__
+                        )
+                    ),
+                },
+            }
+        )
+
+    def _record(self, entry: Dict) -> None:
+        self._append(entry)
+        self.entries[entry["target"]] = entry
+
+    def _append(self, entry: Dict) -> None:
+        """Append an entry to the journal file, and flush it to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntEnum
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Union
 
@@ -18,6 +18,28 @@ class LintLevel(str, Enum):
     PROJECT = "project"
 
 
+@dataclass(frozen=True)
+class Finding:
+    """A single linting result.
+
+    Findings are located by a path (of a notebook, a repository or an affected file)
+    and, for cell-level lints, by the index of the affected cell.
+    """
+
+    slug: str
+    level: LintLevel
+    description: str
+    path: Path
+    cell_index: Optional[int] = None
+
+
+class LintCost(IntEnum):
+    """The data needed to evaluate a lint, from the cheapest to obtain."""
+
+    PATH = 0  # Only paths (of the notebook, or of the repository files)
+    CONTENT = 1  # The content (or metadata) of notebooks and repository files
+
+
 @dataclass
 class LintDefinition:
     slug: str
@@ -25,6 +47,58 @@ class LintDefinition:
     recommendation: str
     linting_function: Callable
     show_details: bool = True
+    cost: LintCost = LintCost.CONTENT
+    # Whether the result depends on the path of the notebook (e.g., on its name),
+    # so that it cannot be reused for byte-identical copies of the notebook
+    depends_on_path: bool = False
+    # Whether the lint uses the MinHash signatures of notebooks, which are then
+    # computed while linting each notebook (see ``NotebookLinter``)
+    uses_signatures: bool = False
+
+    # Path-level lints needing the content of every notebook can be evaluated in
+    # sharded runs (see ``pynblint.sharding``) by providing:
+    # - shard_data_function(repo, notebook_paths): the JSON-serializable data of
+    #   the given notebooks, keyed by their path relative to the repository root;
+    # - merge_function(data): the relative paths affected, given the data of all
+    #   the notebooks (in the order of ``Repository.notebook_paths``).
+    shard_data_function: Optional[Callable] = None
+    merge_function: Optional[Callable] = None
+
+
+LintResult = Union[bool, List[Cell], List[Path]]
+
+
+def number_of_violations(result: Optional[LintResult]) -> int:
+    """Return the number of violations (i.e., findings) in the result of a lint."""
+    if isinstance(result, list):
+        return len(result)
+    return int(bool(result))
+
+
+class ViolationBudget:
+    """The number of violations after which linting stops (e.g., ``--fail-fast``).
+
+    A budget can be shared by several linters, so that a whole run stops as soon
+    as the budget is exhausted.
+    """
+
+    def __init__(self, max_violations: int) -> None:
+        self.max_violations: int = max_violations
+        self.violations: int = 0
+
+    @classmethod
+    def from_settings(cls) -> Optional["ViolationBudget"]:
+        """Return a budget based on the settings, or ``None`` if unlimited."""
+        if settings.max_violations is None:
+            return None
+        return cls(settings.max_violations)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.violations >= self.max_violations
+
+    def spend(self, result: Optional[LintResult]) -> None:
+        self.violations += number_of_violations(result)
 
 
 # ============== #
@@ -69,10 +143,11 @@ class NotebookLevelLint(NotebookLint):
         recommendation: str,
         linting_function: Callable[[Notebook], bool],
         notebook: Notebook,
+        result: Optional[bool] = None,
     ) -> None:
         super().__init__(slug, description, recommendation)
         self.linting_function: Callable[[Notebook], bool] = linting_function
-        self.result: bool = self.lint(notebook)
+        self.result: bool = self.lint(notebook) if result is None else result
 
     def lint(self, notebook: Notebook) -> bool:
         return self.linting_function(notebook)
@@ -102,11 +177,12 @@ class CellLevelLint(NotebookLint):
         linting_function: Callable[[Notebook], List[Cell]],
         notebook: Notebook,
         show_details: bool = True,
+        result: Optional[List[Cell]] = None,
     ) -> None:
         super().__init__(slug, description, recommendation)
         self.linting_function: Callable[[Notebook], List[Cell]] = linting_function
         self.show_details = show_details
-        self.result: List[Cell] = self.lint(notebook)
+        self.result: List[Cell] = self.lint(notebook) if result is None else result
 
     def lint(self, notebook: Notebook) -> List[Cell]:
         """
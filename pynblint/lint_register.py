@@ -1,12 +1,42 @@
-from typing import List, Set
+"""Registry of the lints (and statistics) made available by core modules and plugins.
+
+Modules register their lints (e.g., in their ``initialize()`` function) by calling
+``register_lints``, and their notebook statistics by calling ``register_stats``.
+The lints enabled for an analysis, instead, are selected by a ``LintSession``
+(see ``pynblint.session``), based on its settings.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set
 
-from .config import settings
 from .lint import LintDefinition, LintLevel
+from .notebook_stats import StatDefinition
+
+# Lints made available by a module, by level
+ModuleLints = Dict[LintLevel, List[LintDefinition]]
+
+# Lints registered by the module being loaded (see ``loader``)
+_collected_lints: Optional[ModuleLints] = None
+
+# Lints registered outside of module loading (e.g., by a script)
+unscoped_lints: ModuleLints = {lint_level: [] for lint_level in LintLevel}
+
+# Statistics registered by the module being loaded (see ``loader``)
+_collected_stats: Optional[List[StatDefinition]] = None
 
-enabled_cell_level_lints: List[LintDefinition] = []
-enabled_notebook_level_lints: List[LintDefinition] = []
-enabled_path_level_lints: List[LintDefinition] = []
-enabled_project_level_lints: List[LintDefinition] = []
+# Statistics registered outside of module loading
+unscoped_stats: List[StatDefinition] = []
+
+# Incremented whenever unscoped lints (or statistics) are registered
+unscoped_lints_version: int = 0
+
+# Names of the (deprecated) lists of enabled lints, resolved by ``__getattr__``
+_ENABLED_LINTS_ATTRIBUTES: Dict[str, LintLevel] = {
+    "enabled_cell_level_lints": LintLevel.CELL,
+    "enabled_notebook_level_lints": LintLevel.NOTEBOOK,
+    "enabled_path_level_lints": LintLevel.PATH,
+    "enabled_project_level_lints": LintLevel.PROJECT,
+}
 
 
 def exclude_lints(
@@ -25,21 +55,63 @@ def include_lints(
 
 
 def register_lints(lint_level: LintLevel, lint_defs: List[LintDefinition]) -> None:
+    """Make the given lints available; registering a lint twice has no effect."""
+    global unscoped_lints_version
 
-    # filter the list of lint definitions based on the settings
-    if settings.exclude:
-        filtered_lint_defs = exclude_lints(lint_defs, settings.exclude)
-    elif settings.include:
-        filtered_lint_defs = include_lints(lint_defs, settings.include)
+    if _collected_lints is not None:
+        registered_lints = _collected_lints[lint_level]
     else:
-        filtered_lint_defs = lint_defs
-
-    # Add the filtered list of lints to the global list
-    if lint_level == LintLevel.CELL:
-        enabled_cell_level_lints.extend(filtered_lint_defs)
-    elif lint_level == LintLevel.NOTEBOOK:
-        enabled_notebook_level_lints.extend(filtered_lint_defs)
-    elif lint_level == LintLevel.PATH:
-        enabled_path_level_lints.extend(filtered_lint_defs)
-    elif lint_level == LintLevel.PROJECT:
-        enabled_project_level_lints.extend(filtered_lint_defs)
+        registered_lints = unscoped_lints[lint_level]
+        unscoped_lints_version += 1
+
+    registered_lints.extend(lint for lint in lint_defs if lint not in registered_lints)
+
+
+def register_stats(stat_defs: List[StatDefinition]) -> None:
+    """Make the given notebook statistics available (see ``notebook_stats``)."""
+    global unscoped_lints_version
+
+    if _collected_stats is not None:
+        registered_stats = _collected_stats
+    else:
+        registered_stats = unscoped_stats
+        unscoped_lints_version += 1
+
+    registered_stats.extend(
+        stat_def for stat_def in stat_defs if stat_def not in registered_stats
+    )
+
+
+@contextmanager
+def collecting_lints() -> Iterator[ModuleLints]:
+    """Collect the lints registered within the context (used to load a module)."""
+    global _collected_lints
+
+    previously_collected_lints = _collected_lints
+    _collected_lints = {lint_level: [] for lint_level in LintLevel}
+    try:
+        yield _collected_lints
+    finally:
+        _collected_lints = previously_collected_lints
+
+
+@contextmanager
+def collecting_stats() -> Iterator[List[StatDefinition]]:
+    """Collect the statistics registered within the context."""
+    global _collected_stats
+
+    previously_collected_stats = _collected_stats
+    _collected_stats = []
+    try:
+        yield _collected_stats
+    finally:
+        _collected_stats = previously_collected_stats
+
+
+def __getattr__(name: str) -> Any:
+    # Backward compatibility: the enabled lints are those of the current session
+    if name in _ENABLED_LINTS_ATTRIBUTES:
+        from .session import get_session
+
+        return get_session().lints(_ENABLED_LINTS_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
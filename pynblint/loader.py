@@ -1,14 +1,20 @@
 """Linting modules loader."""
 
 import importlib
-from typing import List
+import threading
+from typing import Dict, List
 
-from . import nb_linting, repo_linting
+from . import lint_register, nb_linting, repo_linting
+from .lint_register import ModuleLints
+from .notebook_stats import StatDefinition
 
+# Modules containing the core lints
+CORE_MODULES: List[str] = [nb_linting.__name__, repo_linting.__name__]
 
-def load_core_modules() -> None:
-    nb_linting.initialize()
-    repo_linting.initialize()
+# Lints registered by each loaded module (modules are initialized only once)
+_module_lints: Dict[str, ModuleLints] = {}
+_module_stats: Dict[str, List[StatDefinition]] = {}
+_lock = threading.Lock()
 
 
 class PluginInterface:
@@ -23,9 +29,36 @@ def import_module(name: str) -> PluginInterface:
     return importlib.import_module(name)  # type: ignore
 
 
+def _load_module(name: str) -> None:
+    with _lock:
+        if name not in _module_lints:
+            module = import_module(name)
+            with lint_register.collecting_lints() as collected_lints:
+                with lint_register.collecting_stats() as collected_stats:
+                    module.initialize()
+            _module_stats[name] = collected_stats
+            _module_lints[name] = collected_lints
+
+
+def module_lints(name: str) -> ModuleLints:
+    """Return the lints registered by a module, loading it on the first call."""
+    _load_module(name)
+    return _module_lints[name]
+
+
+def module_stats(name: str) -> List[StatDefinition]:
+    """Return the statistics registered by a module, loading it on the first call."""
+    _load_module(name)
+    return _module_stats[name]
+
+
+def load_core_modules() -> None:
+    """Load the core lints (only the first time the function is called)."""
+    for module_name in CORE_MODULES:
+        module_lints(module_name)
+
+
 def load_plugins(plugins: List[str]) -> None:
     """Load the plugins defined in the plugins list."""
-
     for plugin_name in plugins:
-        plugin = import_module(plugin_name)
-        plugin.initialize()
+        module_lints(plugin_name)
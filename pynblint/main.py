@@ -1,30 +1,93 @@
 """ Entry point of pynblint. Used when running pynblint from the command line. """
 
 import json
+import shutil
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, List, Optional, Union
 
 import typer
 from rich.console import Console
 
-from . import loader
-from .config import CellRenderingMode, settings
+from . import cell_facts, sharding
+from .baseline import Baseline
+from .batch import BatchLinter, expand_targets
+from .config import CellRenderingMode, ReportFormat, settings
 from .core_models import GitHubRepository, LocalRepository, Notebook, Repository
-from .exceptions import ExportFormatNotSupportedError
+from .exceptions import (
+    BaselineFormatError,
+    ExportFormatNotSupportedError,
+    JournalFormatError,
+    ShardMergeError,
+)
+from .journal import FAILED, Journal
+from .metrics import RunMetrics
 from .nb_linter import NotebookLinter
+from .renderers import get_renderer
 from .repo_linter import RepoLinter
+from .session import LintSession
+from .staged import lint_staged
+from .workers import WorkerPool
 
 app = typer.Typer()
-console = Console(force_terminal=True)
+# The width is fixed once, so that the terminal is not queried for every rendered cell
+console = Console(force_terminal=True, width=shutil.get_terminal_size().columns)
+err_console = Console(stderr=True)
+
+# Multipliers of the units accepted by `--max-memory`
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(size: str) -> int:
+    """Parse a size in bytes, possibly with a unit (e.g., ``512M`` or ``2GB``)."""
+    number = size.strip().upper().rstrip("B")
+    unit = number[-1:] if number[-1:] in SIZE_UNITS else ""
+    try:
+        return int(float(number[: len(number) - len(unit)]) * SIZE_UNITS[unit])
+    except ValueError:
+        raise typer.BadParameter(f"Invalid size: {size!r}.")
 
 
 @app.command()
 def main(
-    source: str = typer.Argument(..., exists=True),
+    source: List[str] = typer.Argument(
+        ...,
+        help="One or more notebooks, directories, .zip archives or glob patterns "
+        "(e.g., 'projects/*'). When several targets are given, they are linted "
+        "in a single run and a combined report is produced.",
+    ),
     from_github: bool = typer.Option(
         None, help="Whether to interpret the source as the URL of a GitHub repository."
     ),
+    staged: bool = typer.Option(
+        False,
+        "--staged",
+        help="Lint the notebooks staged in the git index of the repository containing "
+        "the source (as they are about to be committed), instead of the working tree "
+        "files. Suitable for pre-commit hooks.",
+    ),
+    partial_fetch: bool = typer.Option(
+        None,
+        "--partial-fetch/--full-fetch",
+        help="When analyzing a GitHub repository, whether to download and check out "
+        "only notebooks and dependency manifests (the size of the remaining files "
+        "is read from git metadata). Enabled by default.",
+    ),
+    mirror_cache: Path = typer.Option(
+        None,
+        "--mirror-cache",
+        file_okay=False,
+        help="Directory where GitHub repositories are kept as mirrors across runs, "
+        "so that later runs only fetch their new commits. The directory can be "
+        "shared by parallel runs.",
+    ),
+    mirror_cache_size: str = typer.Option(
+        None,
+        metavar="SIZE",
+        help="Disk budget of the mirror cache (e.g., `20G`): the least recently "
+        "used mirrors are removed when it is exceeded.",
+    ),
     output_file: Path = typer.Option(
         None,
         "--output",
@@ -34,6 +97,104 @@ def main(
         "Pynblint will chose the output format.\n"
         "Currently, the only supported export format is 'JSON' (extension: `.json`).",
     ),
+    jobs: int = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        help="Number of worker processes used to lint notebooks.",
+    ),
+    cache_dir: Path = typer.Option(
+        None,
+        help="Directory where per-cell analysis results are cached across runs, "
+        "so that only new or edited cells are analyzed again.",
+    ),
+    read_ahead: int = typer.Option(
+        None,
+        help="Number of notebook files read ahead (by background threads) of their "
+        "linting, so that reading overlaps with parsing and linting; 0 disables "
+        f"read-ahead. Defaults to {settings.read_ahead}.",
+    ),
+    io_threads: int = typer.Option(
+        None,
+        help="Number of threads reading notebook files ahead. "
+        f"Defaults to {settings.io_threads}.",
+    ),
+    io_stats: bool = typer.Option(
+        False,
+        "--io-stats",
+        help="Print I/O metrics (files and bytes read, time spent reading and "
+        "waiting for reads) to the standard error.",
+    ),
+    metrics_file: Path = typer.Option(
+        None,
+        dir_okay=False,
+        help="File where the metrics of the run (e.g., duration of each stage, "
+        "notebooks per second, cache hit ratio, peak memory, linting results by "
+        "rule) are written in the OpenMetrics text format, e.g., for the textfile "
+        "collector of the Prometheus node exporter.",
+    ),
+    max_memory: str = typer.Option(
+        None,
+        metavar="SIZE",
+        help="Memory budget of the run (e.g., `2G` or `512M`). The content of each "
+        "notebook is dropped as soon as it has been linted, keeping only the "
+        "results, fewer notebooks are linted at once when the memory in use "
+        "gets close to the budget, and fewer files are read ahead.",
+    ),
+    baseline: Path = typer.Option(
+        None,
+        "--baseline",
+        dir_okay=False,
+        help="Baseline file of known linting results (e.g., of a legacy repository): "
+        "the results it contains are hidden from reports and exported results, so "
+        "that only new ones are reported.",
+    ),
+    update_baseline: bool = typer.Option(
+        False,
+        "--update-baseline",
+        help="Regenerate the baseline file (see `--baseline`) with all the current "
+        "linting results.",
+    ),
+    journal: Path = typer.Option(
+        None,
+        "--journal",
+        dir_okay=False,
+        help="Journal file of a corpus run: the results of each target (or the "
+        "exception it raised) are appended to it as soon as the target is analyzed, "
+        "so that an interrupted run resumes where it stopped when run again with "
+        "the same journal. Targets that fail do not stop the run.",
+    ),
+    retry_failed: bool = typer.Option(
+        False,
+        "--retry-failed",
+        help="Analyze again the targets that failed in previous runs recorded in "
+        "the journal (see `--journal`).",
+    ),
+    shard: str = typer.Option(
+        None,
+        metavar="i/N",
+        help="Lint only the i-th of N shards of the notebooks of a repository "
+        "(e.g., `--shard 2/8`), assigned by a stable hash of their path. "
+        "The JSON outputs of all the shards can be combined with `--merge`.",
+    ),
+    merge: bool = typer.Option(
+        False,
+        "--merge",
+        help="Combine the JSON outputs of all the shards of a run (given as the "
+        "sources, see `--shard`) into that of a single run, written to `--output`.",
+    ),
+    fail_fast: bool = typer.Option(
+        False,
+        "--fail-fast",
+        help="Stop at the first linting result (same as `--max-violations 1`).",
+    ),
+    max_violations: int = typer.Option(
+        None,
+        help="Stop as soon as this number of linting results is reached. "
+        "Cheap checks (e.g., on filenames) are run first, and notebooks are not "
+        "read once the limit is reached. The exit status is 1 if the limit is "
+        "reached.",
+    ),
     yes: bool = typer.Option(
         False,
         "--yes",
@@ -48,6 +209,13 @@ def main(
         help="Analyze the supplied input silently "
         "(i.e., without writing to the standard output).",
     ),
+    report_format: ReportFormat = typer.Option(
+        None,
+        "--format",
+        help="Format of the report written to the standard output: "
+        "'rich' (full report), 'plain' (one line per linting result, suited to CI "
+        "logs) or 'summary' (number of linting results by rule and by notebook).",
+    ),
     exclude: str = typer.Option(
         None,
         "--exclude",
@@ -119,6 +287,17 @@ def main(
         "like DVC (https://dvc.org), then the `large-data-file-not-versioned` "
         "warning is raised.",
     ),
+    near_duplicate_threshold: float = typer.Option(
+        None,
+        help="Minimum similarity (between 0 and 1) of the code and Markdown of two "
+        "notebooks for them to get the `near-duplicate-notebooks` warning. "
+        f"Defaults to {settings.near_duplicate_threshold}.",
+    ),
+    minhash_signature_size: int = typer.Option(
+        None,
+        help="Size of the MinHash signatures used to estimate the similarity of "
+        "notebooks: larger signatures are more accurate, but slower to compare.",
+    ),
     max_multiline_python_comment: int = typer.Option(
         None,
         help="Maximum number of lines of a multi-line comment that a code cell should "
@@ -127,45 +306,105 @@ def main(
     ),
 ):
 
-    # Update settings
+    # Settings overridden by command-line options
+    overrides: Dict[str, Any] = {}
+
     if exclude:
-        settings.exclude = set(json.loads(exclude))
+        overrides["exclude"] = set(json.loads(exclude))
 
     if include:
-        settings.include = set(json.loads(include))
+        overrides["include"] = set(json.loads(include))
+
+    if report_format:
+        overrides["report_format"] = report_format
 
     if hide_stats:
-        settings.hide_stats = True
+        overrides["hide_stats"] = True
+
+        # Statistics are not computed at all, unless they are exported
+        if not (output_file and output_file.suffix == ".json"):
+            overrides["collect_stats"] = False
 
     if hide_recommendations:
-        settings.hide_recommendations = True
+        overrides["hide_recommendations"] = True
 
     if render_full_cells:
-        settings.cell_rendering_mode = CellRenderingMode.FULL
+        overrides["cell_rendering_mode"] = CellRenderingMode.FULL
 
     if display_cell_index:
-        settings.display_cell_index = True
+        overrides["display_cell_index"] = True
 
     if max_cells_in_notebook:
-        settings.max_cells_in_notebook = max_cells_in_notebook
+        overrides["max_cells_in_notebook"] = max_cells_in_notebook
 
     if max_lines_in_code_cell:
-        settings.max_lines_in_code_cell = max_lines_in_code_cell
+        overrides["max_lines_in_code_cell"] = max_lines_in_code_cell
 
     if max_data_file_size:
-        settings.max_data_file_size = max_data_file_size
+        overrides["max_data_file_size"] = max_data_file_size
 
     if max_multiline_python_comment:
-        settings.max_multiline_python_comment = max_multiline_python_comment
+        overrides["max_multiline_python_comment"] = max_multiline_python_comment
+
+    if near_duplicate_threshold:
+        overrides["near_duplicate_threshold"] = near_duplicate_threshold
+
+    if minhash_signature_size:
+        overrides["minhash_signature_size"] = minhash_signature_size
 
     if initial_cells:
-        settings.initial_cells = initial_cells
+        overrides["initial_cells"] = initial_cells
 
     if final_cells:
-        settings.final_cells = final_cells
+        overrides["final_cells"] = final_cells
 
     if min_md_code_ratio:
-        settings.min_md_code_ratio = min_md_code_ratio
+        overrides["min_md_code_ratio"] = min_md_code_ratio
+
+    if partial_fetch is not None:
+        overrides["partial_fetch"] = partial_fetch
+
+    if mirror_cache:
+        overrides["mirror_cache_dir"] = mirror_cache
+
+    if mirror_cache_size:
+        overrides["mirror_cache_size"] = parse_size(mirror_cache_size)
+
+    if jobs:
+        overrides["jobs"] = jobs
+
+    if cache_dir:
+        overrides["cache_dir"] = cache_dir
+
+    if max_violations:
+        overrides["max_violations"] = max_violations
+
+    if fail_fast:
+        overrides["max_violations"] = 1
+
+    if read_ahead is not None:
+        overrides["read_ahead"] = read_ahead
+
+    if io_threads:
+        overrides["io_threads"] = io_threads
+
+    if max_memory:
+        overrides["max_memory"] = parse_size(max_memory)
+
+    if shard:
+        try:
+            overrides["shard"] = sharding.parse_shard(shard)
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+
+    if update_baseline and not baseline:
+        raise typer.BadParameter("`--update-baseline` requires `--baseline`.")
+
+    if retry_failed and not journal:
+        raise typer.BadParameter("`--retry-failed` requires `--journal`.")
+
+    if merge and not output_file:
+        raise typer.BadParameter("`--merge` requires `--output`.")
 
     # Prevent accidental overwriting of previous output
     if output_file and output_file.is_file() and not yes:
@@ -178,42 +417,169 @@ def main(
     # Main procedure #
     # ============== #
 
-    # Load all modules containing linting rules
-    loader.load_core_modules()
-    loader.load_plugins(settings.plugins)
+    if merge:
+        merge_shard_files([Path(shard_file) for shard_file in source], output_file)
+        return
+
+    # Build the lint session (i.e., load the settings and the linting rules)
+    session = LintSession.build(**overrides)
+
+    with session.activate():
+        run(
+            session,
+            source,
+            from_github,
+            staged,
+            output_file,
+            quiet,
+            io_stats,
+            baseline,
+            update_baseline,
+            metrics_file,
+            journal,
+            retry_failed,
+        )
+
+
+def run(
+    session: LintSession,
+    source: List[str],
+    from_github: bool,
+    staged: bool,
+    output_file: Optional[Path],
+    quiet: bool,
+    io_stats: bool = False,
+    baseline_file: Optional[Path] = None,
+    update_baseline: bool = False,
+    metrics_file: Optional[Path] = None,
+    journal_file: Optional[Path] = None,
+    retry_failed: bool = False,
+) -> None:
+    """Analyze the supplied input and report the results."""
+
+    run_metrics = RunMetrics()
+
+    # Read the known linting results first, so that invalid baselines fail early
+    baseline: Optional[Baseline] = None
+    if baseline_file:
+        try:
+            baseline = Baseline.load(baseline_file, update=update_baseline)
+        except BaselineFormatError as e:
+            console.print(f"[red bold]{e}[/red bold]")
+            raise typer.Exit(code=1)
 
     # Analyze the supplied input
+    targets = expand_targets(source, from_github)
+    if not targets:
+        console.print("[red bold]No target matches the specified sources.[/red bold]")
+        raise typer.Exit(code=1)
+
+    # Sharded runs split the notebooks of a single repository
+    if settings.shard and (
+        staged
+        or len(targets) > 1
+        or (not from_github and Path(targets[0]).suffix == ".ipynb")
+    ):
+        console.print(
+            "[red bold]Sharding is only supported for a single repository.[/red bold]"
+        )
+        raise typer.Exit(code=1)
+
+    # Corpus runs record the results of each target in the journal
+    journal: Optional[Journal] = None
+    if journal_file:
+        if staged or settings.shard or settings.max_violations or baseline_file:
+            console.print(
+                "[red bold]A journal cannot be used with `--staged`, `--shard`, "
+                "violation limits or baselines.[/red bold]"
+            )
+            raise typer.Exit(code=1)
+        try:
+            journal = Journal.open(journal_file, session.fingerprint)
+        except JournalFormatError as e:
+            console.print(f"[red bold]{e}[/red bold]")
+            raise typer.Exit(code=1)
+
     repo: Repository
-    linter: Union[NotebookLinter, RepoLinter]
+    linter: Union[NotebookLinter, RepoLinter, BatchLinter]
 
-    if from_github:
-        # Analyze GitHub repository
-        repo = GitHubRepository(source)
-        linter = RepoLinter(repo)
+    with WorkerPool(settings.jobs, session) as pool, run_metrics.activate():
 
-    else:
-        path: Path = Path(source)
+        if journal is not None:
+            # Analyze a corpus, resuming the run recorded in the journal
+            linter = BatchLinter(
+                targets, from_github, pool, journal=journal, retry_failed=retry_failed
+            )
 
-        if path.is_dir():
-            # Analyze local uncompressed directory
-            repo = LocalRepository(path)
-            linter = RepoLinter(repo)
+        elif staged:
+            # Analyze the notebooks staged in the git index
+            linter = lint_staged(Path(targets[0]))
 
-        elif path.suffix == ".ipynb":
-            # Analyze standalone notebook
-            with open(path) as notebook_file:
-                nb = Notebook(Path(notebook_file.name))
-                linter = NotebookLinter(nb)
+        elif len(targets) > 1:
+            # Analyze multiple targets in a single run
+            linter = BatchLinter(targets, from_github, pool)
+
+        elif from_github:
+            # Analyze GitHub repository
+            repo = GitHubRepository(targets[0])
+            linter = RepoLinter(repo, pool)
 
         else:
-            # Analyze local compressed directory
-            repo = LocalRepository(path)
-            linter = RepoLinter(repo)
+            path: Path = Path(targets[0])
+
+            if path.is_dir():
+                # Analyze local uncompressed directory
+                repo = LocalRepository(path)
+                linter = RepoLinter(repo, pool)
+
+            elif path.suffix == ".ipynb":
+                # Analyze standalone notebook
+                with open(path) as notebook_file, run_metrics.stage("notebook_linting"):
+                    nb = Notebook(Path(notebook_file.name))
+                    linter = NotebookLinter(nb)
+
+            else:
+                # Analyze local compressed directory
+                repo = LocalRepository(path)
+                linter = RepoLinter(repo, pool)
+
+    if io_stats:
+        stats = pool.io_stats
+        err_console.print(
+            f"I/O: read {stats.files_read} files ({stats.bytes_read} bytes) "
+            f"in {stats.read_seconds:.3f}s, waited {stats.wait_seconds:.3f}s for reads"
+        )
+
+    # Persist the facts of the analyzed cells (if a cache directory is set)
+    cell_facts.get_cache().save()
+
+    if isinstance(linter, BatchLinter) and journal is not None:
+        failures = len(linter.journal_entries(FAILED))
+        if failures:
+            err_console.print(
+                f"Journal: {failures} targets failed (see {journal_file}); "
+                "analyze them again with `--retry-failed`"
+            )
+
+    # Hide the known linting results before reporting and exporting results
+    if baseline is not None and baseline_file is not None:
+        with run_metrics.stage("baseline"):
+            linter.apply_baseline(baseline)
+        if update_baseline:
+            baseline.save(baseline_file)
+            err_console.print(
+                f"Baseline: recorded {sum(baseline.seen.values())} linting results "
+                f"in {baseline_file}"
+            )
+        elif baseline.suppressed:
+            err_console.print(
+                f"Baseline: hid {baseline.suppressed} known linting results"
+            )
 
     # Generate the output file if requested
     if output_file:
         if output_file.suffix == ".json":
-            with open(output_file, "w") as f:
+            with open(output_file, "w") as f, run_metrics.stage("export"):
                 json.dump(linter.as_dict(), f)
         else:
             raise ExportFormatNotSupportedError(
@@ -223,9 +589,54 @@ def main(
 
     # Print the output to the terminal
     if not quiet:
-        console.print("\n")
-        console.rule("PYNBLINT", characters="*")
-        console.print(linter)
+        with run_metrics.stage("rendering"):
+            get_renderer(settings.report_format).render(linter, console)
+
+    # Export the metrics of the run
+    if metrics_file:
+        if isinstance(linter, NotebookLinter):
+            number_of_notebooks = 1
+        elif isinstance(linter, RepoLinter):
+            number_of_notebooks = len(linter.notebook_linters)
+        else:
+            number_of_notebooks = linter.summary.number_of_notebooks
+        cache_stats = cell_facts.get_cache().stats
+        cache_stats.merge(pool.cache_stats)
+        run_metrics.write(
+            metrics_file,
+            number_of_notebooks,
+            Counter(finding.slug for finding in linter.findings()),
+            pool.io_stats,
+            cache_stats,
+        )
+
+    # Signal that the violation budget has been exhausted
+    if linter.budget is not None and linter.budget.exhausted:
+        raise typer.Exit(code=1)
+
+
+def merge_shard_files(shard_files: List[Path], output_file: Path) -> None:
+    """Combine the JSON outputs of the shards of a run into that of a single run."""
+
+    shard_results = []
+    for shard_file in shard_files:
+        if not shard_file.is_file():
+            raise typer.BadParameter(f"The shard output `{shard_file}` does not exist.")
+        with open(shard_file) as f:
+            shard_results.append(json.load(f))
+    try:
+        results = sharding.merge_shards(shard_results)
+    except ShardMergeError as e:
+        console.print(f"[red bold]{e}[/red bold]")
+        raise typer.Exit(code=1)
+
+    with open(output_file, "w") as f:
+        json.dump(results, f)
+    console.print(
+        f"Merged {len(shard_results)} shards: "
+        f"{len(results['notebook_level_lints'])} notebooks, "
+        f"{len(results['lints'])} repository-level linting results."
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+"""Metrics of a run, exported in the OpenMetrics text format.
+
+The metrics file (``--metrics-file``) can be read by monitoring systems, e.g.,
+by the textfile collector of the Prometheus node exporter. The duration of the
+stages of a run is measured only at their boundaries (e.g., once per repository
+for notebook linting), so collecting metrics adds no work per notebook or cell;
+the other metrics are counted anyway (e.g., cache lookups and I/O).
+"""
+
+import os
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover (Windows)
+    resource = None  # type: ignore
+
+if TYPE_CHECKING:
+    from .cell_facts import CacheStats
+    from .prefetch import IOStats
+
+# Prefix of the names of the exported metrics
+METRIC_PREFIX = "pynblint_"
+
+# Characters escaped in label values
+LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+# Stages of a run, in the order they are reported
+STAGES: List[str] = [
+    "discovery",
+    "repository_linting",
+    "notebook_linting",
+    "baseline",
+    "export",
+    "rendering",
+]
+
+
+class RunMetrics:
+    """The metrics of a run, collected while it is active (see ``activate()``)."""
+
+    def __init__(self) -> None:
+        self.started: float = time.time()
+        self._start: float = time.perf_counter()
+        self.stage_seconds: Dict[str, float] = {}
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self._start
+
+    @contextmanager
+    def activate(self) -> Iterator["RunMetrics"]:
+        """Collect the durations of the stages run within the context."""
+        token = _active_metrics.set(self)
+        try:
+            yield self
+        finally:
+            _active_metrics.reset(token)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the duration of a stage of the run."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0) + seconds
+
+    def openmetrics(
+        self,
+        number_of_notebooks: int,
+        violations_per_slug: Counter,
+        io_stats: "IOStats",
+        cache_stats: "CacheStats",
+    ) -> str:
+        """Return the metrics of the run, in the OpenMetrics text format."""
+        elapsed_seconds = self.elapsed_seconds
+        metrics: List[Tuple[str, str, List[Tuple[Dict[str, str], float]]]] = [
+            ("run_timestamp_seconds", "Start time of the run.", [({}, self.started)]),
+            ("run_duration_seconds", "Duration of the run.", [({}, elapsed_seconds)]),
+            (
+                "stage_duration_seconds",
+                "Time spent in each stage of the run.",
+                [
+                    ({"stage": stage}, self.stage_seconds[stage])
+                    for stage in STAGES
+                    if stage in self.stage_seconds
+                ],
+            ),
+            ("notebooks", "Notebooks analyzed.", [({}, number_of_notebooks)]),
+            (
+                "notebooks_per_second",
+                "Notebooks analyzed per second of the run.",
+                [({}, number_of_notebooks / elapsed_seconds if elapsed_seconds else 0)],
+            ),
+            (
+                "violations",
+                "Linting results, by lint slug.",
+                [
+                    ({"slug": slug}, count)
+                    for slug, count in sorted(violations_per_slug.items())
+                ],
+            ),
+            (
+                "cell_facts_cache_lookups",
+                "Lookups of the cell facts cache, by result.",
+                [
+                    ({"result": "hit"}, cache_stats.hits),
+                    ({"result": "miss"}, cache_stats.misses),
+                ],
+            ),
+            (
+                "cell_facts_cache_hit_ratio",
+                "Ratio of the lookups of the cell facts cache that were hits.",
+                [({}, cache_stats.hit_ratio or 0)],
+            ),
+            ("files_read", "Notebook files read.", [({}, io_stats.files_read)]),
+            (
+                "bytes_read",
+                "Bytes of notebook files read.",
+                [({}, io_stats.bytes_read)],
+            ),
+            (
+                "read_seconds",
+                "Time spent reading notebook files (across reader threads).",
+                [({}, io_stats.read_seconds)],
+            ),
+            (
+                "read_wait_seconds",
+                "Time spent waiting for notebook files to be read.",
+                [({}, io_stats.wait_seconds)],
+            ),
+            (
+                "peak_rss_bytes",
+                "Peak resident memory, of the main process and of the largest worker.",
+                [
+                    ({"process": process}, rss)
+                    for process, rss in peak_resident_memory().items()
+                ],
+            ),
+        ]
+
+        lines: List[str] = []
+        for name, help_text, samples in metrics:
+            if not samples:
+                continue
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} gauge")
+            lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+            for labels, value in samples:
+                lines.append(f"{METRIC_PREFIX}{name}{format_labels(labels)} {value!r}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(
+        self,
+        path: Path,
+        number_of_notebooks: int,
+        violations_per_slug: Counter,
+        io_stats: "IOStats",
+        cache_stats: "CacheStats",
+    ) -> None:
+        """Write the metrics to a file, atomically (see ``openmetrics()``)."""
+        content = self.openmetrics(
+            number_of_notebooks, violations_per_slug, io_stats, cache_stats
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+_active_metrics: ContextVar[Optional[RunMetrics]] = ContextVar(
+    "active_metrics", default=None
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Measure the duration of a stage of the run (if metrics are collected)."""
+    metrics = _active_metrics.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.stage(name):
+        yield
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    """Format the labels of a sample (e.g., ``{slug="untitled-notebook"}``)."""
+    if not labels:
+        return ""
+    escaped = (
+        f'{name}="{value.translate(LABEL_ESCAPES)}"' for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def peak_resident_memory() -> Dict[str, int]:
+    """Return the peak resident memory of this process and of its (ended) workers."""
+    if resource is None:
+        return {}
+    # Linux reports kilobytes, macOS bytes
+    unit = 1 if os.uname().sysname == "Darwin" else 1024
+    return {
+        "main": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit,
+        "workers": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit,
+    }
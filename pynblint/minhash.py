@@ -0,0 +1,184 @@
+"""Near-duplicate detection with MinHash signatures and locality-sensitive hashing.
+
+Signatures are computed with one-permutation hashing (a single hash per shingle,
+spread over the signature bins) and rotation densification, so that their cost is
+linear in the size of the documents. Candidate pairs are then found by bucketing
+bands of the signatures (LSH), which avoids comparing all pairs of documents.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Pattern, Tuple, TypeVar
+
+# Tokens of the normalized sources
+TOKEN_PATTERN: Pattern[str] = re.compile(r"\w+")
+
+# Number of consecutive tokens in a shingle
+SHINGLE_SIZE = 5
+
+# Offset distinguishing densified bins from the bins they are copied from
+_DENSIFICATION_OFFSET = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+Signature = Tuple[int, ...]
+
+# Keys identifying the documents
+Key = TypeVar("Key", bound=Hashable)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Return the distinct shingles of the normalized text.
+
+    Text is normalized by lowercasing it and by dropping punctuation and
+    whitespace, so that formatting changes do not affect the shingles.
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return list(
+        {
+            " ".join(tokens[i : i + size])  # noqa: E203
+            for i in range(len(tokens) - size + 1)
+        }
+    )
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def signature(text: str, size: int) -> Optional[Signature]:
+    """Return the MinHash signature of a text (``None`` if it contains no tokens).
+
+    Args:
+        text (str): the text to be signed.
+        size (int): the number of signature bins.
+    """
+    bins: List[Optional[int]] = [None] * size
+    for shingle in shingles(text):
+        shingle_hash = _hash(shingle)
+        bin_index, value = shingle_hash % size, shingle_hash // size
+        current = bins[bin_index]
+        if current is None or value < current:
+            bins[bin_index] = value
+
+    non_empty = [index for index, value in enumerate(bins) if value is not None]
+    if not non_empty:
+        return None
+
+    # Rotation densification: empty bins borrow the value of the next non-empty bin
+    densified: List[int] = []
+    for index, bin_value in enumerate(bins):
+        distance = 0
+        while bin_value is None:
+            distance += 1
+            bin_value = bins[(index + distance) % size]
+        densified.append((bin_value + distance * _DENSIFICATION_OFFSET) & _MASK_64)
+    return tuple(densified)
+
+
+def similarity(first: Signature, second: Signature) -> float:
+    """Estimate the Jaccard similarity of the documents with the given signatures."""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def lsh_parameters(threshold: float, size: int) -> Tuple[int, int]:
+    """Return the number of bands and of rows per band for the given threshold.
+
+    Among the ways of splitting ``size`` bins into bands, the one whose similarity
+    threshold (i.e., ``(1 / bands) ** (1 / rows)``) is closest to ``threshold``
+    (without exceeding it, so as to favor recall) is chosen.
+    """
+    candidates = [
+        (size // rows, rows) for rows in range(1, size + 1) if size % rows == 0
+    ]
+    below = [
+        (bands, rows)
+        for bands, rows in candidates
+        if (1 / bands) ** (1 / rows) <= threshold
+    ]
+    return max(below or candidates[:1], key=lambda p: (1 / p[0]) ** (1 / p[1]))
+
+
+def near_duplicate_groups(
+    signatures: Dict[Key, Signature], threshold: float
+) -> List[List[Key]]:
+    """Group the documents whose estimated similarity is at least ``threshold``.
+
+    Args:
+        signatures (Dict[Key, Signature]): the signatures of the documents
+            (all of the same size), keyed by document.
+        threshold (float): the minimum estimated Jaccard similarity.
+
+    Returns:
+        List[List[Key]]: the groups of near-duplicate documents (with at least
+        two documents each), in the order of ``signatures``.
+    """
+    keys = list(signatures)
+    if not keys:
+        return []
+    bands, rows = lsh_parameters(threshold, len(signatures[keys[0]]))
+
+    # Identical signatures (e.g., copies of a template) are compared only once
+    unique_signatures = list(dict.fromkeys(signatures.values()))
+    positions = {
+        unique_signature: position
+        for position, unique_signature in enumerate(unique_signatures)
+    }
+
+    # Union-find over the positions of the unique signatures
+    parents = list(range(len(unique_signatures)))
+
+    def find(position: int) -> int:
+        while parents[position] != position:
+            parents[position] = parents[parents[position]]
+            position = parents[position]
+        return position
+
+    for band in range(bands):
+        buckets: Dict[Signature, List[int]] = defaultdict(list)
+        start, end = band * rows, (band + 1) * rows
+        for position, unique_signature in enumerate(unique_signatures):
+            buckets[unique_signature[start:end]].append(position)
+        for members in buckets.values():
+            # Each member is compared with one representative per group of the
+            # bucket (rather than with every other member), so that the members
+            # already merged into a group are not compared again
+            representatives: List[int] = []
+            for member in members:
+                merged = False
+                for representative in representatives:
+                    if find(representative) == find(member):
+                        merged = True
+                        continue
+                    estimate = similarity(
+                        unique_signatures[representative], unique_signatures[member]
+                    )
+                    if estimate >= threshold:
+                        parents[find(member)] = find(representative)
+                        merged = True
+                if not merged:
+                    representatives.append(member)
+
+    groups: Dict[int, List[Key]] = defaultdict(list)
+    for key in keys:
+        groups[find(positions[signatures[key]])].append(key)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def signatures_of(
+    documents: Iterable[Tuple[Key, str]], size: int
+) -> Dict[Key, Signature]:
+    """Return the signatures of the given ``(key, text)`` documents.
+
+    Documents without tokens are skipped.
+    """
+    signatures: Dict[Key, Signature] = {}
+    for key, text in documents:
+        document_signature = signature(text, size)
+        if document_signature is not None:
+            signatures[key] = document_signature
+    return signatures
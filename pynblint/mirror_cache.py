@@ -0,0 +1,240 @@
+"""A local cache of remote repositories, kept as bare mirrors across runs.
+
+The first time a remote repository is analyzed, it is cloned as a (shallow) bare
+mirror in the cache directory; later runs only fetch the new commits. The
+repository is then linted in a worktree created from the mirror, so the mirror
+itself is never modified by the analysis.
+
+Mirrors only track the branches of the remote repository (not, e.g., the refs
+of GitHub pull requests).
+
+When the cache exceeds its disk budget, the least recently used mirrors are
+evicted, except those with worktrees in use. Each mirror is locked while it is
+updated and checked out, and the whole cache only while mirrors are evicted, so
+it can be shared by parallel runs.
+"""
+
+import hashlib
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import git
+
+from .git_utils import SPARSE_CHECKOUT_PATTERNS
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover (Windows)
+    fcntl = None  # type: ignore
+
+# Lock file of the cache directory
+LOCK_FILENAME = "cache.lock"
+
+# Suffix of the mirror directories
+MIRROR_SUFFIX = ".git"
+
+# Suffix of the lock files of the mirrors (next to their directory)
+MIRROR_LOCK_SUFFIX = ".lock"
+
+# Refs fetched into the mirrors: the branches only
+FETCH_REFSPEC = "+refs/heads/*:refs/heads/*"
+
+
+def directory_size(path: Path) -> int:
+    """Return the size (in bytes) of the files within a directory tree."""
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                continue
+    return size
+
+
+class MirrorCache:
+    """The cache of the mirrors of remote repositories.
+
+    Args:
+        directory (Path): the directory of the cache.
+        max_size (Optional[int]): the disk budget of the cache (in bytes);
+            if ``None``, mirrors are never evicted.
+    """
+
+    def __init__(self, directory: Path, max_size: Optional[int] = None) -> None:
+        self.directory: Path = directory
+        self.max_size: Optional[int] = max_size
+
+    def mirror_path(self, url: str, size_limit: Optional[int] = None) -> Path:
+        """Return the directory of the mirror of ``url``.
+
+        Mirrors fetched without blobs of ``size_limit`` bytes or more are kept
+        apart from the complete ones (and from those with other size limits),
+        since the size of the omitted blobs is only known to exceed the limit.
+        """
+        key = hashlib.blake2b(
+            f"{url}\0{size_limit or ''}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        name = url.rstrip("/").split("/")[-1]
+        if name.endswith(MIRROR_SUFFIX):
+            name = name[: -len(MIRROR_SUFFIX)]
+        return self.directory / f"{name}-{key}{MIRROR_SUFFIX}"
+
+    def lock_path(self, url: str, size_limit: Optional[int] = None) -> Path:
+        """Return the lock file of the mirror of ``url``."""
+        mirror_path = self.mirror_path(url, size_limit)
+        return mirror_path.with_name(mirror_path.name + MIRROR_LOCK_SUFFIX)
+
+    @contextmanager
+    def locked(self, lock_path: Optional[Path] = None) -> Iterator[None]:
+        """Hold an exclusive lock: by default, the lock of the whole cache.
+
+        Args:
+            lock_path (Optional[Path]): the lock file (e.g., that of a mirror,
+                see ``lock_path()``).
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(lock_path or self.directory / LOCK_FILENAME, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, url: str, size_limit: Optional[int] = None) -> git.Repo:
+        """Clone the mirror of ``url``, or fetch its new commits if it exists.
+
+        Args:
+            url (str): the URL of the remote repository.
+            size_limit (Optional[int]): the size (in bytes) starting from which
+                blobs are not fetched; if ``None``, all the blobs are fetched.
+
+        Returns:
+            git.Repo: the (bare) mirror.
+        """
+        mirror_path = self.mirror_path(url, size_limit)
+        mirror: Optional[git.Repo] = None
+        if mirror_path.is_dir():
+            try:
+                mirror = git.Repo(mirror_path)
+                # Mirrors cloned by earlier versions fetched every ref
+                mirror.git.config("--replace-all", "remote.origin.fetch", FETCH_REFSPEC)
+                mirror.git.fetch("--prune", "--depth=1", "origin")
+            except git.GitError:
+                # E.g., a mirror left incomplete by an interrupted clone
+                shutil.rmtree(mirror_path, ignore_errors=True)
+                mirror = None
+        if mirror is None:
+            options = ["--bare", "--depth=1"]
+            if size_limit:
+                options.append(f"--filter=blob:limit={size_limit}")
+            mirror = git.Repo.clone_from(
+                url=url, to_path=mirror_path, multi_options=options
+            )
+            mirror.git.config("remote.origin.fetch", FETCH_REFSPEC)
+        # The modification time of the mirror records its last use
+        os.utime(mirror_path)
+        return mirror
+
+    def worktree(
+        self, url: str, to_path: Path, size_limit: Optional[int] = None
+    ) -> git.Repo:
+        """Check out the default branch of ``url`` in a worktree of its mirror.
+
+        The worktree belongs to the mirror: it should be removed when no longer
+        needed (its registration in the mirror is pruned in later runs).
+
+        Args:
+            url (str): the URL of the remote repository.
+            to_path (Path): the directory of the worktree.
+            size_limit (Optional[int]): the size (in bytes) starting from which
+                blobs are not fetched. If given, only notebooks and dependency
+                manifests are checked out (see ``git_utils.partial_clone()``).
+
+        Returns:
+            git.Repo: the worktree.
+        """
+        with self.locked(self.lock_path(url, size_limit)):
+            mirror = self.update(url, size_limit)
+            mirror.git.worktree("prune")
+            if size_limit:
+                mirror.git.worktree("add", "--no-checkout", "--detach", to_path, "HEAD")
+                repo = git.Repo(to_path)
+                repo.git.sparse_checkout("set", "--no-cone", *SPARSE_CHECKOUT_PATTERNS)
+                repo.git.checkout()
+            else:
+                mirror.git.worktree("add", "--detach", to_path, "HEAD")
+                repo = git.Repo(to_path)
+        with self.locked():
+            self.evict(keep=Path(mirror.git_dir))
+        return repo
+
+    def mirror_paths(self) -> List[Path]:
+        """Return the directories of the mirrors, from the least recently used."""
+        return sorted(
+            (
+                path
+                for path in self.directory.glob(f"*{MIRROR_SUFFIX}")
+                if path.is_dir()
+            ),
+            key=lambda path: path.stat().st_mtime,
+        )
+
+    def evict(self, keep: Optional[Path] = None) -> List[Path]:
+        """Remove the least recently used mirrors until the cache fits its budget.
+
+        Mirrors with worktrees still in use, mirrors being updated (i.e., whose
+        lock is held), and the ``keep`` mirror, are never removed. The cache
+        should be locked (see ``locked()``).
+
+        Returns:
+            List[Path]: the directories of the removed mirrors.
+        """
+        if self.max_size is None:
+            return []
+        mirror_sizes = {path: directory_size(path) for path in self.mirror_paths()}
+        total_size = sum(mirror_sizes.values())
+        evicted: List[Path] = []
+        for path, size in mirror_sizes.items():
+            if total_size <= self.max_size:
+                break
+            if keep is not None and path.samefile(keep):
+                continue
+            if not self._remove_unused(path):
+                continue
+            total_size -= size
+            evicted.append(path)
+        return evicted
+
+    def _remove_unused(self, mirror_path: Path) -> bool:
+        """Remove a mirror, unless it is being updated or has worktrees in use."""
+        lock_path = mirror_path.with_name(mirror_path.name + MIRROR_LOCK_SUFFIX)
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return False
+            try:
+                if self._in_use(mirror_path):
+                    return False
+                shutil.rmtree(mirror_path, ignore_errors=True)
+                return True
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _in_use(mirror_path: Path) -> bool:
+        """Whether worktrees of the mirror exist (after pruning the removed ones)."""
+        try:
+            git.Repo(mirror_path).git.worktree("prune")
+        except git.GitError:
+            return False
+        worktrees = mirror_path / "worktrees"
+        return worktrees.is_dir() and any(worktrees.iterdir())
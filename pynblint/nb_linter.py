@@ -1,17 +1,30 @@
-import ast
 import dataclasses
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from rich.columns import Columns
 from rich.console import Console, ConsoleOptions, RenderResult, group
 from rich.panel import Panel
 from rich.rule import Rule
 
+from .baseline import Baseline, fingerprint
 from .config import settings
-from .core_models import Notebook
-from .lint import CellLevelLint, NotebookLevelLint, NotebookLint
-from .lint_register import enabled_cell_level_lints, enabled_notebook_level_lints
+from .core_models import Cell, Notebook
+from .corpus_stats import CorpusStats
+from .lint import (
+    CellLevelLint,
+    Finding,
+    LintCost,
+    LintDefinition,
+    LintLevel,
+    NotebookLevelLint,
+    NotebookLint,
+    ViolationBudget,
+)
+from .notebook_stats import NotebookStats, collect_stats
+from .session import get_session
 
 
 @dataclass
@@ -19,156 +32,292 @@ class NotebookMetadata:
     notebook_name: str
 
 
+# Result of a lint in compact form: a boolean for notebook-level lints,
+# the indexes of the affected cells for cell-level lints
+CompactLintResult = Union[bool, List[int]]
+
+
 @dataclass
-class NotebookStats:
-    # Cells
-    number_of_cells: int
-    number_of_MD_cells: int
-    number_of_code_cells: int
-    number_of_raw_cells: int
+class NotebookResults:
+    """Compact (and serializable) results of the analysis of a notebook."""
+
+    notebook_stats: Optional[NotebookStats]
+    lints: Dict[str, CompactLintResult]
+    # Signature of the notebook sources, if needed by repository lints
+    minhash_signature: Optional[List[int]] = None
 
-    # Modularization
-    number_of_functions: Optional[int]
-    number_of_classes: Optional[int]
+    def as_dict(self) -> Dict:
+        return {
+            "notebook_stats": (
+                dataclasses.asdict(self.notebook_stats)
+                if self.notebook_stats is not None
+                else None
+            ),
+            "lints": self.lints,
+            "minhash_signature": self.minhash_signature,
+        }
 
-    # Markdown usage
-    number_of_md_lines: int
-    number_of_md_titles: int
+    @classmethod
+    def from_dict(cls, results_dict: Dict) -> "NotebookResults":
+        stats_dict = results_dict["notebook_stats"]
+        return cls(
+            notebook_stats=NotebookStats(**stats_dict) if stats_dict else None,
+            lints=results_dict["lints"],
+            minhash_signature=results_dict.get("minhash_signature"),
+        )
 
 
 class NotebookLinter:
-    def __init__(self, notebook: Notebook) -> None:
+    def __init__(
+        self,
+        notebook: Notebook,
+        results: Optional[NotebookResults] = None,
+        budget: Optional[ViolationBudget] = None,
+        max_cost: LintCost = LintCost.CONTENT,
+    ) -> None:
+        """Lint a notebook.
+
+        Lints are evaluated from the cheapest (see ``LintCost``), but they are
+        reported in the order of their definition.
+
+        Args:
+            notebook (Notebook): the notebook to be analyzed.
+            results (Optional[NotebookResults]): results of a previous analysis
+                of the same notebook content; statistics and lints found in
+                ``results`` are not computed again.
+            budget (Optional[ViolationBudget]): the violation budget, possibly
+                shared with other linters; once it is exhausted, no further lints
+                are evaluated. Defaults to the budget set in the settings, if any.
+            max_cost (LintCost): the cost of the most expensive lints to be
+                evaluated; the remaining lints can be evaluated with ``resume()``.
+        """
         self.notebook = notebook
         self.notebook_metadata: NotebookMetadata = NotebookMetadata(
             notebook_name=notebook.path.name
         )
-        self.notebook_stats: NotebookStats = NotebookStats(
-            number_of_cells=self.count_cells(),
-            number_of_MD_cells=self.count_md_cells(),
-            number_of_code_cells=self.count_code_cells(),
-            number_of_raw_cells=self.count_raw_cells(),
-            number_of_functions=self.count_func_defs(),
-            number_of_classes=self.count_class_defs(),
-            number_of_md_lines=self.count_md_lines(),
-            number_of_md_titles=self.count_md_titles(),
+        self.budget: Optional[ViolationBudget] = (
+            budget if budget is not None else ViolationBudget.from_settings()
         )
-
-        self.lints: List[NotebookLint] = []
-
-        self.lints.extend(
+        self.notebook_stats: Optional[NotebookStats] = None
+        self.minhash_signature: Optional[List[int]] = None
+        self._known_results: Dict[str, CompactLintResult] = {}
+        if results is not None:
+            self.notebook_stats = results.notebook_stats
+            self.minhash_signature = results.minhash_signature
+            self._known_results = results.lints
+
+        session = get_session()
+        self._uses_signature: bool = any(
+            lint.uses_signatures for lint in session.path_level_lints
+        )
+        lint_defs = [(lint, False) for lint in session.notebook_level_lints] + [
+            (lint, True) for lint in session.cell_level_lints
+        ]
+        self._pending_lints: List[Tuple[int, LintDefinition, bool]] = sorted(
             [
-                NotebookLevelLint(
+                (position, lint, is_cell_level)
+                for position, (lint, is_cell_level) in enumerate(lint_defs)
+            ],
+            key=lambda pending_lint: pending_lint[1].cost,
+        )
+        self._evaluated_lints: Dict[int, NotebookLint] = {}
+        self.lints: List[NotebookLint] = []
+        self.has_linting_results: bool = False
+
+        self.resume(max_cost)
+
+    @property
+    def complete(self) -> bool:
+        """Whether all the enabled lints have been evaluated."""
+        return not self._pending_lints
+
+    def resume(self, max_cost: LintCost = LintCost.CONTENT) -> None:
+        """Evaluate the pending lints up to ``max_cost``, while the budget lasts."""
+        while self._pending_lints and self._pending_lints[0][1].cost <= max_cost:
+            if self.budget is not None and self.budget.exhausted:
+                break
+            position, lint, is_cell_level = self._pending_lints.pop(0)
+            known_result = self._known_results.get(lint.slug)
+            evaluated_lint: NotebookLint
+            if is_cell_level:
+                evaluated_lint = CellLevelLint(
                     lint.slug,
                     lint.description,
                     lint.recommendation,
                     lint.linting_function,
                     self.notebook,
+                    lint.show_details,
+                    result=self._cells_at(known_result),
                 )
-                for lint in enabled_notebook_level_lints
-            ]
-        )
-
-        self.lints.extend(
-            [
-                CellLevelLint(
+            else:
+                evaluated_lint = NotebookLevelLint(
                     lint.slug,
                     lint.description,
                     lint.recommendation,
                     lint.linting_function,
                     self.notebook,
-                    lint.show_details,
+                    result=known_result,  # type: ignore
                 )
-                for lint in enabled_cell_level_lints
-            ]
-        )
-
-        self.has_linting_results = any([lint.result for lint in self.lints])
-
-    def count_cells(self) -> int:
-        """Computes the total number of cells within a notebook."""
-
-        nb_dict = self.notebook.nb_dict
-        return len(nb_dict["cells"])
-
-    def count_md_cells(self) -> int:
-        """Computes the total number of Markdown cells within a notebook."""
-
-        nb_dict = self.notebook.nb_dict
-        counter = 0
-        for cell in nb_dict["cells"]:
-            if cell["cell_type"] == "markdown":
-                counter = counter + 1
-        return counter
-
-    def count_code_cells(self) -> int:
-        """Computes the total number of code cells within a notebook."""
-
-        nb_dict = self.notebook.nb_dict
-        counter = 0
-        for cell in nb_dict["cells"]:
-            if cell["cell_type"] == "code":
-                counter = counter + 1
-        return counter
-
-    def count_raw_cells(self) -> int:
-        """Computes the total number of raw cells within a notebook."""
-
-        nb_dict = self.notebook.nb_dict
-        counter = 0
-        for cell in nb_dict["cells"]:
-            if cell["cell_type"] == "raw":
-                counter = counter + 1
-        return counter
-
-    def count_func_defs(self) -> Optional[int]:
-        """Computes the total number of function definitions within a notebook."""
-
-        # If the input notebook contains invalid Python syntax, the number of function
-        # definitions cannot be determined (as its count is based on `ast`).
-        if self.notebook.has_invalid_python_syntax:
-            return None
+            if self.budget is not None:
+                self.budget.spend(evaluated_lint.result)
+            self._evaluated_lints[position] = evaluated_lint
+
+        # Statistics are skipped if they are not reported, and for notebooks whose
+        # content has not been read (i.e., if the budget was exhausted before
+        # content lints)
+        if (
+            self.notebook_stats is None
+            and settings.collect_stats
+            and (self.complete or self.notebook.is_loaded)
+        ):
+            self.notebook_stats = self.compute_stats()
+
+        # The signature is computed here as well, so that repository lints
+        # comparing notebooks do not read them again
+        if (
+            self.minhash_signature is None
+            and self._uses_signature
+            and (self.complete or self.notebook.is_loaded)
+        ):
+            self.minhash_signature = self.notebook.minhash_signature(
+                settings.minhash_signature_size
+            )
 
-        f_num = sum(isinstance(exp, ast.FunctionDef) for exp in self.notebook.ast.body)
-        return f_num
+        # With a memory budget, only the compact results are kept once linted
+        if settings.max_memory is not None and self.complete:
+            self.notebook.release()
 
-    def count_class_defs(self) -> Optional[int]:
-        """Computes the total number of class definitions within a notebook."""
+        self.lints = [
+            self._evaluated_lints[position]
+            for position in sorted(self._evaluated_lints)
+        ]
+        self.has_linting_results = any([lint.result for lint in self.lints])
 
-        # If the input notebook contains invalid Python syntax, the number of class
-        # definitions cannot be determined (as its count is based on `ast`).
-        if self.notebook.has_invalid_python_syntax:
+    def _cells_at(self, indexes: Optional[CompactLintResult]) -> Optional[List[Cell]]:
+        if indexes is None or isinstance(indexes, bool):
             return None
-
-        class_def_num = sum(
-            isinstance(exp, ast.ClassDef) for exp in self.notebook.ast.body
+        return [self.notebook.cells[index] for index in indexes]
+
+    def for_copy(self, path: Path) -> "NotebookLinter":
+        """Lint a byte-identical copy of the notebook, located at ``path``.
+
+        Only the lints depending on the notebook path are evaluated again;
+        the results of the other lints (and the statistics and signature) are
+        reused.
+        """
+        session = get_session()
+        path_slugs = {
+            lint.slug
+            for lint in session.notebook_level_lints + session.cell_level_lints
+            if lint.depends_on_path
+        }
+        results = self.results
+        content_results = NotebookResults(
+            results.notebook_stats,
+            {
+                slug: result
+                for slug, result in results.lints.items()
+                if slug not in path_slugs
+            },
+            results.minhash_signature,
         )
-        return class_def_num
-
-    def count_md_lines(self) -> int:
-        """Count the total number of markdown rows within a notebook."""
-        nb_dict = self.notebook.nb_dict
-        markdown_lines = 0
-        for cell in nb_dict["cells"]:
-            if cell["cell_type"] == "markdown":
-                rows = len(cell["source"].split("\n"))
-                markdown_lines += rows
-        return markdown_lines
-
-    def count_md_titles(self) -> int:
-        """Count the total number of markdown titles within a notebook."""
-        nb_dict = self.notebook.nb_dict
-        titles = 0
-        for cell in nb_dict["cells"]:
-            if cell["cell_type"] == "markdown":
-                for row in cell["source"]:
-                    if row.lstrip().startswith("#"):
-                        titles = titles + 1
-        return titles
+        if self.notebook.is_loaded:
+            notebook = Notebook(path, nb_node=self.notebook.nb_dict)
+        else:
+            # The content has been released: the copy is read from its own file
+            notebook = Notebook(path)
+        return NotebookLinter(notebook, content_results)
+
+    @cached_property
+    def corpus_stats(self) -> CorpusStats:
+        """The statistics of this notebook, to be merged into corpus statistics."""
+        return CorpusStats.from_notebook(self)
+
+    def compute_stats(self) -> NotebookStats:
+        """Compute the statistics of the notebook, in a single pass over its cells.
+
+        Statistics registered by plugins are computed as well.
+        """
+        return collect_stats(self.notebook, get_session().notebook_stats)
+
+    @property
+    def results(self) -> NotebookResults:
+        """The compact results of the analysis.
+
+        Raises:
+            RuntimeError: if some lints are still pending (see ``resume()``).
+        """
+        if not self.complete:
+            raise RuntimeError(
+                "The results of a notebook are only available once all its lints "
+                "have been evaluated."
+            )
+        lints: Dict[str, CompactLintResult] = {}
+        for lint in self.lints:
+            if isinstance(lint, CellLevelLint):
+                lints[lint.slug] = [cell.cell_index for cell in lint.result]
+            else:
+                lints[lint.slug] = bool(lint.result)
+        return NotebookResults(self.notebook_stats, lints, self.minhash_signature)
+
+    def findings(self) -> Iterator[Finding]:
+        """Iterate over the linting results, one per affected cell or notebook."""
+        for lint in self.lints:
+            if isinstance(lint, CellLevelLint):
+                for cell in lint.result:
+                    yield Finding(
+                        lint.slug,
+                        LintLevel.CELL,
+                        lint.description,
+                        self.notebook.path,
+                        cell.cell_index,
+                    )
+            elif lint.result:
+                yield Finding(
+                    lint.slug, LintLevel.NOTEBOOK, lint.description, self.notebook.path
+                )
+
+    def apply_baseline(
+        self, baseline: Baseline, scope: str = "", location: Optional[str] = None
+    ) -> None:
+        """Drop the findings known to the baseline from the linting results.
+
+        Args:
+            baseline (Baseline): the known findings.
+            scope (str): the target containing the notebook in a multi-target run.
+            location (Optional[str]): the path of the notebook relative to the
+                repository root; defaults to the notebook path.
+        """
+        if location is None:
+            location = self.notebook.path.as_posix()
+        for lint in self.lints:
+            if isinstance(lint, CellLevelLint):
+                # Cells are identified by their source (affected cells with the
+                # same source are told apart by the baseline, by occurrence)
+                lint.result = [
+                    cell
+                    for cell in lint.result
+                    if not baseline.suppresses(
+                        fingerprint(
+                            lint.slug, scope, location, cell.cell_source.strip()
+                        )
+                    )
+                ]
+            elif lint.result and baseline.suppresses(
+                fingerprint(lint.slug, scope, location)
+            ):
+                lint.result = False
+        self.has_linting_results = any([lint.result for lint in self.lints])
+        self.__dict__.pop("corpus_stats", None)
 
     def as_dict(self) -> Dict:
         results_dict = {
             "notebook_metadata": dataclasses.asdict(self.notebook_metadata),
-            "notebook_stats": dataclasses.asdict(self.notebook_stats),
+            "notebook_stats": (
+                dataclasses.asdict(self.notebook_stats)
+                if self.notebook_stats is not None
+                else None
+            ),
             "lints": [lint.as_dict() for lint in self.lints if lint.result],
         }
         return results_dict
@@ -193,7 +342,7 @@ class NotebookLinter:
         notebook_name += f"[bold]{self.notebook.path.name}[bold][/grey50]\n"
         yield notebook_name
 
-        if not settings.hide_stats:
+        if not settings.hide_stats and self.notebook_stats is not None:
             # Statistics panels
             yield "\n[blue bold]STATISTICS[/blue bold]\n"
 
@@ -220,7 +369,14 @@ class NotebookLinter:
                 Panel(md_stats, title="Markdown usage"),
             ]
 
-            if not self.notebook.has_invalid_python_syntax:
+            if self.notebook_stats.plugin_stats:
+                # Statistics registered by plugins
+                plugin_stats = "\n"
+                for name, value in self.notebook_stats.plugin_stats.items():
+                    plugin_stats += f"[green]{name}[/green]: {value:g}\n"
+                metadata_panels.append(Panel(plugin_stats, title="Other"))
+
+            if self.notebook_stats.number_of_functions is not None:
                 # Modularization stats
                 modularization_stats = "\n"
                 modularization_stats += "[green]Number of functions[/green]: "
@@ -1,13 +1,12 @@
 """Linting functions for notebooks."""
 
-import ast
 import re
 from typing import List, Pattern
 
 from . import lint_register as register
 from .config import settings
 from .core_models import Cell, CellType, Notebook
-from .lint import LintDefinition, LintLevel
+from .lint import LintCost, LintDefinition, LintLevel
 
 # ============== #
 # NOTEBOOK LEVEL #
@@ -64,47 +63,18 @@ def long_filename(notebook: Notebook) -> bool:
 
 
 def imports_beyond_first_cell(notebook: Notebook) -> bool:
-    """Check if import statements are used beyond the first code cell."""
-
-    code = notebook.script
-    found_first_cell = False
-    # when `found_first_cell` is True, it means we have found the first cell of code
-    # that has to be ignored
-
-    second_cell_not_reached = True
-    # when set to False, we are actually reading instructions from the second cell of
-    # code; from now on we need to analyze all the cells looking for import statements
-
-    correct_position = True
-    cell = ""
-    program = code.split("\n")
-    for line in program:
-        if not found_first_cell:
-            # it ignores all the lines before the first cell generated by
-            # nbconvert(python# version ecc.)
-            if line[0:5] == "# In[":
-                found_first_cell = True
-        elif not second_cell_not_reached:
-            # starting from the second cell, it saves all the instructions until
-            # it finds a new cell
-            if line[0:5] != "# In[":
-                cell = cell + "\n" + line
-            else:
-                try:
-                    tree = ast.parse(cell)
-                    # once it finds a new cell, it checks if there are any import
-                    # statements in the previous cell
-                    if sum(isinstance(exp, ast.Import) for exp in tree.body) > 0:
-                        correct_position = False
-                        break
-                except SyntaxError:
-                    pass  # TODO: handle this exception only during notebook creation
-        else:
-            if line[0:5] == "# In[":
-                # following instructions are from the second cell of code,
-                # the first one we have to analyze
-                second_cell_not_reached = False
-    return not correct_position
+    """Check if import statements are used beyond the first code cell.
+
+    The last code cell is not checked, and neither are the cells from the first
+    one (after the first code cell) with invalid syntax onwards.
+    """
+
+    for cell in notebook.code_cells[1:-1]:
+        if not cell.facts.valid_syntax:
+            return False
+        if cell.facts.imported_modules:
+            return True
+    return False
 
 
 def missing_h1_md_heading(notebook: Notebook) -> bool:
@@ -258,27 +228,31 @@ def cells_too_long(notebook: Notebook) -> List[Cell]:
     return [
         cell
         for cell in notebook.code_cells
-        if len(cell.cell_source.split("\n")) > settings.max_lines_in_code_cell
+        if cell.facts.number_of_lines > settings.max_lines_in_code_cell
     ]
 
 
 def long_multiline_python_comment(notebook: Notebook) -> List[Cell]:
-    """check if the notebook has multiline comment.
+    """Check if code cells contain long multiline comments.
+
+    Comments are long if they span at least ``max_multiline_python_comment``
+    consecutive lines, anywhere in the cell.
 
     Args:
         notebook (Notebook): the notebook to be analyzed.
 
     Returns:
-        bool: ``True`` if the notebook have 3 or more line of comment
-            ``False`` otherwise.
-
+        List[Cell]: the list of code cells containing long multiline comments.
     """
 
-    pattern: Pattern[str] = re.compile(
-        rf"([^\\S\r\n]*#.*\n*){{{settings.max_multiline_python_comment},}}"
-    )
-
-    return [cell for cell in notebook.code_cells if pattern.match(cell.cell_source)]
+    return [
+        cell
+        for cell in notebook.code_cells
+        if any(
+            length >= settings.max_multiline_python_comment
+            for _, length in cell.facts.comment_runs
+        )
+    ]
 
 
 # ================= #
@@ -307,6 +281,8 @@ notebook_level_lints: List[LintDefinition] = [
         "Untitled[<number>].ipynb",
         recommendation="Give it a meaningful title to make it easy to recognize.",
         linting_function=untitled_notebook,
+        cost=LintCost.PATH,
+        depends_on_path=True,
     ),
     LintDefinition(
         slug="non-portable-chars-in-nb-name",
@@ -315,6 +291,8 @@ notebook_level_lints: List[LintDefinition] = [
         recommendation="Rename your notebook by using characters contained "
         "in the following portable charset: [A-Za-z0-9_.-].",
         linting_function=notebook_named_with_unrestricted_charset,
+        cost=LintCost.PATH,
+        depends_on_path=True,
     ),
     LintDefinition(
         slug="notebook-name-too-long",
@@ -323,6 +301,8 @@ notebook_level_lints: List[LintDefinition] = [
         recommendation="Use a shorter filename and leverage Markdown titles to convey "
         "detailed information.",
         linting_function=long_filename,
+        cost=LintCost.PATH,
+        depends_on_path=True,
     ),
     LintDefinition(
         slug="imports-beyond-first-cell",
@@ -372,6 +352,8 @@ notebook_level_lints: List[LintDefinition] = [
         "<source-notebook-name>-Copy<copy-number>.ipynb",
         recommendation="Give it a meaningful title to make it easy to recognize.",
         linting_function=duplicate_notebook_not_renamed,
+        cost=LintCost.PATH,
+        depends_on_path=True,
     ),
     LintDefinition(
         slug="invalid-python-syntax",
@@ -0,0 +1,94 @@
+"""Notebook statistics, collected in a single pass over the cells of a notebook.
+
+Statistics are computed from the cell facts (see ``pynblint.cell_facts``), which
+are shared with lints, so collecting statistics does not parse cells again.
+Plugins can register additional statistics with
+``lint_register.register_stats``; they are collected in the same pass.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, Optional
+
+from .core_models import CellType
+
+if TYPE_CHECKING:
+    from .core_models import Cell, Notebook
+
+
+@dataclass
+class NotebookStats:
+    # Cells
+    number_of_cells: int
+    number_of_MD_cells: int
+    number_of_code_cells: int
+    number_of_raw_cells: int
+
+    # Modularization
+    number_of_functions: Optional[int]
+    number_of_classes: Optional[int]
+
+    # Markdown usage
+    number_of_md_lines: int
+    number_of_md_titles: int
+
+    # Statistics registered by plugins, by name
+    plugin_stats: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class StatDefinition:
+    """A notebook statistic, computed as the sum of a value over the cells.
+
+    Args:
+        name (str): the name of the statistic (e.g., ``number_of_plots``).
+        description (str): a short description, used when reporting it.
+        cell_value (Callable[[Cell], float]): the contribution of a cell.
+        cell_types (Optional[FrozenSet[CellType]]): the types of the cells
+            contributing to the statistic; all cells, if ``None``.
+    """
+
+    name: str
+    description: str
+    cell_value: Callable[["Cell"], float]
+    cell_types: Optional[FrozenSet[CellType]] = None
+
+
+def collect_stats(
+    notebook: "Notebook", stat_defs: Iterable[StatDefinition] = ()
+) -> NotebookStats:
+    """Compute the statistics of a notebook (and the given plugin statistics)."""
+
+    stat_defs = list(stat_defs)
+    plugin_stats: Dict[str, float] = {stat_def.name: 0 for stat_def in stat_defs}
+    cells_by_type: Dict[CellType, int] = {cell_type: 0 for cell_type in CellType}
+    functions = classes = md_lines = md_titles = 0
+    valid_syntax = True
+
+    for cell in notebook.cells:
+        cells_by_type[cell.cell_type] += 1
+        if cell.cell_type == CellType.CODE:
+            facts = cell.facts
+            valid_syntax = valid_syntax and facts.valid_syntax
+            functions += facts.number_of_functions
+            classes += facts.number_of_classes
+        elif cell.cell_type == CellType.MARKDOWN:
+            facts = cell.facts
+            md_lines += facts.number_of_lines
+            md_titles += facts.number_of_md_titles
+        for stat_def in stat_defs:
+            if stat_def.cell_types is None or cell.cell_type in stat_def.cell_types:
+                plugin_stats[stat_def.name] += stat_def.cell_value(cell)
+
+    # If the notebook contains invalid Python syntax, the number of function and
+    # class definitions cannot be determined (as their count is based on `ast`).
+    return NotebookStats(
+        number_of_cells=sum(cells_by_type.values()),
+        number_of_MD_cells=cells_by_type[CellType.MARKDOWN],
+        number_of_code_cells=cells_by_type[CellType.CODE],
+        number_of_raw_cells=cells_by_type[CellType.RAW],
+        number_of_functions=functions if valid_syntax else None,
+        number_of_classes=classes if valid_syntax else None,
+        number_of_md_lines=md_lines,
+        number_of_md_titles=md_titles,
+        plugin_stats=plugin_stats,
+    )
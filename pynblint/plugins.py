@@ -0,0 +1,261 @@
+"""Discovery of the plugins installed as packages.
+
+Packages provide plugins through entry points of the ``pynblint.plugins`` group,
+whose values are the names of the plugin modules; e.g., in ``pyproject.toml``:
+
+.. code:: toml
+
+    [tool.poetry.plugins."pynblint.plugins"]
+    my_plugin = "my_package.my_plugin"
+
+What each plugin provides (its lint slugs, levels and costs, and its statistics)
+is recorded in a manifest, cached on disk along with the version of the package
+providing the plugin. Plugin modules are therefore imported only to build their
+manifest entry (i.e., once per installed version) and when one of their lints
+is enabled for a run.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from . import __version__, loader
+from .config import Settings
+from .lint import LintCost, LintLevel
+
+# Entry point group of the plugins
+ENTRY_POINT_GROUP = "pynblint.plugins"
+
+# Name of the manifest file within the cache directory
+MANIFEST_FILENAME = "plugin_manifest.json"
+
+
+class InstalledPlugin(NamedTuple):
+    name: str  # Name of the entry point
+    module: str
+    version: str  # Version of the package providing the plugin
+
+
+@dataclass
+class LintManifest:
+    slug: str
+    level: LintLevel
+    cost: LintCost
+
+    def as_dict(self) -> Dict:
+        return {"slug": self.slug, "level": self.level.name, "cost": self.cost.name}
+
+    @classmethod
+    def from_dict(cls, lint_dict: Dict) -> "LintManifest":
+        return cls(
+            slug=lint_dict["slug"],
+            level=LintLevel[lint_dict["level"]],
+            cost=LintCost[lint_dict["cost"]],
+        )
+
+
+@dataclass
+class PluginManifest:
+    """What a plugin provides, recorded without keeping its module imported."""
+
+    plugin: InstalledPlugin
+    lints: List[LintManifest] = field(default_factory=list)
+    stats: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_module(cls, plugin: InstalledPlugin) -> "PluginManifest":
+        """Build the manifest of a plugin by loading its module."""
+        return cls(
+            plugin=plugin,
+            lints=[
+                LintManifest(lint.slug, lint_level, lint.cost)
+                for lint_level, lint_defs in loader.module_lints(plugin.module).items()
+                for lint in lint_defs
+            ],
+            stats=[stat_def.name for stat_def in loader.module_stats(plugin.module)],
+        )
+
+    def enabled_slugs(self, settings: Settings) -> List[str]:
+        """Return the slugs of the lints of the plugin enabled by ``settings``."""
+        slugs = [lint.slug for lint in self.lints]
+        if settings.exclude:
+            return [slug for slug in slugs if slug not in settings.exclude]
+        elif settings.include:
+            return [slug for slug in slugs if slug in settings.include]
+        return slugs
+
+    def as_dict(self) -> Dict:
+        return {
+            "module": self.plugin.module,
+            "version": self.plugin.version,
+            "lints": [lint.as_dict() for lint in self.lints],
+            "stats": self.stats,
+        }
+
+    @classmethod
+    def from_dict(cls, name: str, manifest_dict: Dict) -> "PluginManifest":
+        return cls(
+            plugin=InstalledPlugin(
+                name, manifest_dict["module"], manifest_dict["version"]
+            ),
+            lints=[LintManifest.from_dict(lint) for lint in manifest_dict["lints"]],
+            stats=manifest_dict["stats"],
+        )
+
+
+def installed_plugins() -> List[InstalledPlugin]:
+    """Return the plugins declared by the installed packages (without loading them)."""
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        group: Iterable = entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        # Python < 3.10
+        group = entry_points.get(ENTRY_POINT_GROUP, [])  # type: ignore
+    plugins = []
+    for entry_point in group:
+        module = entry_point.value.split(":")[0].strip()
+        plugins.append(
+            InstalledPlugin(
+                name=entry_point.name,
+                module=module,
+                version=_plugin_version(entry_point, module),
+            )
+        )
+    return plugins
+
+
+def _plugin_version(entry_point: metadata.EntryPoint, module: str) -> str:
+    """Return the version of the package providing a plugin ("" if unknown)."""
+    distribution = getattr(entry_point, "dist", None)
+    if distribution is not None:
+        return distribution.version
+    # Python < 3.10: entry points do not refer to their distribution, which is
+    # looked up by the name of the top-level package of the plugin module
+    try:
+        return metadata.version(module.split(".")[0])
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def default_cache_dir() -> Path:
+    """Return the user cache directory of pynblint."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pynblint"
+
+
+class ManifestCache:
+    """Plugin manifests cached in a file (by plugin and package version).
+
+    The whole cache is discarded when the version of pynblint changes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self._manifests: Dict[str, PluginManifest] = {}
+        self._modified: bool = False
+        if self.path.is_file():
+            self._load()
+
+    def get(self, plugin: InstalledPlugin) -> PluginManifest:
+        """Return the manifest of a plugin, loading its module on a cache miss.
+
+        The manifests of plugins whose version is unknown are never cached, as
+        they could not be told apart from those of other versions.
+        """
+        if not plugin.version:
+            return PluginManifest.from_module(plugin)
+        manifest = self._manifests.get(plugin.name)
+        if manifest is None or manifest.plugin != plugin:
+            manifest = PluginManifest.from_module(plugin)
+            self._manifests[plugin.name] = manifest
+            self._modified = True
+        return manifest
+
+    def retain(self, plugins: List[InstalledPlugin]) -> None:
+        """Forget the manifests of the plugins that are no longer installed."""
+        names = {plugin.name for plugin in plugins}
+        for name in list(self._manifests):
+            if name not in names:
+                del self._manifests[name]
+                self._modified = True
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupted manifest is simply rebuilt
+            return
+        if data.get("version") != __version__:
+            return
+        self._manifests = {
+            name: PluginManifest.from_dict(name, manifest_dict)
+            for name, manifest_dict in data["plugins"].items()
+        }
+
+    def save(self) -> None:
+        """Write the manifests to the cache file (atomically), if modified."""
+        if not self._modified:
+            return
+        data = {
+            "version": __version__,
+            "plugins": {
+                name: manifest.as_dict() for name, manifest in self._manifests.items()
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The manifest will be rebuilt in the next run
+            return
+        self._modified = False
+
+
+# Manifests of the installed plugins, by cache file (discovered once per process)
+_manifests: Dict[Path, List[PluginManifest]] = {}
+_lock = threading.Lock()
+
+
+def plugin_manifests(cache_dir: Optional[Path] = None) -> List[PluginManifest]:
+    """Return the manifests of the installed plugins.
+
+    Args:
+        cache_dir (Optional[Path]): the directory of the manifest cache;
+            defaults to the user cache directory.
+    """
+    cache_path = (cache_dir or default_cache_dir()) / MANIFEST_FILENAME
+    with _lock:
+        if cache_path not in _manifests:
+            plugins = installed_plugins()
+            if not plugins and not cache_path.is_file():
+                _manifests[cache_path] = []
+            else:
+                cache = ManifestCache(cache_path)
+                cache.retain(plugins)
+                _manifests[cache_path] = [cache.get(plugin) for plugin in plugins]
+                cache.save()
+        return _manifests[cache_path]
+
+
+def enabled_plugins(settings: Settings) -> List[str]:
+    """Return the modules of the installed plugins needed with ``settings``.
+
+    A plugin is needed if any of its lints is enabled (based on the settings
+    ``include`` and ``exclude``) or if it provides statistics and these are
+    collected.
+    """
+    return [
+        manifest.plugin.module
+        for manifest in plugin_manifests(settings.cache_dir)
+        if (manifest.stats and settings.collect_stats)
+        or manifest.enabled_slugs(settings)
+    ]
@@ -0,0 +1,143 @@
+"""Read-ahead of notebook files, overlapping I/O with parsing and linting.
+
+Files are read by a small pool of threads, up to a bounded number of files (and,
+optionally, of bytes) ahead of the consumer, and yielded in their original order.
+On slow or remote filesystems, the time spent waiting on reads is then mostly
+hidden behind the processing of the files already read.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from .config import settings
+
+
+@dataclass
+class IOStats:
+    """I/O metrics of the files read ahead."""
+
+    files_read: int = 0
+    bytes_read: int = 0
+    read_seconds: float = 0  # Total time spent reading (across reader threads)
+    wait_seconds: float = 0  # Time the consumer spent waiting for reads
+
+    def merge(self, other: "IOStats") -> None:
+        self.files_read += other.files_read
+        self.bytes_read += other.bytes_read
+        self.read_seconds += other.read_seconds
+        self.wait_seconds += other.wait_seconds
+
+    def as_dict(self) -> Dict:
+        return {
+            "files_read": self.files_read,
+            "bytes_read": self.bytes_read,
+            "read_seconds": self.read_seconds,
+            "wait_seconds": self.wait_seconds,
+        }
+
+
+def file_size(path: Path) -> int:
+    """Return the size of a file (0 if it cannot be read)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _read(path: Path) -> Tuple[bytes, float]:
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        content = f.read()
+    return content, time.perf_counter() - start
+
+
+class ReadAhead:
+    """Iterate over the content of files, read ahead by background threads.
+
+    Args:
+        paths (Iterable[Path]): the files to be read.
+        depth (Optional[int]): the maximum number of files read ahead of the
+            consumer; with 0, files are read synchronously. Defaults to
+            ``settings.read_ahead``.
+        threads (Optional[int]): the number of reader threads. Defaults to
+            ``settings.io_threads``.
+        max_bytes (Optional[int]): the maximum number of bytes read ahead of the
+            consumer (e.g., to stay within a memory budget); a file larger than
+            that is read synchronously. Unlimited by default.
+        sizes (Optional[Dict[Path, int]]): the size of (some of) the files, if
+            already known; missing ones are read from the filesystem (only with
+            ``max_bytes``).
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        depth: Optional[int] = None,
+        threads: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizes: Optional[Dict[Path, int]] = None,
+    ) -> None:
+        self.paths: Iterable[Path] = paths
+        self.depth: int = settings.read_ahead if depth is None else depth
+        self.threads: int = settings.io_threads if threads is None else threads
+        self.max_bytes: Optional[int] = max_bytes
+        self.sizes: Dict[Path, int] = sizes or {}
+        self.stats: IOStats = IOStats()
+
+    def __iter__(self) -> Iterator[Tuple[Path, bytes]]:
+        if self.depth <= 0 or self.threads <= 0:
+            for path in self.paths:
+                content, read_seconds = _read(path)
+                self._account(content, read_seconds, read_seconds)
+                yield path, content
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=self.threads, thread_name_prefix="pynblint-reader"
+        ) as executor:
+            pending: Deque[Tuple[Path, int, Future]] = deque()
+            pending_bytes = 0
+            paths = iter(self.paths)
+            try:
+                for path in paths:
+                    size = self._size(path)
+                    pending.append((path, size, executor.submit(_read, path)))
+                    pending_bytes += size
+                    while pending and (
+                        len(pending) > self.depth
+                        or (
+                            self.max_bytes is not None
+                            and pending_bytes > self.max_bytes
+                        )
+                    ):
+                        pending_bytes -= pending[0][1]
+                        yield self._next(pending)
+                while pending:
+                    yield self._next(pending)
+            finally:
+                # The consumer stopped early: pending reads are discarded
+                for _, _, future in pending:
+                    future.cancel()
+
+    def _size(self, path: Path) -> int:
+        if self.max_bytes is None:
+            return 0
+        return self.sizes[path] if path in self.sizes else file_size(path)
+
+    def _next(self, pending: Deque[Tuple[Path, int, Future]]) -> Tuple[Path, bytes]:
+        path, _, future = pending.popleft()
+        start = time.perf_counter()
+        content, read_seconds = future.result()
+        self._account(content, read_seconds, time.perf_counter() - start)
+        return path, content
+
+    def _account(self, content: bytes, read_seconds: float, wait_seconds: float):
+        self.stats.files_read += 1
+        self.stats.bytes_read += len(content)
+        self.stats.read_seconds += read_seconds
+        self.stats.wait_seconds += wait_seconds
@@ -0,0 +1,118 @@
+"""Renderers of linting results for the terminal."""
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Iterable, List, Union
+
+from rich.console import Console
+
+from .batch import BatchLinter
+from .config import ReportFormat, settings
+from .corpus_stats import CorpusStats
+from .lint import Finding, LintLevel
+from .nb_linter import NotebookLinter
+from .repo_linter import RepoLinter
+
+Linter = Union[NotebookLinter, RepoLinter, BatchLinter]
+
+
+class Renderer(ABC):
+    """Writes the results of a linter to a console."""
+
+    @abstractmethod
+    def render(self, linter: Linter, console: Console) -> None:
+        pass
+
+
+def _print_lines(console: Console, lines: List[str]) -> None:
+    """Print lines of text as they are (without markup, highlighting or wrapping)."""
+    console.print(
+        "\n".join(lines), markup=False, highlight=False, emoji=False, soft_wrap=True
+    )
+
+
+class RichRenderer(Renderer):
+    """Full report, with statistics, syntax-highlighted cells and Markdown."""
+
+    def render(self, linter: Linter, console: Console) -> None:
+        console.print("\n")
+        console.rule("PYNBLINT", characters="*")
+        console.print(linter)
+
+
+class PlainRenderer(Renderer):
+    """Line-oriented report (one line per finding), suitable for CI logs."""
+
+    @staticmethod
+    def format_finding(finding: Finding) -> str:
+        location = str(finding.path)
+        if finding.cell_index is not None:
+            location += f":cell {finding.cell_index}"
+        return f"{location}: [{finding.slug}] {finding.description}"
+
+    def render(self, linter: Linter, console: Console) -> None:
+        lines: List[str] = [
+            self.format_finding(finding) for finding in linter.findings()
+        ]
+        lines.append(f"Found {len(lines)} linting results.")
+        _print_lines(console, lines)
+
+
+class SummaryRenderer(Renderer):
+    """Report containing the number of findings by rule and by notebook.
+
+    For repositories and batches, the statistics of the corpus are reported too.
+    """
+
+    @staticmethod
+    def format_counts(title: str, counter: Counter) -> Iterable[str]:
+        yield title
+        if counter:
+            width = max(len(str(key)) for key in counter)
+            for key, count in counter.most_common():
+                yield f"  {str(key):<{width}}  {count}"
+        else:
+            yield "  (none)"
+
+    @staticmethod
+    def format_corpus_stats(corpus_stats: CorpusStats) -> Iterable[str]:
+        yield "Corpus statistics:"
+        yield f"  repositories  {corpus_stats.number_of_repositories}"
+        yield f"  notebooks     {corpus_stats.number_of_notebooks}"
+        width = max(len(name) for name in corpus_stats.distributions)
+        for name, distribution in corpus_stats.distributions.items():
+            if not distribution.count:
+                continue
+            quantiles = distribution.as_dict()["quantiles"]
+            summary = [f"mean={distribution.mean:.2f}"]
+            summary.extend(f"{label}={value:.2f}" for label, value in quantiles.items())
+            summary.append(f"max={distribution.maximum:g}")
+            yield f"  {name:<{width}}  {' '.join(summary)}"
+
+    def render(self, linter: Linter, console: Console) -> None:
+        by_slug: Counter = Counter()
+        by_notebook: Counter = Counter()
+        for finding in linter.findings():
+            by_slug[finding.slug] += 1
+            if finding.level in (LintLevel.NOTEBOOK, LintLevel.CELL):
+                by_notebook[finding.path] += 1
+
+        lines: List[str] = []
+        lines.extend(self.format_counts("Linting results by rule:", by_slug))
+        lines.extend(self.format_counts("Linting results by notebook:", by_notebook))
+        if isinstance(linter, (RepoLinter, BatchLinter)) and not settings.hide_stats:
+            lines.extend(self.format_corpus_stats(linter.corpus_stats))
+        lines.append(
+            f"Found {sum(by_slug.values())} linting results "
+            f"in {len(by_notebook)} notebooks."
+        )
+        _print_lines(console, lines)
+
+
+def get_renderer(report_format: ReportFormat) -> Renderer:
+    """Return the renderer associated with the given report format."""
+    if report_format == ReportFormat.PLAIN:
+        return PlainRenderer()
+    elif report_format == ReportFormat.SUMMARY:
+        return SummaryRenderer()
+    return RichRenderer()
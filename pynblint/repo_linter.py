@@ -1,18 +1,36 @@
 import dataclasses
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from rich.columns import Columns
 from rich.console import Console, ConsoleOptions, RenderResult, group
 from rich.panel import Panel
 from rich.rule import Rule
 
+from . import metrics
+from .baseline import Baseline, fingerprint, relative_location
 from .config import settings
 from .core_models import Repository
-from .lint import PathLevelLint, ProjectLevelLint, RepoLint
-from .lint_register import enabled_path_level_lints, enabled_project_level_lints
+from .corpus_stats import CorpusStats
+from .lint import (
+    Finding,
+    LintCost,
+    LintDefinition,
+    LintLevel,
+    PathLevelLint,
+    ProjectLevelLint,
+    RepoLint,
+    ViolationBudget,
+)
 from .nb_linter import NotebookLinter
+from .session import get_session
+from .sharding import recorded_settings, shard_paths
+from .workers import WorkerPool
+
+# Classes of the lints evaluated on repositories
+RepoLintClass = Union[Type[ProjectLevelLint], Type[PathLevelLint]]
 
 
 @dataclass
@@ -26,52 +44,214 @@ class RepositoryStats:
 
 
 class RepoLinter:
-    def __init__(self, repo: Repository) -> None:
+    def __init__(
+        self,
+        repo: Repository,
+        pool: Optional[WorkerPool] = None,
+        notebook_linters: Optional[List[NotebookLinter]] = None,
+        budget: Optional[ViolationBudget] = None,
+    ) -> None:
+        """Lint a repository and the notebooks it contains.
+
+        Args:
+            repo (Repository): the repository to be analyzed.
+            pool (Optional[WorkerPool]): the pool used to lint notebooks;
+                if ``None``, notebooks are linted in the current process.
+            notebook_linters (Optional[List[NotebookLinter]]): the results of
+                notebooks already linted by the caller (in the order of
+                ``repo.notebook_paths``).
+            budget (Optional[ViolationBudget]): the violation budget, possibly
+                shared with other linters. Defaults to the budget set in the
+                settings, if any. With a budget, lints are evaluated from the
+                cheapest (first those that only need paths, across the whole
+                repository), in the current process, until the budget is
+                exhausted; notebooks are read only if their content is needed.
+
+        With ``settings.shard``, only the notebooks of the shard are linted, and
+        the data of path-level lints needing every notebook (see
+        ``LintDefinition.shard_data_function``) is recorded for merging the
+        shards (``pynblint --merge``).
+        """
         self.repo = repo
         self.repository_metadata: RepositoryMetadata = RepositoryMetadata(
             repository_name=repo.path.name or Path.cwd().name
         )
         self.repository_stats: RepositoryStats = RepositoryStats(
-            number_of_notebooks=len(repo.notebooks)
+            number_of_notebooks=len(repo.notebook_paths)
         )
-
-        self.lints: List[RepoLint] = []
-
-        self.lints.extend(
-            [
-                ProjectLevelLint(
-                    lint.slug,
-                    lint.description,
-                    lint.recommendation,
-                    lint.linting_function,
-                    self.repo,
-                )
-                for lint in enabled_project_level_lints
-            ]
+        self.budget: Optional[ViolationBudget] = (
+            budget if budget is not None else ViolationBudget.from_settings()
         )
+        self.shard: Optional[Tuple[int, int]] = settings.shard
+        self.notebook_paths: List[Path] = (
+            shard_paths(repo, self.shard) if self.shard else repo.notebook_paths
+        )
+        self.shard_data: Dict[str, Dict[str, Any]] = {}
 
-        self.lints.extend(
+        session = get_session()
+        lint_defs: List[Tuple[LintDefinition, RepoLintClass]] = [
+            (lint, ProjectLevelLint) for lint in session.project_level_lints
+        ] + [(lint, PathLevelLint) for lint in session.path_level_lints]
+        self._pending_lints: List[Tuple[int, LintDefinition, RepoLintClass]] = sorted(
             [
-                PathLevelLint(
-                    lint.slug,
-                    lint.description,
-                    lint.recommendation,
-                    lint.linting_function,
-                    self.repo,
-                )
-                for lint in enabled_path_level_lints
-            ]
+                (position, lint, lint_class)
+                for position, (lint, lint_class) in enumerate(lint_defs)
+            ],
+            key=lambda pending_lint: pending_lint[1].cost,
         )
+        self._evaluated_lints: Dict[int, RepoLint] = {}
+        self.lints: List[RepoLint] = []
+
+        if self.budget is None:
+            if notebook_linters is None:
+                with metrics.stage("notebook_linting"):
+                    notebook_linters = (pool or WorkerPool()).lint_notebooks(
+                        self.notebook_paths, sizes=self.repo.notebook_sizes
+                    )
+            # Repository lints comparing notebooks reuse their signatures
+            for nb_linter in notebook_linters:
+                if nb_linter.minhash_signature is not None:
+                    self.repo.linted_signatures[nb_linter.notebook.path] = (
+                        nb_linter.minhash_signature
+                    )
+            self._lint_repository(LintCost.CONTENT)
+        else:
+            # Cheapest lints first, so that the budget may be exhausted
+            # before reading any file
+            self._lint_repository(LintCost.PATH)
+            with metrics.stage("notebook_linting"):
+                if notebook_linters is None:
+                    notebook_linters = [
+                        NotebookLinter(
+                            notebook, budget=self.budget, max_cost=LintCost.PATH
+                        )
+                        for notebook in (
+                            map(self.repo.load_notebook, self.notebook_paths)
+                            if self.shard
+                            else self.repo.notebooks
+                        )
+                    ]
+            self._lint_repository(LintCost.CONTENT)
+            with metrics.stage("notebook_linting"):
+                for nb_linter in notebook_linters:
+                    nb_linter.resume()
 
         self.has_linting_results = any([lint.result for lint in self.lints])
+        if self.repo.scan_snapshot is not None:
+            self.repo.scan_snapshot.save()
+
+        # Notebooks linted by worker processes are detached from the repository
+        for nb_linter in notebook_linters:
+            nb_linter.notebook.repository = self.repo
+        self.repo.notebooks = [nb_linter.notebook for nb_linter in notebook_linters]
+        self.notebook_linters: List[NotebookLinter] = notebook_linters
+
+        self.has_notebook_level_linting_results = any(
+            [linter.has_linting_results for linter in self.notebook_linters]
+        )
 
-        self.notebook_linters = [
-            NotebookLinter(notebook) for notebook in self.repo.notebooks
+    def _lint_repository(self, max_cost: LintCost) -> None:
+        """Evaluate the pending repository lints up to ``max_cost``."""
+        with metrics.stage("repository_linting"):
+            self._evaluate_lints(max_cost)
+        self.lints = [
+            self._evaluated_lints[position]
+            for position in sorted(self._evaluated_lints)
         ]
 
+    def _evaluate_lints(self, max_cost: LintCost) -> None:
+        while self._pending_lints and self._pending_lints[0][1].cost <= max_cost:
+            if self.budget is not None and self.budget.exhausted:
+                break
+            position, lint, lint_class = self._pending_lints.pop(0)
+            linting_function = lint.linting_function
+            if self.shard and lint.shard_data_function is not None:
+                linting_function = self._shard_linting_function(lint)
+            elif (
+                lint_class is ProjectLevelLint
+                and lint.cost == LintCost.PATH
+                and self.repo.scan_snapshot is not None
+            ):
+                linting_function = self._snapshot_linting_function(lint)
+            evaluated_lint = lint_class(
+                lint.slug,
+                lint.description,
+                lint.recommendation,
+                linting_function,
+                self.repo,
+            )
+            if self.budget is not None:
+                self.budget.spend(evaluated_lint.result)
+            self._evaluated_lints[position] = evaluated_lint
+
+    def _snapshot_linting_function(self, lint: LintDefinition):
+        """Return a linting function reusing the result of the previous scan.
+
+        Project-level lints only needing paths are not evaluated again while the
+        directory tree of the repository is unchanged.
+        """
+        assert self.repo.scan_snapshot is not None
+        scan_snapshot = self.repo.scan_snapshot
+        key = f"{lint.slug}:{get_session().fingerprint}"
+        return lambda repo: scan_snapshot.lint_result(
+            key, lambda: lint.linting_function(repo)
+        )
+
+    def _shard_linting_function(self, lint: LintDefinition):
+        """Return a linting function limited to the notebooks of the shard.
+
+        The data of the shard notebooks is recorded, so that the lint can be
+        evaluated on the whole repository when merging the shard results.
+        """
+        assert lint.shard_data_function is not None and lint.merge_function is not None
+        merge_function = lint.merge_function
+        data = lint.shard_data_function(self.repo, self.notebook_paths)
+        self.shard_data[lint.slug] = data
+        return lambda repo: [repo.path / path for path in merge_function(data)]
+
+    def apply_baseline(self, baseline: Baseline, scope: str = "") -> None:
+        """Drop the findings known to the baseline from the linting results.
+
+        Findings are located relative to the repository root, so a baseline
+        remains valid wherever the repository is checked out.
+
+        Args:
+            baseline (Baseline): the known findings.
+            scope (str): the target of the repository in a multi-target run.
+        """
+        for lint in self.lints:
+            if isinstance(lint, PathLevelLint):
+                lint.result = [
+                    path
+                    for path in lint.result
+                    if not baseline.suppresses(
+                        fingerprint(
+                            lint.slug, scope, relative_location(path, self.repo.path)
+                        )
+                    )
+                ]
+            elif lint.result and baseline.suppresses(fingerprint(lint.slug, scope, "")):
+                lint.result = False
+        for nb_linter in self.notebook_linters:
+            nb_linter.apply_baseline(
+                baseline,
+                scope,
+                relative_location(nb_linter.notebook.path, self.repo.path),
+            )
+
+        self.has_linting_results = any([lint.result for lint in self.lints])
         self.has_notebook_level_linting_results = any(
             [linter.has_linting_results for linter in self.notebook_linters]
         )
+        for cached in ("notebook_corpus_stats", "corpus_stats"):
+            self.__dict__.pop(cached, None)
+
+    @property
+    def complete(self) -> bool:
+        """Whether all the enabled lints have been evaluated on every notebook."""
+        return not self._pending_lints and all(
+            nb_linter.complete for nb_linter in self.notebook_linters
+        )
 
     @group()
     def get_renderable_linting_results(self):
@@ -79,15 +259,62 @@ class RepoLinter:
             if lint.result:
                 yield lint
 
+    def findings(self) -> Iterator[Finding]:
+        """Iterate over the linting results of the repository and its notebooks."""
+        for lint in self.lints:
+            if isinstance(lint, PathLevelLint):
+                for path in lint.result:
+                    yield Finding(lint.slug, LintLevel.PATH, lint.description, path)
+            elif lint.result:
+                yield Finding(
+                    lint.slug, LintLevel.PROJECT, lint.description, self.repo.path
+                )
+        for nb_linter in self.notebook_linters:
+            yield from nb_linter.findings()
+
+    @cached_property
+    def notebook_corpus_stats(self) -> CorpusStats:
+        """The statistics of the repository notebooks."""
+        return CorpusStats.merged(
+            nb_linter.corpus_stats for nb_linter in self.notebook_linters
+        )
+
+    @cached_property
+    def corpus_stats(self) -> CorpusStats:
+        """The statistics of the repository notebooks and of the repository lints."""
+        corpus_stats = CorpusStats.merged([self.notebook_corpus_stats])
+        corpus_stats.number_of_repositories = 1
+        corpus_stats.violations_per_slug.update(
+            finding.slug
+            for finding in self.findings()
+            if finding.level in (LintLevel.PATH, LintLevel.PROJECT)
+        )
+        return corpus_stats
+
     def as_dict(self) -> Dict:
         results_dict = {
             "repository_metadata": dataclasses.asdict(self.repository_metadata),
             "repository_stats": dataclasses.asdict(self.repository_stats),
+            "corpus_stats": self.corpus_stats.as_dict(),
             "lints": [lint.as_dict() for lint in self.lints if lint.result],
             "notebook_level_lints": [
                 nb_linter.as_dict() for nb_linter in self.notebook_linters
             ],
         }
+        if self.shard:
+            index, count = self.shard
+            results_dict["shard"] = {
+                "index": index,
+                "count": count,
+                "settings": recorded_settings(get_session().settings),
+                "repository_path": str(self.repo.path),
+                "notebooks": [
+                    path.relative_to(self.repo.path).as_posix()
+                    for path in self.notebook_paths
+                ],
+                "data": self.shard_data,
+                "notebook_corpus_stats": self.notebook_corpus_stats.as_dict(),
+            }
         return results_dict
 
     @group()
@@ -1,11 +1,15 @@
 """Linting functions for repositories containing notebooks"""
 
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Mapping, Sequence
 
+from . import git_utils
 from . import lint_register as register
+from . import minhash
+from .config import settings
 from .core_models import Repository
-from .lint import LintDefinition, LintLevel
+from .git_utils import DEPENDENCY_MANIFESTS
+from .lint import LintCost, LintDefinition, LintLevel
 
 # ============= #
 # PROJECT LEVEL #
@@ -24,15 +28,7 @@ def dependencies_unmanaged(repo: Repository) -> bool:
     All configuration files are searched in the root of the repository.
     """
 
-    paths = [
-        repo.path / "requirements.txt",
-        repo.path / "pyproject.toml",
-        repo.path / "environment.yml",
-        repo.path / "setup.py",
-        repo.path / "Pipfile",
-    ]
-
-    return not any(map(lambda x: x.exists(), paths))
+    return not any(repo.has_file(manifest) for manifest in DEPENDENCY_MANIFESTS)
 
 
 def coverage_data_not_available(repo: Repository) -> bool:
@@ -42,8 +38,7 @@ def coverage_data_not_available(repo: Repository) -> bool:
     might be not tested.
     """
 
-    path = repo.path / ".coverage"
-    return not path.exists()
+    return not repo.has_file(".coverage")
 
 
 # ========== #
@@ -54,20 +49,66 @@ def coverage_data_not_available(repo: Repository) -> bool:
 def duplicate_notebook_filename(repo: Repository) -> List[Path]:
     """Check the existence of notebooks with the same filename within a repository"""
 
-    nb_filenames = []
-    duplicate_filanames = []
-    paths = []
-    for notebook in repo.notebooks:
-        filename = notebook.path.name
-        if filename in nb_filenames:
-            duplicate_filanames.append(filename)
-        else:
-            nb_filenames.append(filename)
-    for filename in duplicate_filanames:
-        for notebook in repo.notebooks:
-            if notebook.path.name == filename:
-                paths.append(notebook.path)
-    return paths
+    return [
+        notebook_path
+        for notebook_paths in repo.notebooks_by_name.values()
+        if len(notebook_paths) > 1
+        for notebook_path in notebook_paths
+    ]
+
+
+def near_duplicate_notebooks(repo: Repository) -> List[Path]:
+    """Check the existence of near-duplicate notebooks within a repository.
+
+    Notebooks are near-duplicates (e.g., copies forked with small edits) when
+    the estimated Jaccard similarity of the shingles of their code and Markdown
+    sources is at least ``settings.near_duplicate_threshold``. Similarity is
+    estimated from MinHash signatures of ``settings.minhash_signature_size`` bins,
+    and candidate pairs are found with locality-sensitive hashing.
+    """
+
+    signatures = notebook_signatures(repo, repo.notebook_paths)
+    return [repo.path / path for path in merge_near_duplicates(signatures)]
+
+
+def notebook_signatures(
+    repo: Repository, notebook_paths: List[Path]
+) -> Dict[str, List[int]]:
+    """Return the MinHash signatures of the given notebooks, by relative path.
+
+    The signatures computed while linting the notebooks are reused; only the
+    notebooks not linted yet are read. Notebooks without tokens are skipped.
+    """
+
+    signatures: Dict[str, List[int]] = {}
+    for path in notebook_paths:
+        signature = repo.linted_signatures.get(path)
+        if signature is None:
+            signature = repo.load_notebook(path).minhash_signature(
+                settings.minhash_signature_size
+            )
+        if signature:
+            signatures[path.relative_to(repo.path).as_posix()] = signature
+    return signatures
+
+
+def merge_near_duplicates(signatures: Mapping[str, Sequence[int]]) -> List[str]:
+    """Return the relative paths of the near-duplicate notebooks, by signature."""
+
+    groups = minhash.near_duplicate_groups(
+        {path: tuple(signature) for path, signature in signatures.items()},
+        settings.near_duplicate_threshold,
+    )
+    return [path for group in groups for path in group]
+
+
+def _tracked_by_dvc(repo: Repository, path: Path) -> bool:
+    """Check whether a DVC pointer file exists for ``path`` or one of its parents."""
+    relative_path = path.relative_to(repo.path)
+    for tracked_path in [relative_path, *list(relative_path.parents)[:-1]]:
+        if repo.has_file(str(tracked_path.with_name(tracked_path.name + ".dvc"))):
+            return True
+    return False
 
 
 def unversioned_large_data_files(repo: Repository) -> List[Path]:
@@ -78,6 +119,12 @@ def unversioned_large_data_files(repo: Repository) -> List[Path]:
     Currently, the only data VCS that Pynblint detects is DVC (https://dvc.org).
     Alternative solutions will be added soon.
 
+    In git repositories, files ignored by git (as DVC does with the data it tracks)
+    are not considered; moreover, files with a DVC pointer file (``<name>.dvc``)
+    for themselves or one of their parent directories are deemed versioned.
+    In other repositories, the mere presence of a ``.dvc`` directory is taken as
+    evidence that data files are versioned.
+
     Args:
         repo (Repository): The repository to be analyzed.
 
@@ -86,11 +133,10 @@ def unversioned_large_data_files(repo: Repository) -> List[Path]:
         version control.
     """
 
-    large_files = repo.large_file_paths
-    if large_files and not Path(repo.path, ".dvc").is_dir():
-        return large_files
-    else:
+    not_git_work_tree = git_utils.open_work_tree(repo.path) is None
+    if not_git_work_tree and Path(repo.path, ".dvc").is_dir():
         return []
+    return [path for path in repo.large_file_paths if not _tracked_by_dvc(repo, path)]
 
 
 # ================= #
@@ -104,6 +150,7 @@ project_level_lints: List[LintDefinition] = [
         description="This repository is not version controlled.",
         recommendation="Put the repository under version control using a VCS like git.",
         linting_function=repository_not_versioned,
+        cost=LintCost.PATH,
     ),
     LintDefinition(
         slug="dependencies-unmanaged",
@@ -112,6 +159,7 @@ project_level_lints: List[LintDefinition] = [
         "`requirements.txt` file.\nYou can do so by running the following command: "
         "`pip freeze > requirements.txt`.",
         linting_function=dependencies_unmanaged,
+        cost=LintCost.PATH,
     ),
     LintDefinition(
         slug="test-coverage-data-not-available",
@@ -121,6 +169,7 @@ project_level_lints: List[LintDefinition] = [
         "If the testing framework that you are using does not produce a `.coverage` "
         "data file, please ignore this warning.",
         linting_function=coverage_data_not_available,
+        cost=LintCost.PATH,
     ),
 ]
 
@@ -132,6 +181,18 @@ path_level_lints: List[LintDefinition] = [
         recommendation="Use different filenames to make notebooks easy to recognize; "
         "possibly stick to a naming convention.",
         linting_function=duplicate_notebook_filename,
+        cost=LintCost.PATH,
+    ),
+    LintDefinition(
+        slug="near-duplicate-notebooks",
+        description="Two or more notebooks in this repository are near-duplicates "
+        "(i.e., copies of the same notebook with small edits).",
+        recommendation="Remove outdated copies and keep track of variants with "
+        "version control; move the code shared by notebooks into Python modules.",
+        linting_function=near_duplicate_notebooks,
+        uses_signatures=True,
+        shard_data_function=notebook_signatures,
+        merge_function=merge_near_duplicates,
     ),
     LintDefinition(
         slug="large-data-file-not-versioned",
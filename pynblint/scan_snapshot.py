@@ -0,0 +1,255 @@
+"""Snapshots of the directory tree of a repository, reused across runs.
+
+A snapshot records the modification time, the subdirectories and the files
+(with their size) of every directory of a repository. When a repository is
+scanned again, the directories whose modification time has not changed are
+not listed again (a directory changes when entries are added, removed or
+renamed, not when the content of its files changes, so the recorded file sizes
+may be outdated and are not used for size thresholds). Each directory is
+therefore stat-ed, but only the changed ones are listed.
+
+Snapshots also record the results of the project-level lints that only depend
+on the paths of the repository files (``LintCost.PATH``), which are reused as
+long as the directory tree is unchanged.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from . import __version__
+
+# Directory of the snapshots within the cache directory
+SNAPSHOT_DIRNAME = "scan_snapshots"
+
+# Directories modified less than this before they are listed may be modified
+# again within the resolution of their modification time: they are not reused
+RACY_NANOSECONDS = 2 * 10**9
+
+# Directories whose notebooks are ignored (e.g., Jupyter autosaves)
+IGNORED_NOTEBOOK_DIRS = {".ipynb_checkpoints"}
+
+
+@dataclass
+class DirectoryEntry:
+    # Modification time when listed (``None`` if the listing cannot be reused)
+    mtime_ns: Optional[int]
+    dirs: List[str] = field(default_factory=list)
+    files: Dict[str, int] = field(default_factory=dict)  # Sizes, by filename
+
+    def as_dict(self) -> Dict:
+        return {"mtime_ns": self.mtime_ns, "dirs": self.dirs, "files": self.files}
+
+    @classmethod
+    def from_dict(cls, entry_dict: Dict) -> "DirectoryEntry":
+        return cls(entry_dict["mtime_ns"], entry_dict["dirs"], entry_dict["files"])
+
+
+def list_directory(path: Path, mtime_ns: int, scan_start_ns: int) -> DirectoryEntry:
+    """List the subdirectories and the files of a directory.
+
+    Symbolic links to directories are not followed.
+    """
+    entry = DirectoryEntry(
+        mtime_ns if mtime_ns < scan_start_ns - RACY_NANOSECONDS else None
+    )
+    with os.scandir(path) as dir_entries:
+        for dir_entry in dir_entries:
+            try:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    entry.dirs.append(dir_entry.name)
+                elif dir_entry.is_file():
+                    entry.files[dir_entry.name] = dir_entry.stat().st_size
+            except OSError:
+                # E.g., broken symbolic links
+                continue
+    entry.dirs.sort()
+    entry.files = dict(sorted(entry.files.items()))
+    return entry
+
+
+def _join(directory: str, name: str) -> str:
+    return f"{directory}/{name}" if directory else name
+
+
+class ScanSnapshot:
+    """The scan of the directory tree of a repository.
+
+    Args:
+        root (Path): the root directory of the repository.
+        path (Optional[Path]): the file of the snapshot of the previous scan,
+            reused and then updated; if ``None``, the whole tree is listed.
+    """
+
+    def __init__(self, root: Path, path: Optional[Path] = None) -> None:
+        self.root: Path = root
+        self.path: Optional[Path] = path
+        self.directories: Dict[str, DirectoryEntry] = {}  # By relative POSIX path
+        self.listed_directories: int = 0
+        self.reused_directories: int = 0
+        self._listed: Set[str] = set()  # The directories listed by this scan
+        self._lint_results: Dict[str, Dict[str, Any]] = {}
+        self._modified: bool = False
+
+        previous: Dict[str, DirectoryEntry] = {}
+        if self.path is not None and self.path.is_file():
+            previous = self._load()
+        self._scan(previous)
+        self.digest: str = self._tree_digest()
+
+    @classmethod
+    def in_cache(cls, root: Path, cache_dir: Path) -> "ScanSnapshot":
+        """Scan ``root``, reusing (and updating) its snapshot in ``cache_dir``."""
+        key = hashlib.blake2b(
+            str(root.resolve()).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return cls(root, cache_dir / SNAPSHOT_DIRNAME / f"{key}.json")
+
+    def _scan(self, previous: Dict[str, DirectoryEntry]) -> None:
+        scan_start_ns = time.time_ns()
+        pending = [""]
+        while pending:
+            directory = pending.pop()
+            dir_path = self.root / directory
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+                entry = previous.get(directory)
+                if entry is None or entry.mtime_ns != mtime_ns:
+                    entry = list_directory(dir_path, mtime_ns, scan_start_ns)
+                    self.listed_directories += 1
+                    self._listed.add(directory)
+                    self._modified = True
+                else:
+                    self.reused_directories += 1
+            except OSError:
+                # The directory has been removed (or cannot be read)
+                continue
+            self.directories[directory] = entry
+            # Git internals are never scanned
+            pending.extend(_join(directory, d) for d in entry.dirs if d != ".git")
+        if set(previous) - set(self.directories):
+            self._modified = True
+        self.directories = dict(sorted(self.directories.items()))
+
+    def _tree_digest(self) -> str:
+        content = json.dumps(
+            {
+                directory: [entry.dirs, entry.files]
+                for directory, entry in self.directories.items()
+            }
+        )
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _ignores_notebooks(directory: str) -> bool:
+        return any(part in IGNORED_NOTEBOOK_DIRS for part in directory.split("/"))
+
+    @property
+    def notebook_paths(self) -> List[Path]:
+        """The paths of the notebooks (outside checkpoint directories)."""
+        return sorted(
+            self.root / _join(directory, filename)
+            for directory, entry in self.directories.items()
+            if not self._ignores_notebooks(directory)
+            for filename in entry.files
+            if filename.endswith(".ipynb")
+        )
+
+    @property
+    def file_paths(self) -> List[Path]:
+        """The relative paths of the repository files."""
+        return [
+            Path(_join(directory, filename))
+            for directory, entry in self.directories.items()
+            for filename in entry.files
+        ]
+
+    @property
+    def listed_file_sizes(self) -> Dict[Path, int]:
+        """The size of the files in the directories listed by this scan.
+
+        The files of reused directories are missing, as their recorded size may be
+        outdated.
+        """
+        return {
+            Path(_join(directory, filename)): size
+            for directory in self._listed
+            for filename, size in self.directories[directory].files.items()
+        }
+
+    @property
+    def has_git_directory(self) -> bool:
+        """Whether a ``.git`` directory exists (outside checkpoint directories)."""
+        return any(
+            ".git" in entry.dirs
+            for directory, entry in self.directories.items()
+            if not self._ignores_notebooks(directory)
+        )
+
+    def has_file(self, relative_path: str) -> bool:
+        """Whether a file exists at ``relative_path``."""
+        directory, _, filename = Path(relative_path).as_posix().rpartition("/")
+        entry = self.directories.get(directory)
+        return entry is not None and filename in entry.files
+
+    def lint_result(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the result of a lint only depending on the paths of the files.
+
+        The result of the previous scan is reused if the tree is unchanged.
+
+        Args:
+            key (str): the identifier of the lint (and of its settings).
+            compute (Callable[[], Any]): computes the (JSON-serializable) result.
+        """
+        previous = self._lint_results.get(key)
+        if previous is not None and previous["digest"] == self.digest:
+            return previous["result"]
+        result = compute()
+        self._lint_results[key] = {"digest": self.digest, "result": result}
+        self._modified = True
+        return result
+
+    def _load(self) -> Dict[str, DirectoryEntry]:
+        assert self.path is not None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupted snapshot is simply discarded
+            return {}
+        if data.get("version") != __version__ or data.get("root") != str(self.root):
+            return {}
+        self._lint_results = data["lint_results"]
+        return {
+            directory: DirectoryEntry.from_dict(entry_dict)
+            for directory, entry_dict in data["directories"].items()
+        }
+
+    def save(self) -> None:
+        """Write the snapshot to its file (atomically), if it has been modified."""
+        if self.path is None or not self._modified:
+            return
+        data = {
+            "version": __version__,
+            "root": str(self.root),
+            "directories": {
+                directory: entry.as_dict()
+                for directory, entry in self.directories.items()
+            },
+            "lint_results": self._lint_results,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The tree will be listed again in the next run
+            return
+        self._modified = False
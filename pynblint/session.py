@@ -0,0 +1,221 @@
+"""Lint sessions: the settings and the lints of an analysis.
+
+A ``LintSession`` is immutable once built, so it can be shared across threads and
+shipped (pickled) to worker processes; sessions with different configurations
+can be used concurrently within the same process. The session used by linters
+is the one activated in the current thread (or task); if none is active, a
+session is built from the global settings.
+"""
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import __version__, config, lint_register, loader, plugins
+from .config import FrozenSettings, Settings
+from .lint import LintDefinition, LintLevel
+from .notebook_stats import StatDefinition
+
+# Settings that do not affect linting results
+OUTPUT_SETTINGS = {
+    "hide_stats",
+    "hide_recommendations",
+    "cell_rendering_mode",
+    "report_format",
+    "result_details_indentation",
+    "display_cell_index",
+    "partial_fetch",
+    "mirror_cache_dir",
+    "mirror_cache_size",
+    "jobs",
+    "cache_dir",
+    "max_memory",
+    "read_ahead",
+    "io_threads",
+    "shard",
+}
+
+_active_session: ContextVar[Optional["LintSession"]] = ContextVar(
+    "active_session", default=None
+)
+
+# Session built from the global settings, with the state it was built from
+_default_session: Optional["LintSession"] = None
+_default_session_key: Optional[Tuple[int, int]] = None
+
+
+@dataclass(frozen=True)
+class LintSession:
+    """The settings of an analysis and the lints it enables (core and plugin lints).
+
+    Use ``LintSession.build()`` to create a session. Sessions are immutable,
+    including their settings (see ``FrozenSettings``).
+    """
+
+    settings: Settings
+    cell_level_lints: Tuple[LintDefinition, ...]
+    notebook_level_lints: Tuple[LintDefinition, ...]
+    path_level_lints: Tuple[LintDefinition, ...]
+    project_level_lints: Tuple[LintDefinition, ...]
+    notebook_stats: Tuple[StatDefinition, ...] = ()
+
+    @classmethod
+    def build(cls, settings: Optional[Settings] = None, **overrides) -> "LintSession":
+        """Build a session.
+
+        Args:
+            settings (Optional[Settings]): the settings of the session;
+                defaults to a snapshot of the global settings.
+            **overrides: values replacing those of the given settings
+                (e.g., ``max_cells_in_notebook=100``).
+
+        Returns:
+            LintSession: a session enabling the core lints and the lints of the
+            plugins (installed or listed in the settings), filtered based on the
+            settings ``include`` and ``exclude``, and collecting the statistics
+            of the same plugins.
+        """
+        base_settings = settings if settings is not None else config.global_settings
+        session_settings = FrozenSettings.model_validate(
+            {**base_settings.model_dump(), **overrides}
+        )
+
+        lints: Dict[LintLevel, List[LintDefinition]] = {
+            lint_level: [] for lint_level in LintLevel
+        }
+        # Installed plugins are loaded only if some of their lints are enabled
+        modules = list(
+            dict.fromkeys(
+                loader.CORE_MODULES
+                + list(session_settings.plugins)
+                + plugins.enabled_plugins(session_settings)
+            )
+        )
+        for module_lints in [loader.module_lints(name) for name in modules] + [
+            lint_register.unscoped_lints
+        ]:
+            for lint_level, lint_defs in module_lints.items():
+                lints[lint_level].extend(
+                    lint for lint in lint_defs if lint not in lints[lint_level]
+                )
+
+        for lint_level, lint_defs in lints.items():
+            if session_settings.exclude:
+                lints[lint_level] = lint_register.exclude_lints(
+                    lint_defs, session_settings.exclude
+                )
+            elif session_settings.include:
+                lints[lint_level] = lint_register.include_lints(
+                    lint_defs, session_settings.include
+                )
+
+        stat_defs: List[StatDefinition] = []
+        for module_stats in [loader.module_stats(name) for name in modules] + [
+            lint_register.unscoped_stats
+        ]:
+            stat_defs.extend(
+                stat_def for stat_def in module_stats if stat_def not in stat_defs
+            )
+
+        return cls(
+            settings=session_settings,
+            cell_level_lints=tuple(lints[LintLevel.CELL]),
+            notebook_level_lints=tuple(lints[LintLevel.NOTEBOOK]),
+            path_level_lints=tuple(lints[LintLevel.PATH]),
+            project_level_lints=tuple(lints[LintLevel.PROJECT]),
+            notebook_stats=tuple(stat_defs),
+        )
+
+    def lints(self, lint_level: LintLevel) -> List[LintDefinition]:
+        """Return the enabled lints of the given level."""
+        if lint_level == LintLevel.CELL:
+            return list(self.cell_level_lints)
+        elif lint_level == LintLevel.NOTEBOOK:
+            return list(self.notebook_level_lints)
+        elif lint_level == LintLevel.PATH:
+            return list(self.path_level_lints)
+        return list(self.project_level_lints)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """A digest of the linting settings, of the enabled lints and statistics.
+
+        Results computed under a different fingerprint may differ from the results
+        of this session, and therefore must not be reused.
+        """
+        enabled_slugs = [
+            lint.slug
+            for lint in (
+                self.cell_level_lints
+                + self.notebook_level_lints
+                + self.path_level_lints
+                + self.project_level_lints
+            )
+        ]
+        content = "\0".join(
+            [
+                __version__,
+                self.settings.model_dump_json(exclude=OUTPUT_SETTINGS),
+                *enabled_slugs,
+                *[stat_def.name for stat_def in self.notebook_stats],
+            ]
+        )
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    @contextmanager
+    def activate(self) -> Iterator["LintSession"]:
+        """Make this the session of the current thread (or task) within the context.
+
+        Linters and linting functions use the settings and lints of the active
+        session, so sessions activated in different threads do not interfere.
+        """
+        session_token = _active_session.set(self)
+        settings_token = config.active_settings.set(self.settings)
+        try:
+            yield self
+        finally:
+            config.active_settings.reset(settings_token)
+            _active_session.reset(session_token)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The fingerprint (if computed) is not shipped to worker processes
+        state = dict(self.__dict__)
+        state.pop("fingerprint", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+
+def set_process_session(session: LintSession) -> None:
+    """Make ``session`` the active session of the current context for good.
+
+    Intended for worker processes, which only ever use the session of the pool.
+    """
+    _active_session.set(session)
+    config.active_settings.set(session.settings)
+
+
+def get_session() -> LintSession:
+    """Return the active session or, if none is active, the default session.
+
+    The default session is built from the global settings (and rebuilt whenever
+    they are modified through ``config.settings``).
+    """
+    global _default_session, _default_session_key
+
+    session = _active_session.get()
+    if session is not None:
+        return session
+
+    key = (
+        config.global_settings_version,
+        lint_register.unscoped_lints_version,
+    )
+    if _default_session is None or _default_session_key != key:
+        _default_session = LintSession.build()
+        _default_session_key = key
+    return _default_session
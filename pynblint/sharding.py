@@ -0,0 +1,165 @@
+"""Sharded runs: the analysis of a repository split across several machines.
+
+With ``--shard i/N``, a run lints only the notebooks assigned to shard ``i``
+(based on a stable hash of their path relative to the repository root). Lints
+that only need paths (e.g., ``duplicate-notebook-filename``) are evaluated by
+every shard on the whole repository; for path-level lints needing the content
+of every notebook, each shard records the data of its own notebooks instead
+(see ``LintDefinition.shard_data_function``). ``pynblint --merge`` combines
+the JSON outputs of all shards into the output of a single run.
+"""
+
+import hashlib
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Tuple
+
+from .config import Settings
+from .core_models import Repository
+from .corpus_stats import CorpusStats
+from .exceptions import ShardMergeError
+from .session import OUTPUT_SETTINGS, LintSession
+
+# A shard, as (index, count); indexes start from 1
+Shard = Tuple[int, int]
+
+
+def parse_shard(spec: str) -> Shard:
+    """Parse a shard specification (e.g., ``2/8``).
+
+    Raises:
+        ValueError: if the specification is not of the form ``i/N``,
+            with ``1 <= i <= N``.
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}: expected the form i/N (e.g., 2/8).")
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {spec!r}: i must be between 1 and N.")
+    return index, count
+
+
+def shard_of(relative_path: str, count: int) -> int:
+    """Return the shard (out of ``count``) of the notebook at ``relative_path``."""
+    digest = hashlib.blake2b(relative_path.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def shard_paths(repo: Repository, shard: Shard) -> List[Path]:
+    """Return the paths of the repository notebooks assigned to ``shard``."""
+    index, count = shard
+    return [
+        path
+        for path in repo.notebook_paths
+        if shard_of(path.relative_to(repo.path).as_posix(), count) == index
+    ]
+
+
+def recorded_settings(settings: Settings) -> Dict:
+    """Return the settings affecting linting results, as recorded by each shard."""
+    settings_dict = settings.model_dump(mode="json", exclude=OUTPUT_SETTINGS)
+    for name in ("include", "exclude"):
+        if settings_dict[name] is not None:
+            settings_dict[name] = sorted(settings_dict[name])
+    return settings_dict
+
+
+def _sorted_by_path(items: Dict[str, Any]) -> Dict[str, Any]:
+    # Same order as ``Repository.notebook_paths``
+    return dict(sorted(items.items(), key=lambda item: PurePosixPath(item[0])))
+
+
+def merge_shards(shard_results: List[Dict]) -> Dict:
+    """Combine the outputs of the shards of a run into the output of a single run.
+
+    Args:
+        shard_results (List[Dict]): the JSON outputs of all the shards
+            (``RepoLinter.as_dict()`` of runs with ``--shard``), in any order.
+
+    Raises:
+        ShardMergeError: if the outputs are not those of all the shards of the
+            same run (i.e., of the same repository, with the same settings).
+    """
+    try:
+        shards = sorted(
+            (result["shard"] for result in shard_results),
+            key=lambda shard: shard["index"],
+        )
+    except (KeyError, TypeError):
+        raise ShardMergeError("Only the outputs of sharded runs can be merged.")
+    results_by_index = {result["shard"]["index"]: result for result in shard_results}
+    count = shards[0]["count"] if shards else 0
+    if [shard["index"] for shard in shards] != list(range(1, count + 1)) or any(
+        shard["count"] != count for shard in shards
+    ):
+        raise ShardMergeError(
+            "The outputs of all the shards (exactly once each) are needed."
+        )
+    first = shards[0]
+    if any(
+        shard["settings"] != first["settings"]
+        or results_by_index[shard["index"]]["repository_metadata"]
+        != results_by_index[1]["repository_metadata"]
+        for shard in shards
+    ):
+        raise ShardMergeError(
+            "The shards have analyzed different repositories or used different "
+            "settings."
+        )
+
+    # Notebook results, in the order of a single run
+    notebook_results: Dict[str, Dict] = {}
+    for shard in shards:
+        notebook_results.update(
+            zip(
+                shard["notebooks"],
+                results_by_index[shard["index"]]["notebook_level_lints"],
+            )
+        )
+    notebook_results = _sorted_by_path(notebook_results)
+
+    # Repository lints: those evaluated by every shard are taken from the first
+    # (as are the paths reported, as the repository may be at different paths)
+    session = LintSession.build(Settings.model_validate(first["settings"]))
+    first_lints = {lint["slug"]: lint for lint in results_by_index[1]["lints"]}
+    repo_path = Path(first["repository_path"])
+    lints: List[Dict] = []
+    with session.activate():
+        for lint_def in session.project_level_lints + session.path_level_lints:
+            if lint_def.merge_function is None or lint_def.slug not in first["data"]:
+                if lint_def.slug in first_lints:
+                    lints.append(first_lints[lint_def.slug])
+                continue
+            data: Dict[str, Any] = {}
+            for shard in shards:
+                data.update(shard["data"][lint_def.slug])
+            paths = lint_def.merge_function(_sorted_by_path(data))
+            if paths:
+                lints.append(
+                    {
+                        "slug": lint_def.slug,
+                        "description": lint_def.description,
+                        "recommendation": lint_def.recommendation,
+                        "paths": [str(repo_path / path) for path in paths],
+                    }
+                )
+
+    # Corpus statistics: those of the notebooks, plus the repository lints
+    corpus_stats = CorpusStats.merged(
+        CorpusStats.from_dict(shard["notebook_corpus_stats"]) for shard in shards
+    )
+    corpus_stats.number_of_repositories = 1
+    project_slugs = {lint_def.slug for lint_def in session.project_level_lints}
+    for lint in lints:
+        corpus_stats.violations_per_slug[lint["slug"]] += (
+            1 if lint["slug"] in project_slugs else len(lint["paths"])
+        )
+
+    first_result = results_by_index[1]
+    return {
+        "repository_metadata": first_result["repository_metadata"],
+        "repository_stats": first_result["repository_stats"],
+        "corpus_stats": corpus_stats.as_dict(),
+        "lints": lints,
+        "notebook_level_lints": list(notebook_results.values()),
+    }
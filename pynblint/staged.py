@@ -0,0 +1,153 @@
+"""Linting of the notebooks staged in the git index (e.g., from a pre-commit hook).
+
+Staged notebooks are read from the git object database, so that the content being
+committed is linted, regardless of the state of the working tree. Notebook results
+are memoized by blob SHA in the git directory, so that repeated runs on unchanged
+content do not lint the same notebooks again.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import git
+
+from . import metrics
+from .config import settings
+from .core_models import Notebook, Repository
+from .git_utils import GITLINK_MODE
+from .nb_linter import NotebookLinter, NotebookResults
+from .repo_linter import RepoLinter
+from .session import get_session
+
+# Location of the memoized results, relative to the git directory
+MEMO_PATH = Path("pynblint", "staged_results.json")
+
+# Maximum number of notebook results kept in the memo
+MEMO_MAX_ENTRIES = 1000
+
+
+class StagedRepository(Repository):
+    """
+    This class stores data about the content of the git index of a repository.
+
+    File sizes and notebooks are read from the staged blobs; the working tree is
+    never accessed.
+    """
+
+    def __init__(self, path: Path):
+
+        self.git_repo = git.Repo(path, search_parent_directories=True)
+        super().__init__(Path(self.git_repo.working_tree_dir))  # type: ignore
+
+        self.file_sizes = {}
+        self.blob_shas: Dict[Path, str] = {}  # Staged notebook blobs, by path
+        for (relative_path, stage), entry in self.git_repo.index.entries.items():
+            if stage != 0 or entry.mode == GITLINK_MODE:
+                # Skip unmerged entries and submodules
+                continue
+            self.file_sizes[Path(relative_path)] = self.git_repo.odb.info(
+                entry.binsha
+            ).size
+            if str(relative_path).endswith(".ipynb"):
+                notebook_path = self.path / relative_path
+                self.notebook_paths.append(notebook_path)
+                self.blob_shas[notebook_path] = entry.hexsha
+
+    def load_notebook(self, path: Path) -> Notebook:
+        """Read and parse the staged blob of the notebook at ``path``."""
+        blob = self.git_repo.odb.stream(bytes.fromhex(self.blob_shas[path]))
+        return Notebook(path, self, nb_raw=blob.read().decode("utf-8"))
+
+    @property
+    def is_git_repository(self):
+        return True
+
+
+class StagedResultsMemo:
+    """Notebook results memoized by blob SHA (and notebook filename).
+
+    The memo is discarded whenever the settings or the enabled lints change.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self.fingerprint: str = get_session().fingerprint
+        self._results: Dict[str, Dict] = {}
+        self._modified: bool = False
+        if self.path.is_file():
+            self._load()
+
+    @staticmethod
+    def key(blob_sha: str, notebook_path: Path) -> str:
+        # Some lints depend on the notebook filename, besides its content
+        return f"{blob_sha}:{notebook_path.name}"
+
+    def get(self, blob_sha: str, notebook_path: Path) -> Optional[NotebookResults]:
+        results_dict = self._results.pop(self.key(blob_sha, notebook_path), None)
+        if results_dict is None:
+            return None
+        # Re-insert the entry, so that recently used entries are kept on save
+        self._results[self.key(blob_sha, notebook_path)] = results_dict
+        return NotebookResults.from_dict(results_dict)
+
+    def store(
+        self, blob_sha: str, notebook_path: Path, results: NotebookResults
+    ) -> None:
+        self._results[self.key(blob_sha, notebook_path)] = results.as_dict()
+        self._modified = True
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupted memo is simply discarded
+            return
+        if data.get("fingerprint") == self.fingerprint:
+            self._results = data["results"]
+
+    def save(self) -> None:
+        """Write the memo to its file (atomically), if it has been modified."""
+        if not self._modified:
+            return
+        results = list(self._results.items())[-MEMO_MAX_ENTRIES:]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"fingerprint": self.fingerprint, "results": dict(results)}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self._modified = False
+
+
+def lint_staged(path: Path) -> RepoLinter:
+    """Lint the content of the git index of the repository containing ``path``.
+
+    Args:
+        path (Path): a path within the working tree of a git repository.
+
+    Returns:
+        RepoLinter: the results of the analysis of the staged repository content.
+    """
+    repo = StagedRepository(path.parent if path.is_file() else path)
+    if settings.max_violations is not None:
+        # Results truncated by the violation budget are not memoized
+        return RepoLinter(repo)
+
+    memo = StagedResultsMemo(Path(repo.git_repo.git_dir) / MEMO_PATH)
+
+    notebook_linters: List[NotebookLinter] = []
+    with metrics.stage("notebook_linting"):
+        for notebook in repo.notebooks:
+            blob_sha = repo.blob_shas[notebook.path]
+            results = memo.get(blob_sha, notebook.path)
+            nb_linter = NotebookLinter(notebook, results)
+            if results is None:
+                memo.store(blob_sha, notebook.path, nb_linter.results)
+            notebook_linters.append(nb_linter)
+    memo.save()
+
+    return RepoLinter(repo, notebook_linters=notebook_linters)
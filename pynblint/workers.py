@@ -0,0 +1,339 @@
+"""Worker pool shared by all the linters of a pynblint run."""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import cell_facts
+from .core_models import Notebook, content_digest
+from .nb_linter import NotebookLinter
+from .prefetch import IOStats, ReadAhead
+from .session import LintSession, get_session, set_process_session
+
+# Estimated ratio between the memory taken by a parsed notebook and its file size
+NOTEBOOK_MEMORY_FACTOR = 10
+
+# Maximum number of tasks in flight per worker process
+TASKS_PER_WORKER = 4
+
+# Small notebooks are submitted to worker processes in chunks of about this size
+# (in bytes) and of at most this number of notebooks, so that they do not pay the
+# overhead of a task each
+CHUNK_BYTES = 1024 * 1024
+CHUNK_NOTEBOOKS = 16
+
+
+def resident_memory(pid: str = "self") -> int:
+    """Return the resident memory of a process, in bytes (0 if unknown)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def memory_in_use() -> int:
+    """Return the resident memory of the current process and of its workers."""
+    return resident_memory() + sum(
+        resident_memory(str(process.pid))
+        for process in multiprocessing.active_children()
+    )
+
+
+def estimated_notebook_memory(task: Tuple[Path, bytes]) -> int:
+    """Return an estimate of the memory needed to lint a notebook from its content."""
+    return len(task[1]) * NOTEBOOK_MEMORY_FACTOR
+
+
+def chunk_memory(chunk: List[Tuple[Path, bytes]]) -> int:
+    """Return an estimate of the memory needed to lint a chunk of notebooks."""
+    return sum(estimated_notebook_memory(task) for task in chunk)
+
+
+def chunked(
+    tasks: Iterable[Tuple[Path, bytes]],
+    chunk_bytes: int = CHUNK_BYTES,
+    chunk_notebooks: int = CHUNK_NOTEBOOKS,
+) -> Iterator[List[Tuple[Path, bytes]]]:
+    """Group consecutive notebooks into chunks of about ``chunk_bytes``.
+
+    Notebooks larger than ``chunk_bytes`` make up a chunk on their own; chunks
+    contain at most ``chunk_notebooks`` notebooks.
+    """
+    chunk: List[Tuple[Path, bytes]] = []
+    chunk_size = 0
+    for task in tasks:
+        chunk.append(task)
+        chunk_size += len(task[1])
+        if chunk_size >= chunk_bytes or len(chunk) >= chunk_notebooks:
+            yield chunk
+            chunk, chunk_size = [], 0
+    if chunk:
+        yield chunk
+
+
+def _initialize_worker(session: LintSession) -> None:
+    """Use the lint session of the parent process."""
+    set_process_session(session)
+
+
+def lint_notebook_content(
+    task: Tuple[Path, bytes]
+) -> Tuple[NotebookLinter, cell_facts.CacheStats]:
+    """Lint a notebook from the content already read from its file.
+
+    The corpus statistics of the notebook (and its MinHash signature, if needed by
+    repository lints) are computed by the worker as well.
+
+    Returns:
+        Tuple[NotebookLinter, CacheStats]: the linter of the notebook, and the
+        lookups of the cell facts cache made to lint it.
+    """
+    path, content = task
+    cache = cell_facts.get_cache()
+    hits, misses = cache.hits, cache.misses
+    nb_linter = NotebookLinter(Notebook.from_file_content(path, content))
+    nb_linter.corpus_stats
+    return nb_linter, cell_facts.CacheStats(cache.hits - hits, cache.misses - misses)
+
+
+def lint_notebook_chunk(
+    chunk: List[Tuple[Path, bytes]]
+) -> List[Tuple[NotebookLinter, cell_facts.CacheStats]]:
+    """Lint a chunk of notebooks (see ``lint_notebook_content``)."""
+    return [lint_notebook_content(task) for task in chunk]
+
+
+class WorkerPool:
+    """A pool of worker processes linting notebooks.
+
+    With a single job, tasks are executed sequentially in the current process.
+    Workers use the given lint session (by default, the current one).
+
+    Tasks are submitted to worker processes as they are consumed, a few per
+    worker at a time. If the session sets a memory budget (``max_memory``),
+    tasks are submitted only while the memory in use, plus the estimated memory
+    of the tasks in flight, is within the budget (at least one task is always
+    in flight).
+
+    Worker processes lint the largest notebooks first, and the small ones in
+    chunks, so that a run does not end with a worker linting a large notebook
+    while the others idle.
+
+    Notebook files are read ahead by background threads (see ``prefetch``);
+    the I/O metrics of the pool are collected in ``io_stats``, and the lookups
+    of the cell facts caches of the worker processes in ``cache_stats``.
+    """
+
+    def __init__(self, jobs: int = 1, session: Optional[LintSession] = None) -> None:
+        self.jobs: int = jobs
+        self.session: LintSession = session if session is not None else get_session()
+        self.max_memory: Optional[int] = self.session.settings.max_memory
+        self.io_stats: IOStats = IOStats()
+        self.cache_stats: cell_facts.CacheStats = cell_facts.CacheStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if jobs > 1:
+            self._executor = self._start_executor()
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_initialize_worker,
+            initargs=(self.session,),
+        )
+
+    def restart(self) -> None:
+        """Replace the worker processes (e.g., after one of them was killed)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = self._start_executor()
+
+    def map(
+        self,
+        function: Callable,
+        iterable: Iterable,
+        memory: Optional[Callable[[Any], int]] = None,
+        ordered: bool = True,
+    ) -> Iterator:
+        """Apply ``function`` to each item, yielding results in the input order.
+
+        Args:
+            function (Callable): the function to be applied.
+            iterable (Iterable): the items.
+            memory (Optional[Callable[[Any], int]]): the estimated memory needed
+                to process an item, used to throttle tasks with a memory budget.
+            ordered (bool): if ``False``, results of worker processes are yielded
+                as soon as they are ready, so that a slow task does not hold back
+                the submission of the next ones.
+        """
+        if self._executor is None:
+            return self._map_in_session(function, iterable)
+        if not ordered:
+            return self._map_unordered(function, iterable, memory or (lambda item: 0))
+        return self._map_bounded(function, iterable, memory or (lambda item: 0))
+
+    def _map_bounded(
+        self, function: Callable, iterable: Iterable, memory: Callable[[Any], int]
+    ) -> Iterator:
+        assert self._executor is not None
+        in_flight: Deque[Tuple[Future, int]] = deque()
+        for item in iterable:
+            item_memory = memory(item)
+            while in_flight and (
+                len(in_flight) >= self.jobs * TASKS_PER_WORKER
+                or self._exceeds_memory(
+                    sum(task_memory for _, task_memory in in_flight) + item_memory
+                )
+            ):
+                yield in_flight.popleft()[0].result()
+            in_flight.append((self._executor.submit(function, item), item_memory))
+        while in_flight:
+            yield in_flight.popleft()[0].result()
+
+    def _map_unordered(
+        self, function: Callable, iterable: Iterable, memory: Callable[[Any], int]
+    ) -> Iterator:
+        assert self._executor is not None
+        in_flight: Dict[Future, int] = {}
+        for item in iterable:
+            item_memory = memory(item)
+            while in_flight and (
+                len(in_flight) >= self.jobs * TASKS_PER_WORKER
+                or self._exceeds_memory(sum(in_flight.values()) + item_memory)
+            ):
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del in_flight[future]
+                    yield future.result()
+            in_flight[self._executor.submit(function, item)] = item_memory
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                del in_flight[future]
+                yield future.result()
+
+    def _exceeds_memory(self, memory: int) -> bool:
+        """Whether ``memory`` more would exceed the memory budget (if any)."""
+        return (
+            self.max_memory is not None and memory_in_use() + memory > self.max_memory
+        )
+
+    def _map_in_session(self, function: Callable, iterable: Iterable) -> Iterator:
+        for item in iterable:
+            with self.session.activate():
+                result = function(item)
+            yield result
+
+    def lint_notebooks(
+        self, paths: List[Path], sizes: Optional[Dict[Path, int]] = None
+    ) -> List[NotebookLinter]:
+        """Lint the notebooks at the given paths.
+
+        Byte-identical notebooks are linted once: the lints that do not depend on
+        the notebook path are evaluated only on the first copy, and their results
+        are reused for the other copies.
+
+        Args:
+            paths (List[Path]): the paths of the notebooks.
+            sizes (Optional[Dict[Path, int]]): the size of (some of) the notebook
+                files, if already known; with worker processes, the known ones are
+                linted largest first (and the others after them). Missing sizes are
+                only read from the filesystem with a memory budget.
+
+        Returns:
+            List[NotebookLinter]: the linters of the notebooks, in the order of
+            ``paths`` (whatever the order in which they are linted).
+        """
+        known_sizes = sizes or {}
+        first_copies: Dict[str, Path] = {}
+        copy_of: Dict[Path, Path] = {}
+
+        # Largest notebooks first, then those whose size is unknown (the sort is
+        # stable, so these and the copies of the same notebook are still read in
+        # the order of ``paths``)
+        read_order = paths
+        if self._executor is not None:
+            read_order = sorted(paths, key=lambda path: -known_sizes.get(path, -1))
+
+        # Notebooks are read ahead, while the unique ones are being linted; with a
+        # memory budget, only as many bytes as could then be linted within it
+        reads = ReadAhead(
+            read_order,
+            max_bytes=(
+                self.max_memory // NOTEBOOK_MEMORY_FACTOR
+                if self.max_memory is not None
+                else None
+            ),
+            sizes=known_sizes,
+        )
+
+        def unique_notebooks() -> Iterator[Tuple[Path, bytes]]:
+            for path, content in reads:
+                digest = content_digest(content)
+                copy_of[path] = first_copies.setdefault(digest, path)
+                if copy_of[path] == path:
+                    yield path, content
+
+        if self._executor is None:
+            results: Iterable[Tuple[NotebookLinter, cell_facts.CacheStats]] = self.map(
+                lint_notebook_content, unique_notebooks()
+            )
+        else:
+            results = chain.from_iterable(
+                self.map(
+                    lint_notebook_chunk,
+                    chunked(unique_notebooks()),
+                    chunk_memory,
+                    ordered=False,
+                )
+            )
+
+        unique_nb_linters: Dict[Path, NotebookLinter] = {}
+        for nb_linter, cache_stats in results:
+            unique_nb_linters[nb_linter.notebook.path] = nb_linter
+            if self._executor is not None:
+                # Lookups in the current process are counted by its own cache
+                self.cache_stats.merge(cache_stats)
+        self.io_stats.merge(reads.stats)
+
+        nb_linters: List[NotebookLinter] = []
+        for path in paths:
+            first_copy = copy_of[path]
+            if path == first_copy:
+                nb_linters.append(unique_nb_linters[path])
+            else:
+                with self.session.activate():
+                    nb_linters.append(unique_nb_linters[first_copy].for_copy(path))
+
+        # Collect the cell facts computed by the workers (unless their notebooks
+        # have been released, to stay within the memory budget)
+        if self._executor is not None:
+            cache = cell_facts.get_cache()
+            for path in paths:
+                if path not in unique_nb_linters:
+                    continue
+                notebook = unique_nb_linters[path].notebook
+                if not notebook.is_loaded:
+                    continue
+                for cell in notebook.cells:
+                    if "facts" in cell.__dict__:
+                        key = cell_facts.content_key(
+                            cell.cell_type.value, cell.cell_source
+                        )
+                        cache.store(key, cell.facts, cell.facts_id)
+        return nb_linters
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
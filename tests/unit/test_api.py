@@ -0,0 +1,42 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import nbformat
+import pytest
+
+from pynblint import lint_notebook
+
+if __name__ == "__main__":
+    pytest.main()
+
+NOTEBOOK_PATH = Path("tests", "fixtures", "FullNotebook2.ipynb")
+
+
+@pytest.mark.parametrize(
+    "notebook",
+    [
+        NOTEBOOK_PATH.read_bytes(),
+        NOTEBOOK_PATH.read_text(),
+        nbformat.read(NOTEBOOK_PATH, 4),
+    ],
+)
+def test_lint_notebook_uses_virtual_name(notebook):
+    slugs = {
+        finding.slug for finding in lint_notebook(notebook, "Untitled.ipynb").findings()
+    }
+    assert "untitled-notebook" in slugs
+
+    slugs = {
+        finding.slug for finding in lint_notebook(notebook, "analysis.ipynb").findings()
+    }
+    assert "untitled-notebook" not in slugs
+
+
+def test_linting_api_is_imported_on_first_access():
+    code = (
+        "import sys, pynblint\n"
+        "assert 'pynblint.api' not in sys.modules\n"
+        "assert pynblint.lint_notebook is sys.modules['pynblint.api'].lint_notebook\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,119 @@
+import shutil
+from pathlib import Path
+
+import nbformat
+import pytest
+
+from pynblint import loader
+from pynblint.baseline import Baseline
+from pynblint.batch import BatchLinter
+from pynblint.core_models import LocalRepository
+from pynblint.exceptions import BaselineFormatError
+from pynblint.repo_linter import RepoLinter
+
+if __name__ == "__main__":
+    pytest.main()
+
+FIXTURES_PATH = Path("tests", "fixtures")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def core_lints():
+    loader.load_core_modules()
+
+
+def make_repo(path: Path) -> Path:
+    path.mkdir()
+    for name in ["FullNotebook2.ipynb", "LongNotebook.ipynb", "Untitled.ipynb"]:
+        shutil.copy(FIXTURES_PATH / name, path / name)
+    return path
+
+
+def record_baseline(repo_path: Path, baseline_path: Path) -> int:
+    baseline = Baseline.load(baseline_path, update=True)
+    linter = RepoLinter(LocalRepository(repo_path))
+    linter.apply_baseline(baseline)
+    baseline.save(baseline_path)
+    assert not list(linter.findings())
+    return sum(baseline.seen.values())
+
+
+def test_baseline_hides_known_findings(tmp_path):
+    repo_path = make_repo(tmp_path / "repo")
+    baseline_path = tmp_path / "baseline.json"
+    assert record_baseline(repo_path, baseline_path) == len(
+        list(RepoLinter(LocalRepository(repo_path)).findings())
+    )
+
+    # The baseline is valid wherever the repository is checked out
+    moved_path = tmp_path / "moved"
+    shutil.copytree(repo_path, moved_path)
+    baseline = Baseline.load(baseline_path)
+    linter = RepoLinter(LocalRepository(moved_path))
+    linter.apply_baseline(baseline)
+    assert not list(linter.findings())
+    assert linter.as_dict()["lints"] == []
+    assert all(
+        nb_results["lints"] == []
+        for nb_results in linter.as_dict()["notebook_level_lints"]
+    )
+    assert linter.corpus_stats.violations_per_slug == {}
+
+
+def test_baseline_reports_new_findings_only(tmp_path):
+    repo_path = make_repo(tmp_path / "repo")
+    baseline_path = tmp_path / "baseline.json"
+    record_baseline(repo_path, baseline_path)
+
+    # Insert a new empty cell at the top: known cells are moved, not new
+    notebook_path = repo_path / "FullNotebook2.ipynb"
+    notebook = nbformat.read(str(notebook_path), as_version=4)
+    notebook.cells.insert(0, nbformat.v4.new_code_cell(""))
+    nbformat.write(notebook, str(notebook_path))
+
+    linter = RepoLinter(LocalRepository(repo_path))
+    linter.apply_baseline(Baseline.load(baseline_path))
+    assert [
+        (finding.slug, finding.path, finding.cell_index)
+        for finding in linter.findings()
+    ] == [("empty-cells", notebook_path, 0)]
+
+
+def test_baseline_counts_identical_findings(tmp_path):
+    repo_path = make_repo(tmp_path / "repo")
+    notebook_path = repo_path / "FullNotebook2.ipynb"
+    notebook = nbformat.read(str(notebook_path), as_version=4)
+    notebook.cells += [nbformat.v4.new_code_cell(""), nbformat.v4.new_code_cell("")]
+    nbformat.write(notebook, str(notebook_path))
+    baseline_path = tmp_path / "baseline.json"
+    record_baseline(repo_path, baseline_path)
+
+    # A third identical empty cell is a new finding
+    notebook.cells.insert(0, nbformat.v4.new_code_cell(""))
+    nbformat.write(notebook, str(notebook_path))
+
+    linter = RepoLinter(LocalRepository(repo_path))
+    linter.apply_baseline(Baseline.load(baseline_path))
+    assert [(finding.slug, finding.path) for finding in linter.findings()] == [
+        ("empty-cells", notebook_path)
+    ]
+
+
+def test_baseline_in_batches_is_scoped_by_target(tmp_path):
+    targets = [str(make_repo(tmp_path / "first")), str(make_repo(tmp_path / "second"))]
+    baseline = Baseline(update=True)
+    BatchLinter(targets[:1]).apply_baseline(baseline)
+
+    linter = BatchLinter(targets)
+    linter.apply_baseline(Baseline(baseline.seen))
+    assert not list(linter.linters[targets[0]].findings())
+    assert list(linter.linters[targets[1]].findings())
+    assert linter.summary.targets_with_violations == 1
+
+
+def test_invalid_baseline(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    assert not Baseline.load(baseline_path).known
+    baseline_path.write_text('{"version": 0, "fingerprints": []}')
+    with pytest.raises(BaselineFormatError):
+        Baseline.load(baseline_path)
@@ -0,0 +1,140 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pynblint import lint_register, loader, workers
+from pynblint.batch import BatchLinter, expand_targets
+from pynblint.core_models import Notebook
+from pynblint.lint import ViolationBudget
+from pynblint.nb_linter import NotebookLinter
+from pynblint.session import LintSession
+from pynblint.workers import WorkerPool
+
+if __name__ == "__main__":
+    pytest.main()
+
+REPO_PATH = Path("tests", "fixtures", "test_repo", "UntitledNoDuplicates")
+NOTEBOOK_PATH = Path("tests", "fixtures", "Untitled.ipynb")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def core_lints():
+    loader.load_core_modules()
+
+
+def test_load_core_modules_is_idempotent():
+    n_lints = len(lint_register.enabled_notebook_level_lints)
+    loader.load_core_modules()
+    assert len(lint_register.enabled_notebook_level_lints) == n_lints
+
+
+def test_expand_targets():
+    targets = expand_targets(
+        ["tests/fixtures/Untitled*.ipynb", str(NOTEBOOK_PATH), str(REPO_PATH)]
+    )
+    assert targets == [
+        str(NOTEBOOK_PATH),
+        str(Path("tests", "fixtures", "Untitled2.ipynb")),
+        str(REPO_PATH),
+    ]
+
+
+def test_batch_linter():
+    linter = BatchLinter([str(REPO_PATH), str(NOTEBOOK_PATH)])
+
+    assert list(linter.linters) == [str(REPO_PATH), str(NOTEBOOK_PATH)]
+    assert linter.summary.number_of_targets == 2
+    assert linter.summary.number_of_notebooks == 2
+    assert linter.summary.violations_per_slug["untitled-notebook"] == 1
+    assert set(linter.as_dict()["targets"]) == {str(REPO_PATH), str(NOTEBOOK_PATH)}
+
+
+def test_batch_linter_with_worker_processes():
+    targets = [str(REPO_PATH), str(NOTEBOOK_PATH)]
+    with WorkerPool(jobs=2) as pool:
+        parallel_linter = BatchLinter(targets, pool=pool)
+    assert parallel_linter.as_dict() == BatchLinter(targets).as_dict()
+
+
+def test_batch_linter_stops_when_budget_is_exhausted():
+    targets = [str(NOTEBOOK_PATH), str(REPO_PATH)]
+    linter = BatchLinter(targets, budget=ViolationBudget(1))
+
+    assert linter.budget.exhausted
+    assert list(linter.linters) == targets[:1]
+    assert len(list(linter.findings())) == 1
+
+
+def test_extracted_archives_are_removed_once_linted(tmp_path):
+    archive = tmp_path / "project.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.write(NOTEBOOK_PATH, "notebooks/analysis.ipynb")
+
+    linter = BatchLinter([str(archive), str(NOTEBOOK_PATH)])
+
+    repo = linter.linters[str(archive)].repo
+    assert [path.name for path in repo.notebook_paths] == ["analysis.ipynb"]
+    assert not repo.path.exists()
+
+
+def test_byte_identical_notebooks_are_linted_once(tmp_path):
+    for name in ["analysis.ipynb", "Untitled.ipynb", "copy/analysis.ipynb"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_bytes(NOTEBOOK_PATH.read_bytes())
+    paths = sorted(tmp_path.rglob("*.ipynb"))
+
+    nb_linters = WorkerPool().lint_notebooks(paths)
+
+    first_copy = nb_linters[0].notebook
+    assert all(
+        nb_linter.notebook.nb_dict is first_copy.nb_dict for nb_linter in nb_linters
+    )
+    assert [nb_linter.notebook.path for nb_linter in nb_linters] == paths
+    for nb_linter in nb_linters:
+        expected = NotebookLinter(Notebook(nb_linter.notebook.path))
+        assert nb_linter.as_dict() == expected.as_dict()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_memory_budget_releases_notebooks(jobs, tmp_path):
+    for name in ["analysis.ipynb", "copy/analysis.ipynb"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_bytes(NOTEBOOK_PATH.read_bytes())
+    targets = [str(REPO_PATH), str(NOTEBOOK_PATH), str(tmp_path)]
+    expected = BatchLinter(targets).as_dict()
+
+    # A budget of one byte lints a single notebook at a time
+    session = LintSession.build(max_memory=1)
+    with session.activate(), WorkerPool(jobs, session) as pool:
+        linter = BatchLinter(targets, pool=pool)
+
+    assert linter.as_dict() == expected
+    for target_linter in linter.linters.values():
+        nb_linters = getattr(target_linter, "notebook_linters", [target_linter])
+        assert not any(nb_linter.notebook.is_loaded for nb_linter in nb_linters)
+
+
+def test_chunked_groups_small_notebooks():
+    tasks = [(Path(f"{size}.ipynb"), b"x" * size) for size in [50, 10, 5, 4, 3, 2, 1]]
+    chunks = list(workers.chunked(tasks, chunk_bytes=10, chunk_notebooks=3))
+    assert [[len(content) for _, content in chunk] for chunk in chunks] == [
+        [50],
+        [10],
+        [5, 4, 3],
+        [2, 1],
+    ]
+
+
+def test_largest_notebooks_first_keeps_output_order(tmp_path):
+    paths = []
+    for i, fixture in enumerate(sorted(Path("tests", "fixtures").glob("*.ipynb"))):
+        paths.append(tmp_path / f"{i}.ipynb")
+        paths[-1].write_bytes(fixture.read_bytes())
+    with WorkerPool() as pool:
+        expected = [nb_linter.as_dict() for nb_linter in pool.lint_notebooks(paths)]
+
+    with WorkerPool(jobs=3) as pool:
+        nb_linters = pool.lint_notebooks(paths, sizes={paths[0]: 10**9})
+    assert [nb_linter.notebook.path for nb_linter in nb_linters] == paths
+    assert [nb_linter.as_dict() for nb_linter in nb_linters] == expected
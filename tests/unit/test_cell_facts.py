@@ -0,0 +1,110 @@
+import nbformat
+import pytest
+
+from pynblint import cell_facts
+from pynblint.cell_facts import CellFactsCache, compute_cell_facts
+from pynblint.core_models import Notebook
+from pynblint.session import LintSession
+
+if __name__ == "__main__":
+    pytest.main()
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("", []),
+        ("a = 1\n# one\n# two\n\n# three\nb = 2\n# four", [(1, 3), (6, 1)]),
+        ("    # indented\n\t# comment", [(0, 2)]),
+        ("x = '#'  # not a comment line", []),
+        ("# c\n" * 100000 + "a = 1", [(0, 100000)]),
+    ],
+)
+def test_find_comment_runs(source, expected):
+    assert cell_facts.find_comment_runs(source) == expected
+
+
+def test_code_cell_facts():
+    source = (
+        "%matplotlib inline\nimport os, sys\n\ndef f():\n    import re\n\n"
+        "class A:\n    pass"
+    )
+    facts = compute_cell_facts("code", source)
+
+    assert facts.valid_syntax
+    assert facts.imported_modules == ["os", "sys"]
+    assert facts.number_of_functions == 1
+    assert facts.number_of_classes == 1
+    assert facts.number_of_lines == 8
+
+
+def test_invalid_code_cell_facts():
+    assert not compute_cell_facts("code", "def f(:\n    pass").valid_syntax
+
+
+@pytest.mark.parametrize(
+    "source,is_heading,titles",
+    [("# Title\n\n## Subtitle", True, 2), ("# Title\nSome text", False, 1)],
+)
+def test_markdown_cell_facts(source, is_heading, titles):
+    facts = compute_cell_facts("markdown", source)
+    assert facts.is_heading == is_heading
+    assert facts.number_of_md_titles == titles
+
+
+def test_cache_hits_and_persistence(tmp_path):
+    cache_path = tmp_path / "cell_facts.json"
+    cache = CellFactsCache(cache_path)
+    facts = cache.get("code", "# a\n# b\nx = 1", "nb.ipynb#cell-1")
+    cache.get("code", "# a\n# b\nx = 1", "other.ipynb#cell-1")
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.save()
+
+    reloaded_cache = CellFactsCache(cache_path)
+    assert reloaded_cache.get("code", "# a\n# b\nx = 1") == facts
+    assert (reloaded_cache.hits, reloaded_cache.misses) == (1, 0)
+
+
+def test_cache_evicts_edited_cells():
+    cache = CellFactsCache()
+    cache.get("code", "x = 1", "nb.ipynb#cell-1")
+    cache.get("code", "x = 2", "nb.ipynb#cell-1")
+
+    assert cell_facts.content_key("code", "x = 1") not in cache
+    assert cell_facts.content_key("code", "x = 2") in cache
+
+
+def test_cache_keeps_contents_of_other_cells():
+    cache = CellFactsCache()
+    cache.get("code", "x = 1", "nb.ipynb#cell-1")
+    cache.get("code", "x = 1", "copy.ipynb#cell-1")
+    cache.get("code", "x = 2", "nb.ipynb#cell-1")
+
+    assert cell_facts.content_key("code", "x = 1") in cache
+
+
+def test_cache_is_bounded():
+    cache = CellFactsCache(max_entries=2)
+    for source in ["x = 1", "x = 2", "x = 1", "x = 3"]:
+        cache.get("code", source)
+
+    # The least recently used facts are evicted
+    assert len(cache) == 2
+    assert cell_facts.content_key("code", "x = 2") not in cache
+    assert cell_facts.content_key("code", "x = 1") in cache
+
+    with LintSession.build(max_memory=100 * 1024 * 1024).activate():
+        assert cell_facts.get_cache().max_entries < cell_facts.CACHE_MAX_ENTRIES
+    assert cell_facts.get_cache().max_entries == cell_facts.CACHE_MAX_ENTRIES
+
+
+def test_virtual_notebooks_do_not_evict_each_other():
+    sources = []
+    for source in ["x = 1", "x = 2"]:
+        nb_node = nbformat.v4.new_notebook()
+        nb_node.cells = [nbformat.v4.new_code_cell(source, id="cell-1")]
+        Notebook.from_node(nb_node).cells[0].facts
+        sources.append(source)
+
+    cache = cell_facts.get_cache()
+    assert all(cell_facts.content_key("code", source) in cache for source in sources)
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import nbformat
 import pytest
 
 from pynblint.core_models import LocalRepository, Notebook
@@ -26,3 +27,41 @@ def test_notebook_from_repo_constructor():
 
     assert notebook.repository is not None
     assert notebook.repository.path == repo_path
+
+
+@pytest.mark.parametrize("as_bytes", [True, False])
+def test_notebook_from_string(as_bytes):
+    nb_raw = Path("tests", "fixtures", "FullNotebook2.ipynb").read_text()
+    notebook = Notebook.from_string(
+        nb_raw.encode() if as_bytes else nb_raw, name="Untitled1.ipynb"
+    )
+
+    assert notebook.path == Path("Untitled1.ipynb")
+    assert len(notebook.cells) == len(
+        Notebook(Path("tests", "fixtures", "FullNotebook2.ipynb")).cells
+    )
+
+
+def test_notebook_from_node():
+    nb_node = nbformat.read(Path("tests", "fixtures", "FullNotebook2.ipynb"), 4)
+    notebook = Notebook.from_node(nb_node)
+
+    assert notebook.path.name == "notebook.ipynb"
+    assert len(notebook.cells) == len(nb_node.cells)
+
+
+@pytest.mark.parametrize(
+    "sources,expected",
+    [
+        (["x = 1", "y = 2"], False),
+        (["x = (", "y = 2"], True),
+        (["x = (1,", "2)"], False),  # A statement spanning two cells
+    ],
+)
+def test_invalid_python_syntax_of_the_script(sources, expected):
+    notebook = Notebook.from_node(
+        nbformat.v4.new_notebook(
+            cells=[nbformat.v4.new_code_cell(source) for source in sources]
+        )
+    )
+    assert notebook.has_invalid_python_syntax == expected
@@ -0,0 +1,51 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from pynblint.core_models import LocalRepository
+from pynblint.corpus_stats import CorpusStats, Distribution, QuantileSketch
+from pynblint.repo_linter import RepoLinter
+
+if __name__ == "__main__":
+    pytest.main()
+
+
+def test_quantile_sketch_accuracy():
+    rng = random.Random(0)
+    values = [rng.lognormvariate(3, 1) for _ in range(10000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.1, 0.5, 0.9, 0.99):
+        actual = sorted(values)[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(actual, rel=0.02)
+
+
+def test_merged_distribution_equals_single_pass():
+    values = list(range(100)) + [0.5, 1000]
+    single_pass = Distribution()
+    for value in values:
+        single_pass.add(value)
+
+    left, right = Distribution(), Distribution()
+    for value in values[:40]:
+        left.add(value)
+    for value in values[40:]:
+        right.add(value)
+    left.merge(right)
+
+    assert left.as_dict() == single_pass.as_dict()
+    assert single_pass.histogram["128"] == 36  # Values in [64, 128)
+
+
+def test_corpus_stats_roundtrip_through_json():
+    repo_linter = RepoLinter(LocalRepository(Path("tests", "fixtures")))
+    corpus_stats = repo_linter.corpus_stats
+
+    assert corpus_stats.number_of_notebooks == len(repo_linter.notebook_linters)
+    assert corpus_stats.violations_per_slug["untitled-notebook"] == 2
+    stats_dict = json.loads(json.dumps(corpus_stats.as_dict()))
+    assert CorpusStats.from_dict(stats_dict).as_dict() == corpus_stats.as_dict()
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import git
+import pytest
+
+from pynblint import git_utils
+from pynblint.config import settings
+from pynblint.core_models import GitHubRepository
+
+NOTEBOOK_PATH = Path("tests", "fixtures", "FullNotebook2.ipynb")
+
+
+@pytest.fixture(scope="module")
+def remote_repo(tmp_path_factory) -> Path:
+    """A local repository (with a large data file) used as the remote."""
+
+    repo_path: Path = tmp_path_factory.mktemp("remote") / "data-project"
+    repo = git.Repo.init(repo_path)
+    repo.config_writer().set_value("uploadpack", "allowFilter", "true").release()
+
+    (repo_path / "notebooks").mkdir()
+    (repo_path / "notebooks" / "analysis.ipynb").write_text(NOTEBOOK_PATH.read_text())
+    (repo_path / "requirements.txt").write_text("pandas\n")
+    (repo_path / "data").mkdir()
+    (repo_path / "data" / "large.csv").write_bytes(b"0" * 50000)
+    (repo_path / "data" / "small.csv").write_bytes(b"0" * 10)
+
+    repo.index.add(
+        [
+            "notebooks/analysis.ipynb",
+            "requirements.txt",
+            "data/large.csv",
+            "data/small.csv",
+        ]
+    )
+    author = git.Actor("Pynblint", "pynblint@example.com")
+    repo.index.commit("Initial commit", author=author, committer=author)
+    return repo_path
+
+
+@pytest.fixture
+def small_max_data_file_size():
+    default = settings.max_data_file_size
+    settings.max_data_file_size = 20000
+    yield
+    settings.max_data_file_size = default
+
+
+def test_partial_clone_checks_out_only_notebooks_and_manifests(remote_repo, tmp_path):
+    clone_path = tmp_path / "clone"
+    git_utils.partial_clone(remote_repo.as_uri(), clone_path, size_limit=20000)
+
+    checked_out = {
+        path.relative_to(clone_path)
+        for path in clone_path.rglob("*")
+        if path.is_file() and ".git" not in path.parts
+    }
+    assert checked_out == {Path("notebooks/analysis.ipynb"), Path("requirements.txt")}
+
+
+def test_tree_file_sizes_of_partial_clone(remote_repo, tmp_path):
+    clone_path = tmp_path / "clone"
+    repo = git_utils.partial_clone(remote_repo.as_uri(), clone_path, size_limit=20000)
+    sizes = git_utils.tree_file_sizes(repo, size_limit=20000)
+
+    assert sizes[Path("data/small.csv")] == 10
+    assert sizes[Path("data/large.csv")] >= 20000
+    assert git_utils.missing_objects(repo)
+
+
+@pytest.mark.parametrize("partial_fetch", [True, False])
+def test_remote_repository(partial_fetch, remote_repo, small_max_data_file_size):
+    repo = GitHubRepository(remote_repo.as_uri(), partial_fetch=partial_fetch)
+
+    assert [nb.path.name for nb in repo.notebooks] == ["analysis.ipynb"]
+    assert repo.has_file("requirements.txt")
+    assert not repo.has_file(".coverage")
+    assert repo.large_file_paths == [repo.path / "data" / "large.csv"]
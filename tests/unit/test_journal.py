@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pynblint import loader
+from pynblint.batch import BatchLinter
+from pynblint.exceptions import JournalFormatError
+from pynblint.journal import COMPLETED, FAILED, Journal
+
+if __name__ == "__main__":
+    pytest.main()
+
+REPO_PATH = Path("tests", "fixtures", "test_repo", "UntitledNoDuplicates")
+NOTEBOOK_PATH = Path("tests", "fixtures", "Untitled.ipynb")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def core_lints():
+    loader.load_core_modules()
+
+
+@pytest.fixture
+def targets(tmp_path):
+    broken_notebook = tmp_path / "broken.ipynb"
+    broken_notebook.write_text("{")
+    return [str(REPO_PATH), str(broken_notebook), str(NOTEBOOK_PATH)]
+
+
+def test_failures_are_recorded_without_stopping_the_run(targets, tmp_path):
+    journal = Journal.open(tmp_path / "journal.jsonl", "settings")
+    linter = BatchLinter(targets, journal=journal)
+
+    assert list(linter.linters) == [targets[0], targets[2]]
+    assert journal.entries[targets[1]]["status"] == FAILED
+    assert journal.entries[targets[1]]["error"]["traceback"]
+
+    results = linter.as_dict()
+    assert list(results["targets"]) == [targets[0], targets[2]]
+    assert list(results["failures"]) == [targets[1]]
+    assert results == BatchLinter(targets, journal=journal).as_dict()
+
+
+def test_resumed_run_skips_recorded_targets(targets, tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    BatchLinter(targets[:1], journal=Journal.open(journal_path, "settings"))
+    # A run killed while recording a target leaves a partial line
+    with open(journal_path, "a") as f:
+        f.write('{"target": "trunc')
+
+    resumed = BatchLinter(targets, journal=Journal.open(journal_path, "settings"))
+    assert list(resumed.linters) == [targets[2]]
+    assert resumed.summary == BatchLinter([targets[0], targets[2]]).summary
+    assert resumed.corpus_stats.as_dict() == (
+        BatchLinter([targets[0], targets[2]]).corpus_stats.as_dict()
+    )
+
+    with open(journal_path) as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry.get("status") for entry in entries] == [
+        None,
+        COMPLETED,
+        FAILED,
+        COMPLETED,
+    ]
+
+
+def test_failed_targets_are_retried_on_request(targets, tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    BatchLinter(targets, journal=Journal.open(journal_path, "settings"))
+    Path(targets[1]).write_text(NOTEBOOK_PATH.read_text())
+
+    journal = Journal.open(journal_path, "settings")
+    assert journal.pending(targets) == []
+    linter = BatchLinter(targets, journal=journal, retry_failed=True)
+    assert list(linter.linters) == [targets[1]]
+    assert linter.as_dict()["failures"] == {}
+    assert linter.summary.number_of_targets == 3
+
+
+def test_journal_of_other_settings_is_rejected(tmp_path):
+    Journal.open(tmp_path / "journal.jsonl", "settings")
+    with pytest.raises(JournalFormatError):
+        Journal.open(tmp_path / "journal.jsonl", "other settings")
@@ -0,0 +1,88 @@
+import re
+import shutil
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from pynblint import loader, metrics
+from pynblint.cell_facts import CacheStats
+from pynblint.core_models import LocalRepository
+from pynblint.metrics import RunMetrics
+from pynblint.prefetch import IOStats
+from pynblint.repo_linter import RepoLinter
+from pynblint.workers import WorkerPool
+
+if __name__ == "__main__":
+    pytest.main()
+
+# A sample: metric name, labels (if any) and value
+SAMPLE_PATTERN = re.compile(r"^(pynblint_\w+)(\{.*\})? (\S+)$")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def core_lints():
+    loader.load_core_modules()
+
+
+def parse_samples(text: str) -> dict:
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        match = SAMPLE_PATTERN.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        samples[name + (labels or "")] = float(value)
+    return samples
+
+
+def test_stages_are_measured_while_active(tmp_path):
+    shutil.copy(Path("tests", "fixtures", "Untitled.ipynb"), tmp_path)
+    run_metrics = RunMetrics()
+    RepoLinter(LocalRepository(tmp_path))
+    assert run_metrics.stage_seconds == {}
+
+    with run_metrics.activate():
+        RepoLinter(LocalRepository(tmp_path))
+    assert set(run_metrics.stage_seconds) == {
+        "discovery",
+        "repository_linting",
+        "notebook_linting",
+    }
+
+
+def test_openmetrics_text_format():
+    run_metrics = RunMetrics()
+    with run_metrics.activate(), metrics.stage("export"):
+        pass
+    text = run_metrics.openmetrics(
+        4,
+        Counter({"untitled-notebook": 2, 'odd"slug': 1}),
+        IOStats(files_read=4, bytes_read=1000),
+        CacheStats(hits=3, misses=1),
+    )
+
+    assert text.endswith("# EOF\n")
+    samples = parse_samples(text)
+    assert samples["pynblint_notebooks"] == 4
+    assert samples['pynblint_violations{slug="untitled-notebook"}'] == 2
+    assert samples['pynblint_violations{slug="odd\\"slug"}'] == 1
+    assert samples["pynblint_cell_facts_cache_hit_ratio"] == 0.75
+    assert samples["pynblint_bytes_read"] == 1000
+    assert 'pynblint_stage_duration_seconds{stage="export"}' in samples
+    assert all(
+        f"# TYPE {name} gauge" in text
+        for name in {sample.split("{")[0] for sample in samples}
+    )
+
+
+def test_worker_pool_collects_worker_cache_stats(tmp_path):
+    paths = []
+    for name in ["FullNotebook2.ipynb", "LongNotebook.ipynb"]:
+        paths.append(tmp_path / name)
+        shutil.copy(Path("tests", "fixtures", name), paths[-1])
+
+    with WorkerPool(jobs=2) as pool:
+        pool.lint_notebooks(paths)
+    assert pool.cache_stats.hits + pool.cache_stats.misses > 0
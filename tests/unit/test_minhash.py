@@ -0,0 +1,129 @@
+import random
+
+import nbformat
+import pytest
+
+from pynblint import loader, minhash, repo_linting
+from pynblint.core_models import LocalRepository
+from pynblint.repo_linter import RepoLinter
+
+if __name__ == "__main__":
+    pytest.main()
+
+rng = random.Random(0)
+VOCABULARY = [f"word{i}" for i in range(500)]
+TEXT = " ".join(rng.choice(VOCABULARY) for _ in range(400))
+
+
+def edited(text: str, n_edits: int) -> str:
+    tokens = text.split()
+    edit_rng = random.Random(n_edits)
+    for _ in range(n_edits):
+        tokens[edit_rng.randrange(len(tokens))] = edit_rng.choice(VOCABULARY)
+    return " ".join(tokens)
+
+
+def test_similarity_estimates_jaccard_similarity():
+    other = edited(TEXT, 10)
+    first, second = set(minhash.shingles(TEXT)), set(minhash.shingles(other))
+    jaccard = len(first & second) / len(first | second)
+
+    estimate = minhash.similarity(
+        minhash.signature(TEXT, 256), minhash.signature(other, 256)
+    )
+    assert estimate == pytest.approx(jaccard, abs=0.1)
+
+
+def test_signature_ignores_formatting():
+    assert minhash.signature(TEXT, 64) == minhash.signature(
+        "\n".join(TEXT.upper().split()), 64
+    )
+    assert minhash.signature("# (...)", 64) is None
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+def test_lsh_parameters(threshold):
+    bands, rows = minhash.lsh_parameters(threshold, 128)
+    assert bands * rows == 128
+    assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_near_duplicate_groups():
+    documents = {
+        "original": TEXT,
+        "copy": edited(TEXT, 2),
+        "unrelated": " ".join(rng.choice(VOCABULARY) for _ in range(400)),
+        "other copy": edited(TEXT, 3),
+    }
+    signatures = minhash.signatures_of(documents.items(), 128)
+    assert minhash.near_duplicate_groups(signatures, 0.8) == [
+        ["original", "copy", "other copy"]
+    ]
+
+
+def test_near_duplicate_groups_compare_all_candidates_of_a_bucket():
+    # The second and third documents are only similar to each other
+    signatures = {
+        "first": (1, 2, 3, 4),
+        "second": (1, 2, 5, 6),
+        "third": (1, 2, 5, 7),
+    }
+    assert minhash.near_duplicate_groups(signatures, 0.7) == [["second", "third"]]
+
+
+def test_near_duplicate_groups_of_many_copies(monkeypatch):
+    comparisons = []
+    similarity = minhash.similarity
+
+    def counting_similarity(first, second):
+        comparisons.append((first, second))
+        return similarity(first, second)
+
+    monkeypatch.setattr(minhash, "similarity", counting_similarity)
+    template = minhash.signature(TEXT, 128)
+    edit = minhash.signature(edited(TEXT, 2), 128)
+    signatures = {f"copy{i}": template for i in range(5000)}
+    signatures["edited"] = edit
+
+    groups = minhash.near_duplicate_groups(signatures, 0.8)
+    assert groups == [list(signatures)]
+    bands, _ = minhash.lsh_parameters(0.8, 128)
+    assert len(comparisons) <= bands
+
+
+def test_near_duplicate_notebooks(tmp_path):
+    for name, source in [
+        ("analysis.ipynb", TEXT),
+        ("analysis-v2.ipynb", edited(TEXT, 2)),
+        ("other.ipynb", "import pandas as pd"),
+    ]:
+        notebook = nbformat.v4.new_notebook()
+        notebook.cells = [nbformat.v4.new_code_cell(source)]
+        nbformat.write(notebook, str(tmp_path / name))
+
+    near_duplicates = repo_linting.near_duplicate_notebooks(LocalRepository(tmp_path))
+    assert sorted(path.name for path in near_duplicates) == [
+        "analysis-v2.ipynb",
+        "analysis.ipynb",
+    ]
+
+
+def test_near_duplicates_reuse_signatures_of_linted_notebooks(tmp_path, monkeypatch):
+    loader.load_core_modules()
+    for name, source in [
+        ("analysis.ipynb", TEXT),
+        ("analysis-v2.ipynb", edited(TEXT, 2)),
+    ]:
+        notebook = nbformat.v4.new_notebook()
+        notebook.cells = [nbformat.v4.new_code_cell(source)]
+        nbformat.write(notebook, str(tmp_path / name))
+
+    def load_notebook(self, path):
+        raise AssertionError(f"{path} read again")
+
+    monkeypatch.setattr(LocalRepository, "load_notebook", load_notebook)
+    linter = RepoLinter(LocalRepository(tmp_path))
+    near_duplicates = next(
+        lint for lint in linter.lints if lint.slug == "near-duplicate-notebooks"
+    )
+    assert len(near_duplicates.result) == 2
@@ -0,0 +1,130 @@
+import os
+import time
+from pathlib import Path
+
+import git
+import pytest
+
+from pynblint.core_models import GitHubRepository
+from pynblint.mirror_cache import MirrorCache
+from pynblint.session import LintSession
+
+NOTEBOOK_PATH = Path("tests", "fixtures", "FullNotebook2.ipynb")
+AUTHOR = git.Actor("Pynblint", "pynblint@example.com")
+
+
+def make_remote(path: Path) -> git.Repo:
+    """Create a bare repository (with a large data file), used as the remote."""
+
+    work_repo = git.Repo.init(path.with_name(path.name + "-work"))
+    work_path = Path(work_repo.working_dir)
+    (work_path / "analysis.ipynb").write_text(NOTEBOOK_PATH.read_text())
+    (work_path / "requirements.txt").write_text("pandas\n")
+    (work_path / "large.csv").write_bytes(b"0" * 50000)
+    work_repo.index.add(["analysis.ipynb", "requirements.txt", "large.csv"])
+    work_repo.index.commit("Initial commit", author=AUTHOR, committer=AUTHOR)
+
+    remote = git.Repo.init(path, bare=True)
+    remote.config_writer().set_value("uploadpack", "allowFilter", "true").release()
+    work_repo.create_remote("origin", path.as_uri())
+    work_repo.git.push("origin", "HEAD:refs/heads/master")
+    remote.git.symbolic_ref("HEAD", "refs/heads/master")
+    return work_repo
+
+
+def push_file(work_repo: git.Repo, filename: str) -> None:
+    (Path(work_repo.working_dir) / filename).write_text("new\n")
+    work_repo.index.add([filename])
+    work_repo.index.commit(f"Add {filename}", author=AUTHOR, committer=AUTHOR)
+    work_repo.git.push("origin", "HEAD:refs/heads/master")
+
+
+def set_last_use(path: Path, seconds_ago: float) -> None:
+    last_use = time.time() - seconds_ago
+    os.utime(path, (last_use, last_use))
+
+
+@pytest.fixture
+def remote(tmp_path):
+    work_repo = make_remote(tmp_path / "project.git")
+    return tmp_path / "project.git", work_repo
+
+
+def test_mirrors_are_updated_with_new_commits(remote, tmp_path):
+    remote_path, work_repo = remote
+    cache = MirrorCache(tmp_path / "cache")
+    mirror = cache.update(remote_path.as_uri())
+    assert mirror.bare
+
+    push_file(work_repo, "new.txt")
+    mirror = cache.update(remote_path.as_uri())
+    assert Path(mirror.git_dir) == cache.mirror_path(remote_path.as_uri())
+    assert mirror.head.commit.hexsha == work_repo.head.commit.hexsha
+    assert len(cache.mirror_paths()) == 1
+
+
+def test_mirrors_only_fetch_branches(remote, tmp_path):
+    remote_path, work_repo = remote
+    work_repo.git.push("origin", "HEAD:refs/pull/1/head")
+    cache = MirrorCache(tmp_path / "cache")
+    cache.update(remote_path.as_uri())
+
+    push_file(work_repo, "new.txt")
+    work_repo.git.push("origin", "HEAD:refs/pull/2/head")
+    mirror = cache.update(remote_path.as_uri())
+    assert [ref.path for ref in mirror.refs] == ["refs/heads/master"]
+
+
+@pytest.mark.parametrize("partial_fetch", [True, False])
+def test_remote_repository_from_mirror(partial_fetch, remote, tmp_path):
+    remote_path, work_repo = remote
+    with LintSession.build(
+        mirror_cache_dir=tmp_path / "cache", max_data_file_size=20000
+    ).activate():
+        repo = GitHubRepository(remote_path.as_uri(), partial_fetch=partial_fetch)
+        assert [nb.path.name for nb in repo.notebooks] == ["analysis.ipynb"]
+        assert repo.has_file("requirements.txt")
+        assert repo.large_file_paths == [repo.path / "large.csv"]
+
+        push_file(work_repo, "new.txt")
+        repo = GitHubRepository(remote_path.as_uri(), partial_fetch=partial_fetch)
+        assert repo.has_file("new.txt")
+    assert len(MirrorCache(tmp_path / "cache").mirror_paths()) == 1
+
+
+def test_least_recently_used_mirrors_are_evicted(tmp_path):
+    urls = []
+    for name in ["first.git", "second.git", "third.git"]:
+        make_remote(tmp_path / name)
+        urls.append((tmp_path / name).as_uri())
+    cache = MirrorCache(tmp_path / "cache")
+    in_use_worktree = cache.worktree(urls[0], tmp_path / "worktree")
+    cache.update(urls[1])
+    set_last_use(cache.mirror_path(urls[0]), 200)
+    set_last_use(cache.mirror_path(urls[1]), 100)
+
+    cache.max_size = 0
+    with cache.locked():
+        cache.update(urls[2])
+        evicted = cache.evict(keep=cache.mirror_path(urls[2]))
+    # The least recently used mirror has a worktree in use
+    assert evicted == [cache.mirror_path(urls[1])]
+
+    in_use_worktree.git.worktree("remove", in_use_worktree.working_dir)
+    with cache.locked():
+        evicted = cache.evict(keep=cache.mirror_path(urls[2]))
+    assert evicted == [cache.mirror_path(urls[0])]
+    assert cache.mirror_paths() == [cache.mirror_path(urls[2])]
+
+
+def test_mirrors_being_updated_are_not_evicted(remote, tmp_path):
+    remote_path, _ = remote
+    url = remote_path.as_uri()
+    cache = MirrorCache(tmp_path / "cache", max_size=0)
+    cache.update(url)
+
+    with cache.locked(cache.lock_path(url)):
+        with cache.locked():
+            assert cache.evict() == []
+    with cache.locked():
+        assert cache.evict() == [cache.mirror_path(url)]
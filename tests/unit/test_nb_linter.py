@@ -1,28 +1,30 @@
+import dataclasses
 from pathlib import Path
 from typing import Dict
 
+import nbformat
 import pytest
 
-from pynblint.core_models import Notebook
+from pynblint.core_models import CellType, Notebook
+from pynblint.lint import LintCost, LintDefinition, ViolationBudget
 from pynblint.nb_linter import NotebookLinter
+from pynblint.notebook_stats import NotebookStats, StatDefinition, collect_stats
+from pynblint.session import LintSession
 
 if __name__ == "__main__":
     pytest.main()
 
 
 @pytest.fixture(scope="module")
-def nb_linters() -> Dict[str, NotebookLinter]:
-    nb1 = Notebook(Path("tests", "fixtures", "FullNotebook2.ipynb"))
-    nb2 = Notebook(
-        Path("tests", "fixtures", "FullNotebookFullNotebookFullNotebook.ipynb")
-    )
-    nb3 = Notebook(Path("tests", "fixtures", "acs,.-e+.ipynb"))
-    nb4 = Notebook(Path("tests", "fixtures", "Untitled.ipynb"))
+def notebook_stats() -> Dict[str, NotebookStats]:
     return {
-        "FullNotebook2.ipynb": NotebookLinter(nb1),
-        "FullNotebookFullNotebookFullNotebook.ipynb": NotebookLinter(nb2),
-        "acs,.-e+.ipynb": NotebookLinter(nb3),
-        "Untitled.ipynb": NotebookLinter(nb4),
+        name: collect_stats(Notebook(Path("tests", "fixtures", name)))
+        for name in [
+            "FullNotebook2.ipynb",
+            "FullNotebookFullNotebookFullNotebook.ipynb",
+            "acs,.-e+.ipynb",
+            "Untitled.ipynb",
+        ]
     }
 
 
@@ -30,69 +32,154 @@ def nb_linters() -> Dict[str, NotebookLinter]:
     "test_input,expected",
     [("FullNotebook2.ipynb", 3), ("FullNotebookFullNotebookFullNotebook.ipynb", 15)],
 )
-def test_count_cells(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_cells() == expected
+def test_count_cells(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_cells == expected
 
 
 @pytest.mark.parametrize(
     "test_input,expected",
     [("FullNotebook2.ipynb", 0), ("FullNotebookFullNotebookFullNotebook.ipynb", 5)],
 )
-def test_count_md_cells(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_md_cells() == expected
+def test_count_md_cells(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_MD_cells == expected
 
 
 @pytest.mark.parametrize(
     "test_input,expected",
     [("acs,.-e+.ipynb", 0), ("FullNotebookFullNotebookFullNotebook.ipynb", 9)],
 )
-def test_count_code_cells(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_code_cells() == expected
+def test_count_code_cells(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_code_cells == expected
 
 
 @pytest.mark.parametrize(
     "test_input,expected",
     [("FullNotebook2.ipynb", 0), ("FullNotebookFullNotebookFullNotebook.ipynb", 1)],
 )
-def test_count_raw_cells(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_raw_cells() == expected
+def test_count_raw_cells(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_raw_cells == expected
 
 
 @pytest.mark.parametrize(
     "test_input,expected",
     [("FullNotebook2.ipynb", 1), ("FullNotebookFullNotebookFullNotebook.ipynb", 0)],
 )
-def test_count_class_defs(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_class_defs() == expected
+def test_count_class_defs(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_classes == expected
 
 
 @pytest.mark.parametrize(
     "test_input,expected",
     [("FullNotebook2.ipynb", 0), ("FullNotebookFullNotebookFullNotebook.ipynb", 1)],
 )
-def test_count_func_defs(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_func_defs() == expected
+def test_count_func_defs(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_functions == expected
 
 
 @pytest.mark.parametrize(
     "test_input,expected",
     [("FullNotebook2.ipynb", 0), ("FullNotebookFullNotebookFullNotebook.ipynb", 8)],
 )
-def test_count_md_lines(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_md_lines() == expected
+def test_count_md_lines(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_md_lines == expected
 
 
 @pytest.mark.parametrize(
     "test_input,expected",
     [("FullNotebook2.ipynb", 0), ("FullNotebookFullNotebookFullNotebook.ipynb", 1)],
 )
-def test_count_md_titles(test_input, expected, nb_linters):
-    nb_linter: NotebookLinter = nb_linters[test_input]
-    assert nb_linter.count_md_titles() == expected
+def test_count_md_titles(test_input, expected, notebook_stats):
+    assert notebook_stats[test_input].number_of_md_titles == expected
+
+
+def markdown_notebook() -> Notebook:
+    nb_node = nbformat.v4.new_notebook()
+    nb_node.cells = [
+        nbformat.v4.new_markdown_cell("## Data\nSome text\n# Model"),
+        nbformat.v4.new_code_cell("import pandas as pd\ndf = pd.DataFrame()"),
+    ]
+    return Notebook.from_node(nb_node)
+
+
+def test_compute_stats_counts_titles_by_line():
+    nb_linter = NotebookLinter(markdown_notebook())
+
+    assert nb_linter.notebook_stats is not None
+    assert nb_linter.notebook_stats.number_of_md_titles == 2
+    assert nb_linter.notebook_stats.number_of_md_lines == 3
+    assert nb_linter.notebook_stats.number_of_code_cells == 1
+
+
+def test_compute_stats_with_plugin_stats():
+    lines_of_code = StatDefinition(
+        name="lines_of_code",
+        description="Lines of code",
+        cell_value=lambda cell: cell.facts.number_of_lines,
+        cell_types=frozenset({CellType.CODE}),
+    )
+    session = dataclasses.replace(LintSession.build(), notebook_stats=(lines_of_code,))
+    with session.activate():
+        nb_linter = NotebookLinter(markdown_notebook())
+
+    assert nb_linter.notebook_stats is not None
+    assert nb_linter.notebook_stats.plugin_stats == {"lines_of_code": 2}
+
+
+def test_stats_are_not_collected_if_not_reported():
+    with LintSession.build(collect_stats=False).activate():
+        nb_linter = NotebookLinter(markdown_notebook())
+
+    assert nb_linter.complete
+    assert nb_linter.notebook_stats is None
+
+
+def test_budget_stops_before_reading_notebook():
+    notebook = Notebook(Path("tests", "fixtures", "Untitled.ipynb"))
+    nb_linter = NotebookLinter(notebook, budget=ViolationBudget(1))
+
+    assert [lint.slug for lint in nb_linter.lints if lint.result] == [
+        "untitled-notebook"
+    ]
+    assert not nb_linter.complete
+    assert not notebook.is_loaded
+    assert nb_linter.notebook_stats is None
+    with pytest.raises(RuntimeError):
+        nb_linter.results
+
+
+def test_resume_evaluates_content_lints():
+    notebook = Notebook(Path("tests", "fixtures", "Untitled.ipynb"))
+    nb_linter = NotebookLinter(
+        notebook, budget=ViolationBudget(100), max_cost=LintCost.PATH
+    )
+    assert not notebook.is_loaded
+
+    nb_linter.resume()
+    assert nb_linter.complete
+    assert nb_linter.notebook_stats is not None
+    slugs = [lint.slug for lint in NotebookLinter(notebook).lints]
+    assert [lint.slug for lint in nb_linter.lints] == slugs
+
+
+def test_copies_reevaluate_content_lints_depending_on_path(tmp_path):
+    reads_path = LintDefinition(
+        slug="notebook-in-drafts",
+        description="Draft notebook",
+        recommendation="Move it.",
+        linting_function=lambda notebook: notebook.path.parent.name == "drafts",
+        depends_on_path=True,
+    )
+    session = LintSession.build()
+    session = dataclasses.replace(
+        session, notebook_level_lints=session.notebook_level_lints + (reads_path,)
+    )
+    with session.activate():
+        draft = NotebookLinter(
+            Notebook(
+                Path("drafts", "analysis.ipynb"), nb_node=markdown_notebook().nb_dict
+            )
+        )
+        copy = draft.for_copy(tmp_path / "analysis.ipynb")
+
+    assert "notebook-in-drafts" in {finding.slug for finding in draft.findings()}
+    assert "notebook-in-drafts" not in {finding.slug for finding in copy.findings()}
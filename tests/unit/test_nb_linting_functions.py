@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Dict, List
 
+import nbformat
 import pytest
 
 from pynblint import nb_linting
@@ -66,6 +67,23 @@ def test_imports_beyond_first_cell(test_input, expected, notebooks):
     assert nb_linting.imports_beyond_first_cell(notebooks[test_input]) == expected
 
 
+@pytest.mark.parametrize(
+    "sources,expected",
+    [
+        (["import os", "x = 1", "import sys"], False),  # The last cell is not checked
+        (["import os", "import sys", "x = 1"], True),
+        (["import os", "x = (", "import sys", "x = 1"], False),
+    ],
+)
+def test_imports_beyond_first_cell_in_middle_cells(sources, expected):
+    notebook = Notebook.from_node(
+        nbformat.v4.new_notebook(
+            cells=[nbformat.v4.new_code_cell(source) for source in sources]
+        )
+    )
+    assert nb_linting.imports_beyond_first_cell(notebook) == expected
+
+
 @pytest.mark.parametrize(
     "test_input,expected",
     [
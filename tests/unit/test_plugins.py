@@ -0,0 +1,113 @@
+import json
+import sys
+
+import pytest
+
+from pynblint import loader, plugins
+from pynblint.config import Settings
+from pynblint.lint import LintCost, LintLevel
+from pynblint.session import LintSession
+
+if __name__ == "__main__":
+    pytest.main()
+
+PLUGIN_MODULE = "pynblint_test_plugin"
+
+PLUGIN_SOURCE = """
+import pynblint.lint_register as register
+from pynblint.lint import LintCost, LintDefinition, LintLevel
+
+
+def initialize() -> None:
+    register.register_lints(
+        LintLevel.NOTEBOOK,
+        [
+            LintDefinition(
+                slug="test-plugin-lint",
+                description="A lint provided by a plugin.",
+                recommendation="Nothing to recommend.",
+                linting_function=lambda notebook: False,
+                cost=LintCost.PATH,
+            )
+        ],
+    )
+"""
+
+
+@pytest.fixture
+def installed_plugin(tmp_path, monkeypatch):
+    """Install a plugin package (i.e., its module and distribution metadata)."""
+    (tmp_path / f"{PLUGIN_MODULE}.py").write_text(PLUGIN_SOURCE)
+    dist_info = tmp_path / "pynblint_test_plugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: pynblint-test-plugin\nVersion: 1.0\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        f"[{plugins.ENTRY_POINT_GROUP}]\ntest_plugin = {PLUGIN_MODULE}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(plugins, "_manifests", {})
+    monkeypatch.setattr(loader, "_module_lints", dict(loader._module_lints))
+    monkeypatch.setattr(loader, "_module_stats", dict(loader._module_stats))
+    yield tmp_path / "cache"
+    sys.modules.pop(PLUGIN_MODULE, None)
+
+
+def test_installed_plugins(installed_plugin):
+    assert (
+        plugins.InstalledPlugin("test_plugin", PLUGIN_MODULE, "1.0")
+        in plugins.installed_plugins()
+    )
+
+
+def test_plugin_manifest_is_cached(installed_plugin):
+    cache_dir = installed_plugin
+    manifests = plugins.plugin_manifests(cache_dir)
+    manifest = next(m for m in manifests if m.plugin.module == PLUGIN_MODULE)
+    assert manifest.lints == [
+        plugins.LintManifest("test-plugin-lint", LintLevel.NOTEBOOK, LintCost.PATH)
+    ]
+
+    with open(cache_dir / plugins.MANIFEST_FILENAME) as f:
+        assert json.load(f)["plugins"]["test_plugin"]["lints"] == [
+            {"slug": "test-plugin-lint", "level": "NOTEBOOK", "cost": "PATH"}
+        ]
+
+
+def test_plugin_is_imported_only_if_enabled(installed_plugin):
+    cache_dir = installed_plugin
+    plugins.plugin_manifests(cache_dir)
+
+    # The manifest is read from the cache, without importing the plugin
+    sys.modules.pop(PLUGIN_MODULE, None)
+    plugins._manifests.clear()
+    loader._module_lints.pop(PLUGIN_MODULE)
+    session = LintSession.build(cache_dir=cache_dir, exclude={"test-plugin-lint"})
+    assert PLUGIN_MODULE not in sys.modules
+    assert "test-plugin-lint" not in {
+        lint.slug for lint in session.notebook_level_lints
+    }
+
+    session = LintSession.build(cache_dir=cache_dir)
+    assert PLUGIN_MODULE in sys.modules
+    assert "test-plugin-lint" in {lint.slug for lint in session.notebook_level_lints}
+
+
+def test_manifest_of_unknown_version_is_not_cached(installed_plugin):
+    cache = plugins.ManifestCache(installed_plugin / plugins.MANIFEST_FILENAME)
+    plugin = plugins.InstalledPlugin("test_plugin", PLUGIN_MODULE, "")
+    assert cache.get(plugin).lints
+    cache.save()
+    assert not (installed_plugin / plugins.MANIFEST_FILENAME).exists()
+
+
+def test_stats_plugins_are_imported_only_if_stats_are_collected(monkeypatch):
+    manifest = plugins.PluginManifest(
+        plugin=plugins.InstalledPlugin("stats_plugin", "stats_plugin", "1.0"),
+        stats=["stats-plugin-stat"],
+    )
+    monkeypatch.setattr(plugins, "plugin_manifests", lambda cache_dir: [manifest])
+
+    assert plugins.enabled_plugins(Settings()) == ["stats_plugin"]
+    assert plugins.enabled_plugins(Settings(collect_stats=False)) == []
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from pynblint import prefetch, workers
+from pynblint.prefetch import ReadAhead
+from pynblint.workers import WorkerPool
+
+if __name__ == "__main__":
+    pytest.main()
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"file{i}.ipynb"
+        path.write_bytes(b"x" * i)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("max_bytes", [None, 10])
+@pytest.mark.parametrize("depth", [0, 1, 4, 100])
+def test_read_ahead_preserves_order(files, depth, max_bytes):
+    reads = ReadAhead(files, depth=depth, threads=3, max_bytes=max_bytes)
+
+    assert [(path, len(content)) for path, content in reads] == [
+        (path, i) for i, path in enumerate(files)
+    ]
+    assert reads.stats.files_read == len(files)
+    assert reads.stats.bytes_read == sum(range(len(files)))
+
+
+def test_read_ahead_is_bounded_by_bytes(files, monkeypatch):
+    started = []
+    read = prefetch._read
+
+    def recording_read(path):
+        started.append(path)
+        return read(path)
+
+    monkeypatch.setattr(prefetch, "_read", recording_read)
+    reads = ReadAhead(files, depth=100, threads=3, max_bytes=10)
+    for path, _ in reads:
+        time.sleep(0.1)
+        # Files of 0 to 4 bytes, plus the file exceeding the limit
+        assert len(started) <= 6
+        break
+
+
+def test_read_ahead_stops_early(files):
+    reads = ReadAhead(files, depth=4, threads=2)
+    for path, _ in reads:
+        if path == files[2]:
+            break
+
+    assert reads.stats.files_read == 3
+
+
+def test_worker_pool_collects_io_stats(tmp_path):
+    notebook = b'{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}'
+    paths = [tmp_path / "a.ipynb", tmp_path / "b.ipynb"]
+    for path in paths:
+        path.write_bytes(notebook)
+
+    with WorkerPool() as pool:
+        pool.lint_notebooks(paths)
+
+    assert pool.io_stats.files_read == 2
+    assert pool.io_stats.bytes_read == 2 * len(notebook)
+
+
+def test_worker_pool_reads_largest_known_notebooks_first(tmp_path, monkeypatch):
+    notebook = b'{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}'
+    paths = [tmp_path / f"{name}.ipynb" for name in "abcd"]
+    for i, path in enumerate(paths):
+        path.write_bytes(notebook + b" " * i)
+
+    read_orders = []
+
+    class RecordingReadAhead(ReadAhead):
+        def __init__(self, paths, **kwargs):
+            read_orders.append(list(paths))
+            super().__init__(paths, **kwargs)
+
+    monkeypatch.setattr(workers, "ReadAhead", RecordingReadAhead)
+    # Unknown sizes are not read from the filesystem
+    monkeypatch.setattr(prefetch, "file_size", None)
+    with WorkerPool(jobs=2) as pool:
+        pool.lint_notebooks(paths, sizes={paths[1]: 10, paths[3]: 20})
+
+    assert read_orders == [[paths[3], paths[1], paths[0], paths[2]]]
@@ -0,0 +1,78 @@
+import io
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from pynblint import loader
+from pynblint.config import ReportFormat
+from pynblint.core_models import Notebook
+from pynblint.nb_linter import NotebookLinter
+from pynblint.renderers import (
+    PlainRenderer,
+    RichRenderer,
+    SummaryRenderer,
+    get_renderer,
+)
+
+if __name__ == "__main__":
+    pytest.main()
+
+NOTEBOOK_PATH = Path("tests", "fixtures", "Untitled.ipynb")
+
+
+@pytest.fixture(scope="module")
+def nb_linter() -> NotebookLinter:
+    loader.load_core_modules()
+    return NotebookLinter(Notebook(NOTEBOOK_PATH))
+
+
+def render(renderer, linter) -> str:
+    console = Console(file=io.StringIO(), force_terminal=True, width=100)
+    renderer.render(linter, console)
+    return console.file.getvalue()
+
+
+@pytest.mark.parametrize(
+    "report_format,renderer_class",
+    [
+        (ReportFormat.RICH, RichRenderer),
+        (ReportFormat.PLAIN, PlainRenderer),
+        (ReportFormat.SUMMARY, SummaryRenderer),
+    ],
+)
+def test_get_renderer(report_format, renderer_class):
+    assert isinstance(get_renderer(report_format), renderer_class)
+
+
+def test_plain_renderer(nb_linter):
+    lines = render(PlainRenderer(), nb_linter).splitlines()
+
+    assert f"{NOTEBOOK_PATH}:cell 12: [empty-cells] " in "\n".join(lines)
+    assert f"{NOTEBOOK_PATH}: [untitled-notebook] " in "\n".join(lines)
+    assert lines[-1] == f"Found {len(lines) - 1} linting results."
+
+
+def test_summary_renderer(nb_linter):
+    output = render(SummaryRenderer(), nb_linter)
+    n_findings = len(list(nb_linter.findings()))
+
+    assert "  non-executed-cells" in output
+    assert f"  {NOTEBOOK_PATH}  {n_findings}" in output
+    assert output.endswith(f"Found {n_findings} linting results in 1 notebooks.\n")
+
+
+def test_rich_renderer(nb_linter):
+    output = render(RichRenderer(), nb_linter)
+    assert "PYNBLINT" in output
+    assert "untitled-notebook" in output
+
+
+def test_plain_renderer_prints_findings_as_they_are(nb_linter):
+    console = Console(force_terminal=True, width=20)
+    with console.capture() as capture:
+        PlainRenderer().render(nb_linter, console)
+
+    assert capture.get().splitlines() == [
+        PlainRenderer.format_finding(finding) for finding in nb_linter.findings()
+    ] + [f"Found {len(list(nb_linter.findings()))} linting results."]
@@ -1,10 +1,13 @@
+import os
 from pathlib import Path
 from typing import Dict
 
+import git
 import pytest
 
 from pynblint import repo_linting
-from pynblint.core_models import Repository
+from pynblint.config import settings
+from pynblint.core_models import LocalRepository, Repository
 
 
 @pytest.fixture(scope="module")
@@ -28,3 +31,47 @@ def test_coverage_data_not_available(test_input, expected, repositories):
     assert (
         repo_linting.coverage_data_not_available(repositories[test_input]) == expected
     )
+
+
+@pytest.fixture
+def git_repo_with_data(tmp_path) -> Path:
+    repo_path = tmp_path / "data-project"
+    repo = git.Repo.init(repo_path)
+    (repo_path / ".gitignore").write_text("ignored.bin\n")
+    (repo_path / "tracked.bin").write_bytes(os.urandom(2000))
+    (repo_path / "untracked.bin").write_bytes(os.urandom(2000))
+    (repo_path / "ignored.bin").write_bytes(os.urandom(2000))
+    (repo_path / "dvc-tracked.bin").write_bytes(os.urandom(2000))
+    (repo_path / "dvc-tracked.bin.dvc").write_text("outs:\n- path: dvc-tracked.bin\n")
+    repo.index.add([".gitignore", "tracked.bin"])
+    author = git.Actor("Pynblint", "pynblint@example.com")
+    repo.index.commit("Initial commit", author=author, committer=author)
+    return repo_path
+
+
+def test_unversioned_large_data_files_in_git_repository(git_repo_with_data):
+    default = settings.max_data_file_size
+    settings.max_data_file_size = 1000
+    repo = Repository(git_repo_with_data)
+    try:
+        large_files = repo_linting.unversioned_large_data_files(repo)
+    finally:
+        settings.max_data_file_size = default
+
+    # Neither git internals (e.g., objects) nor ignored files are reported
+    assert sorted(path.name for path in large_files) == ["tracked.bin", "untracked.bin"]
+
+
+def test_duplicate_notebook_filename(tmp_path):
+    for relative_path in ["eda.ipynb", "a/eda.ipynb", "b/eda.ipynb", "a/model.ipynb"]:
+        (tmp_path / relative_path).parent.mkdir(exist_ok=True)
+        (tmp_path / relative_path).write_text("{}")
+    repo = LocalRepository(tmp_path)
+
+    duplicates = repo_linting.duplicate_notebook_filename(repo)
+    assert sorted(duplicates) == sorted(repo.notebooks_by_name["eda.ipynb"])
+    assert len(duplicates) == 3
+    assert sorted(
+        path.name for path in repo.notebooks_by_directory[tmp_path / "a"]
+    ) == ["eda.ipynb", "model.ipynb"]
+    assert len(repo.files_by_extension[".ipynb"]) == 4
@@ -0,0 +1,135 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pynblint import loader
+from pynblint.core_models import LocalRepository
+from pynblint.repo_linter import RepoLinter
+from pynblint.scan_snapshot import ScanSnapshot
+from pynblint.session import LintSession
+
+if __name__ == "__main__":
+    pytest.main()
+
+# Modification times old enough for listings to be reused
+OLD_MTIME_NS = 1_000_000_000 * 10**9
+
+
+@pytest.fixture(scope="module", autouse=True)
+def core_lints():
+    loader.load_core_modules()
+
+
+def make_old(*paths: Path) -> None:
+    for path in paths:
+        os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "notebooks" / ".ipynb_checkpoints").mkdir(parents=True)
+    shutil.copy(Path("tests", "fixtures", "Untitled.ipynb"), root / "notebooks")
+    shutil.copy(
+        Path("tests", "fixtures", "Untitled.ipynb"),
+        root / "notebooks" / ".ipynb_checkpoints",
+    )
+    (root / "requirements.txt").write_text("nbformat\n")
+    make_old(root, root / "notebooks", root / "notebooks" / ".ipynb_checkpoints")
+    return root
+
+
+def test_unchanged_directories_are_not_listed_again(project, tmp_path):
+    snapshot_path = tmp_path / "snapshot.json"
+    first_scan = ScanSnapshot(project, snapshot_path)
+    first_scan.save()
+    assert first_scan.listed_directories == 3
+    assert first_scan.notebook_paths == [project / "notebooks" / "Untitled.ipynb"]
+    assert Path("requirements.txt") in first_scan.file_paths
+    assert first_scan.has_file("requirements.txt")
+    assert not first_scan.has_git_directory
+
+    second_scan = ScanSnapshot(project, snapshot_path)
+    assert (second_scan.listed_directories, second_scan.reused_directories) == (0, 3)
+    assert second_scan.digest == first_scan.digest
+
+
+def test_changed_directories_are_listed_again(project, tmp_path):
+    snapshot_path = tmp_path / "snapshot.json"
+    ScanSnapshot(project, snapshot_path).save()
+
+    shutil.copy(Path("tests", "fixtures", "LongNotebook.ipynb"), project / "notebooks")
+    os.utime(project / "notebooks", ns=(OLD_MTIME_NS + 1, OLD_MTIME_NS + 1))
+    scan = ScanSnapshot(project, snapshot_path)
+    assert (scan.listed_directories, scan.reused_directories) == (1, 2)
+    assert scan.notebook_paths == [
+        project / "notebooks" / "LongNotebook.ipynb",
+        project / "notebooks" / "Untitled.ipynb",
+    ]
+
+
+def test_recently_modified_directories_are_not_reused(project, tmp_path):
+    snapshot_path = tmp_path / "snapshot.json"
+    os.utime(project / "notebooks")
+    ScanSnapshot(project, snapshot_path).save()
+
+    scan = ScanSnapshot(project, snapshot_path)
+    assert (scan.listed_directories, scan.reused_directories) == (1, 2)
+
+
+def test_project_lint_results_are_reused(project, tmp_path):
+    with LintSession.build(cache_dir=tmp_path / "cache").activate():
+        repo_linter = RepoLinter(LocalRepository(project))
+        repo = repo_linter.repo
+        assert repo.scan_snapshot is not None
+        assert repo.notebook_paths == [project / "notebooks" / "Untitled.ipynb"]
+        results = {lint.slug: lint.result for lint in repo_linter.lints}
+        assert results["repository-not-versioned"]
+        assert not results["dependencies-unmanaged"]
+
+        calls = []
+        snapshot = ScanSnapshot.in_cache(project, tmp_path / "cache")
+        snapshot.lint_result(
+            next(key for key in snapshot._lint_results if "unmanaged" in key),
+            lambda: calls.append("evaluated"),
+        )
+        assert calls == []
+
+        # Removing the manifest changes the tree, so the lint is evaluated again
+        (project / "requirements.txt").unlink()
+        os.utime(project, ns=(OLD_MTIME_NS + 1, OLD_MTIME_NS + 1))
+        repo_linter = RepoLinter(LocalRepository(project))
+        results = {lint.slug: lint.result for lint in repo_linter.lints}
+        assert results["dependencies-unmanaged"]
+
+
+def test_file_sizes_are_not_taken_from_reused_directories(project, tmp_path):
+    with LintSession.build(
+        cache_dir=tmp_path / "cache", max_data_file_size=100
+    ).activate():
+        repo = LocalRepository(project)
+        assert project / "requirements.txt" not in repo.large_file_paths
+        repo.scan_snapshot.save()
+
+        # The file grows, but its directory is unchanged (and reused)
+        (project / "requirements.txt").write_text("nbformat\n" * 100)
+        make_old(project)
+        repo = LocalRepository(project)
+        assert repo.scan_snapshot.listed_directories == 0
+        assert project / "requirements.txt" in repo.large_file_paths
+
+
+def test_notebook_sizes_are_not_taken_from_reused_directories(project, tmp_path):
+    with LintSession.build(cache_dir=tmp_path / "cache").activate():
+        repo = LocalRepository(project)
+        assert repo.notebook_sizes == {
+            path: path.stat().st_size for path in repo.notebook_paths
+        }
+        repo.scan_snapshot.save()
+
+        make_old(project)
+        repo = LocalRepository(project)
+        assert repo.scan_snapshot.listed_directories == 0
+        assert repo.notebook_sizes == {}
@@ -0,0 +1,99 @@
+import dataclasses
+import pickle
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from pynblint import __version__, lint_notebook, loader
+from pynblint.config import settings
+from pynblint.lint import LintLevel
+from pynblint.session import LintSession, get_session
+from pynblint.workers import WorkerPool
+
+if __name__ == "__main__":
+    pytest.main()
+
+NOTEBOOK_PATH = Path("tests", "fixtures", "FullNotebook2.ipynb")
+
+
+def slugs(linter) -> set:
+    return {finding.slug for finding in linter.findings()}
+
+
+def test_build_filters_lints():
+    session = LintSession.build(exclude={"untitled-notebook", "empty-cells"})
+    enabled_slugs = {lint.slug for lint in session.lints(LintLevel.NOTEBOOK)}
+
+    assert "untitled-notebook" not in enabled_slugs
+    assert "empty-cells" not in {lint.slug for lint in session.cell_level_lints}
+    assert "notebook-too-long" in enabled_slugs
+
+
+def test_loading_modules_twice_does_not_duplicate_lints():
+    loader.load_core_modules()
+    loader.load_core_modules()
+    session = LintSession.build()
+    slugs = [lint.slug for lint in session.notebook_level_lints]
+
+    assert len(slugs) == len(set(slugs))
+
+
+def test_session_is_immutable():
+    session = LintSession.build()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        session.settings = settings.current()  # type: ignore
+    with session.activate():
+        with pytest.raises(AttributeError):
+            settings.max_cells_in_notebook = 1
+
+
+def test_default_session_is_rebuilt_when_settings_change(monkeypatch):
+    session = get_session()
+    assert get_session() is session
+
+    monkeypatch.setattr(settings, "max_cells_in_notebook", 1)
+    assert get_session() is not session
+    assert get_session().settings.max_cells_in_notebook == 1
+
+
+def test_sessions_are_independent_across_threads():
+    nb_raw = NOTEBOOK_PATH.read_text()
+    sessions = [
+        LintSession.build(max_cells_in_notebook=1),
+        LintSession.build(max_cells_in_notebook=1000),
+    ] * 10
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(lambda s: slugs(lint_notebook(nb_raw, session=s)), sessions)
+        )
+
+    for session, result in zip(sessions, results):
+        too_long = session.settings.max_cells_in_notebook == 1
+        assert ("notebook-too-long" in result) == too_long
+    assert get_session().settings.max_cells_in_notebook == 50
+
+
+def test_session_is_shipped_to_workers():
+    session = LintSession.build(max_cells_in_notebook=1)
+    assert pickle.loads(pickle.dumps(session)) == session
+
+    with WorkerPool(2, session) as pool:
+        (nb_linter,) = pool.lint_notebooks([NOTEBOOK_PATH])
+    assert "notebook-too-long" in slugs(nb_linter)
+
+
+def test_session_settings_are_frozen():
+    session = LintSession.build(max_cells_in_notebook=1)
+    with pytest.raises(ValidationError):
+        session.settings.max_cells_in_notebook = 1000
+    assert LintSession.build(session.settings).settings.max_cells_in_notebook == 1
+
+
+def test_version_matches_package_metadata():
+    pyproject = Path("pyproject.toml").read_text()
+    assert re.search(rf'^version = "{re.escape(__version__)}"$', pyproject, re.M)
@@ -0,0 +1,104 @@
+import random
+import shutil
+from pathlib import Path
+
+import nbformat
+import pytest
+
+from pynblint import loader, sharding
+from pynblint.core_models import LocalRepository
+from pynblint.exceptions import ShardMergeError
+from pynblint.repo_linter import RepoLinter
+from pynblint.session import LintSession
+
+if __name__ == "__main__":
+    pytest.main()
+
+FIXTURES_PATH = Path("tests", "fixtures")
+
+rng = random.Random(0)
+TEXT = " ".join(f"word{rng.randrange(500)}" for _ in range(400))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def core_lints():
+    loader.load_core_modules()
+
+
+@pytest.fixture
+def repo_path(tmp_path: Path) -> Path:
+    (tmp_path / "copies").mkdir()
+    for fixture in sorted(FIXTURES_PATH.glob("*.ipynb")):
+        shutil.copy(fixture, tmp_path / fixture.name)
+        shutil.copy(fixture, tmp_path / "copies" / fixture.name)
+    for name, source in [("analysis.ipynb", TEXT), ("analysis-v2.ipynb", TEXT + " x")]:
+        notebook = nbformat.v4.new_notebook()
+        notebook.cells = [nbformat.v4.new_code_cell(source)]
+        nbformat.write(notebook, str(tmp_path / name))
+    return tmp_path
+
+
+def lint(repo_path: Path, shard=None) -> dict:
+    with LintSession.build(shard=shard).activate():
+        return RepoLinter(LocalRepository(repo_path)).as_dict()
+
+
+def test_parse_shard():
+    assert sharding.parse_shard("2/8") == (2, 8)
+    for spec in ["0/8", "9/8", "2", "a/b"]:
+        with pytest.raises(ValueError):
+            sharding.parse_shard(spec)
+
+
+def test_shards_partition_notebooks(repo_path):
+    repo = LocalRepository(repo_path)
+    shards = [sharding.shard_paths(repo, (index, 3)) for index in range(1, 4)]
+    assert sorted(path for paths in shards for path in paths) == repo.notebook_paths
+    assert all(shards)
+
+    # Assignments only depend on the path relative to the repository root
+    # (e.g., they do not change across processes or machines)
+    assert [sharding.shard_of("copies/Untitled.ipynb", n) for n in (2, 3, 8)] == [
+        1,
+        3,
+        5,
+    ]
+
+
+def test_merged_shards_match_single_run(repo_path):
+    # Near-duplicate notebooks are detected across shards
+    count = next(
+        count
+        for count in range(2, 10)
+        if sharding.shard_of("analysis.ipynb", count)
+        != sharding.shard_of("analysis-v2.ipynb", count)
+    )
+    shard_results = [lint(repo_path, (index, count)) for index in range(1, count + 1)]
+    merged = sharding.merge_shards(list(reversed(shard_results)))
+    single_run = lint(repo_path)
+
+    assert merged["lints"] == single_run["lints"]
+    assert "near-duplicate-notebooks" in [lint["slug"] for lint in merged["lints"]]
+    assert merged["notebook_level_lints"] == single_run["notebook_level_lints"]
+    for key in ["repository_metadata", "repository_stats"]:
+        assert merged[key] == single_run[key]
+    merged_stats, single_run_stats = merged["corpus_stats"], single_run["corpus_stats"]
+    for key in ["number_of_notebooks", "violations_per_slug", "notebooks_per_slug"]:
+        assert merged_stats[key] == single_run_stats[key]
+    for name, distribution in merged_stats["distributions"].items():
+        assert distribution["count"] == single_run_stats["distributions"][name]["count"]
+
+
+def test_merge_requires_all_shards(repo_path):
+    shard_results = [lint(repo_path, (index, 3)) for index in range(1, 4)]
+    with pytest.raises(ShardMergeError):
+        sharding.merge_shards(shard_results[:2])
+    with pytest.raises(ShardMergeError):
+        sharding.merge_shards(shard_results + shard_results[:1])
+    with pytest.raises(ShardMergeError):
+        sharding.merge_shards([lint(repo_path)])
+
+    with LintSession.build(shard=(1, 3), max_cells_in_notebook=5).activate():
+        other_settings = RepoLinter(LocalRepository(repo_path)).as_dict()
+    with pytest.raises(ShardMergeError):
+        sharding.merge_shards([other_settings] + shard_results[1:])
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+import git
+import pytest
+
+from pynblint import loader
+from pynblint.staged import MEMO_PATH, StagedRepository, lint_staged
+
+if __name__ == "__main__":
+    pytest.main()
+
+NOTEBOOK_PATH = Path("tests", "fixtures", "FullNotebook2.ipynb")
+UNTITLED_NOTEBOOK_PATH = Path("tests", "fixtures", "Untitled.ipynb")
+
+
+@pytest.fixture
+def staged_repo(tmp_path) -> Path:
+    """A git repository whose staged notebook differs from the working tree one."""
+
+    loader.load_core_modules()
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "requirements.txt").write_text("pandas\n")
+    (tmp_path / "analysis.ipynb").write_text(NOTEBOOK_PATH.read_text())
+    repo.index.add(["requirements.txt", "analysis.ipynb"])
+
+    # Unstaged changes must not be linted
+    (tmp_path / "analysis.ipynb").write_text(UNTITLED_NOTEBOOK_PATH.read_text())
+    (tmp_path / "unstaged.ipynb").write_text(NOTEBOOK_PATH.read_text())
+    return tmp_path
+
+
+def test_staged_repository(staged_repo):
+    repo = StagedRepository(staged_repo)
+
+    assert repo.notebook_paths == [staged_repo / "analysis.ipynb"]
+    assert repo.has_file("requirements.txt")
+    assert len(repo.notebooks[0].cells) == len(
+        json.loads(NOTEBOOK_PATH.read_text())["cells"]
+    )
+
+
+def test_lint_staged_memoizes_results(staged_repo):
+    linter = lint_staged(staged_repo)
+    memo_path = staged_repo / ".git" / MEMO_PATH
+    assert memo_path.is_file()
+
+    memo = json.loads(memo_path.read_text())
+    (memo_results,) = memo["results"].values()
+    memo_results["lints"]["untitled-notebook"] = True
+    memo_path.write_text(json.dumps(memo))
+
+    memoized_linter = lint_staged(staged_repo)
+    slugs = {finding.slug for finding in linter.findings()}
+    memoized_slugs = {finding.slug for finding in memoized_linter.findings()}
+    assert memoized_slugs == slugs | {"untitled-notebook"}
+    assert "dependencies-unmanaged" not in memoized_slugs